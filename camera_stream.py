@@ -1,196 +1,711 @@
 # camera_stream.py
 import cv2
+import dlib
 import face_recognition
 import numpy as np
+try:
+    import faiss # Optional: SIMD-tiled nearest-neighbour search over the known encodings
+except ImportError:
+    faiss = None
 import datetime
 import time
 import threading
-import queue
+import collections
+import itertools
+import concurrent.futures
+import multiprocessing
 import os
+import sys
+import logging
 
 # Import the newly created/refactored modules
 import config # For all configuration settings
 import logging_manager # For centralized logging operations
 import intruder_tracker # For managing intruder data (now simplified)
 import email_sender # For sending email alerts
+import face_embedding # For batched face encoding (dlib or optional ONNX embedder)
+import face_matching # Distance kernels (numba-compiled when available)
+
+# Diagnostics go through this logger: DEBUG messages (per-frame ones included) cost only a level check unless
+# enabled, and with logging_manager.configure_console_logging the console writes happen on a listener thread.
+logger = logging.getLogger("camera_stream")
 
 # Global debounce timestamp for unknown faces. This MUST be a single, shared global variable,
 # managed with a lock to be thread-safe across all CameraStream instances.
 _last_unknown_capture_time = 0
 _unknown_capture_debounce_lock = threading.Lock() # Lock for _last_unknown_capture_time
 
+# Detection model actually used by the processing loop. The CNN detector is only worth it on a GPU,
+# so it is selected only if requested in config AND dlib reports a CUDA build; otherwise keep HOG.
+if config.USE_GPU_DETECTOR and getattr(dlib, "DLIB_USE_CUDA", False):
+    _DETECTION_MODEL = "cnn"
+else:
+    _DETECTION_MODEL = config.FACE_DETECTION_MODEL
+
+# YuNet is used in place of the dlib detector when OpenCV supports it and the model file is present.
+_YUNET_AVAILABLE = hasattr(cv2, "FaceDetectorYN") and os.path.exists(config.YUNET_MODEL_PATH)
+
+# OpenCV's FFmpeg backend reads its options from this environment variable each time a capture is opened.
+if config.IP_CAMERA_FFMPEG_OPTIONS:
+    os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS", config.IP_CAMERA_FFMPEG_OPTIONS)
+
+def _create_yunet_detector(frame_width, frame_height):
+    """
+    Creates a YuNet face detector for frames of the given size, on the CUDA backend when available.
+    Detector instances are not thread-safe, so each CameraStream creates its own.
+    """
+    backend_id, target_id = cv2.dnn.DNN_BACKEND_OPENCV, cv2.dnn.DNN_TARGET_CPU
+    if hasattr(cv2, "cuda") and cv2.cuda.getCudaEnabledDeviceCount() > 0:
+        backend_id, target_id = cv2.dnn.DNN_BACKEND_CUDA, cv2.dnn.DNN_TARGET_CUDA_FP16
+    return cv2.FaceDetectorYN.create(config.YUNET_MODEL_PATH, "", (frame_width, frame_height),
+                                     config.YUNET_SCORE_THRESHOLD, 0.3, 5000, backend_id, target_id)
+
+# Optional process pool shared by all CameraStreams for dlib detection/encoding, which otherwise
+# serialize on the GIL across cameras. Managed by start_recognition_pool()/stop_recognition_pool().
+_recognition_pool = None
+
+def _init_recognition_worker():
+    """
+    Pool initializer, run once in each worker process. The worker loaded the dlib (and optional ONNX) models
+    itself when it imported this module; they are run once on a blank image here, so the first camera frame
+    does not pay for their lazy initialization (e.g. the CUDA context of the CNN detector or ONNX session).
+    """
+    blank_image = np.zeros((4 * _MIN_FACE_SIZE, 4 * _MIN_FACE_SIZE, 3), dtype=np.uint8)
+    face_recognition.face_locations(blank_image, model=_DETECTION_MODEL)
+    face_embedding.encode_faces(blank_image, [(0, 2 * _MIN_FACE_SIZE, 2 * _MIN_FACE_SIZE, 0)])
+
+def start_recognition_pool(processes):
+    """
+    Starts the shared detection/encoding worker pool (call before starting the streams).
+    The workers are spawned, not forked: this is called while the GUI, logging, email and intruder I/O threads
+    are running (a forked child could inherit a lock one of them holds) and possibly after this process created
+    a CUDA context, which a forked child cannot use. Each worker loads its own models (see _init_recognition_worker).
+    """
+    global _recognition_pool
+    if _recognition_pool is None and processes > 0:
+        _recognition_pool = multiprocessing.get_context("spawn").Pool(processes=processes, initializer=_init_recognition_worker)
+        logger.debug("camera_stream: Started recognition worker pool with %s processes.", processes)
+
+# Frames with more faces than this are treated as a detector glitch; smaller faces are discarded.
+_MAX_REASONABLE_FACES = 10
+_MIN_FACE_SIZE = 20
+
+def _valid_face_locations(face_locations):
+    """Returns the (top, right, bottom, left) locations at least _MIN_FACE_SIZE pixels high and wide."""
+    return [(top, right, bottom, left) for (top, right, bottom, left) in face_locations
+            if bottom - top >= _MIN_FACE_SIZE and right - left >= _MIN_FACE_SIZE]
+
+def _detect_and_encode(rgb_small_frame, detection_model):
+    """
+    Pool worker: dlib face detection plus encoding of the valid faces, so a frame needs a single round
+    trip to the recognition pool (and is pickled once) instead of one for detection and one for encoding.
+    Returns (all detected locations, encodings of _valid_face_locations(those locations)).
+    """
+    face_locations = face_recognition.face_locations(rgb_small_frame, model=detection_model)
+    if len(face_locations) > _MAX_REASONABLE_FACES:
+        return face_locations, [] # Rejected by the caller anyway
+    valid_face_locations = _valid_face_locations(face_locations)
+    if not valid_face_locations:
+        return face_locations, []
+    return face_locations, face_embedding.encode_faces(rgb_small_frame, valid_face_locations)
+
+# While a processing thread waits for a pool result it checks its stop event this often. A worker killed by
+# stop_recognition_pool() never answers, so a plain Pool.apply() could block the (non-daemon) thread forever.
+_POOL_WAIT_SLICE_SECONDS = 0.2
+
+class _PoolCallAborted(Exception):
+    """Raised by _run_in_pool when the stream was stopped before the pool answered."""
+
+def _run_in_pool(pool, func, args, stop_event):
+    """Returns pool.apply(func, args), but raises _PoolCallAborted as soon as stop_event is set instead of waiting on."""
+    async_result = pool.apply_async(func, args)
+    while True:
+        try:
+            return async_result.get(timeout=_POOL_WAIT_SLICE_SECONDS)
+        except multiprocessing.TimeoutError:
+            if stop_event.is_set():
+                raise _PoolCallAborted()
+
+def stop_recognition_pool():
+    """Shuts the shared worker pool down (call after all streams have stopped)."""
+    global _recognition_pool
+    if _recognition_pool is not None:
+        _recognition_pool.terminate()
+        _recognition_pool.join()
+        _recognition_pool = None
+        logger.debug("camera_stream: Recognition worker pool stopped.")
+
+# Payload of the display queues. `boxes` are (top, right, bottom, left) tuples in frame coordinates and
+# `labels` the matching display names; both are None for frames that were not run through recognition.
+# `frame` is BGR, or raw YUYV for frames not run through recognition (use frame_to_bgr / draw_frame_packet).
+# `pool` is the _FramePool the frame came from (None if it did not come from one): see release_frame_packet.
+FramePacket = collections.namedtuple("FramePacket", "frame boxes labels pool", defaults=(None,))
+
+class _FramePool:
+    """
+    Free list of capture buffers for one camera, so cap.read() can decode into a buffer that is already
+    allocated instead of allocating a new ~1 MB array per frame. Buffers come back when a frame is dropped
+    (replaced in a latest-frame slot) or after the display has shown it; arrays of another shape than the
+    current capture size (resized/converted copies, or after a resolution change) are simply not kept.
+    deque append/pop are atomic, so reader, processing and display threads can share it without a lock.
+    """
+    def __init__(self, size):
+        self._size = size
+        self._free = collections.deque()
+        self._shape = None
+
+    def acquire(self):
+        """Returns a free buffer of the current capture size, or None if there is none."""
+        try:
+            return self._free.pop()
+        except IndexError:
+            return None
+
+    def release(self, frame):
+        """Hands a buffer back; the caller must not use `frame` afterwards."""
+        if frame is not None and frame.shape == self._shape and len(self._free) < self._size:
+            self._free.append(frame)
+
+    def set_shape(self, shape):
+        """Records the shape cap.read() currently produces, dropping buffers of an older size."""
+        if shape != self._shape:
+            self._shape = shape
+            self._free.clear()
+
+# Capture buffers kept per camera: enough for one frame in each stage (reader, processing, display) plus a spare.
+_FRAME_POOL_SIZE = 4
+
+def release_frame_packet(packet):
+    """
+    Returns a FramePacket's frame to its camera's buffer pool. Called by the display once the frame has been
+    shown (and copied into a QPixmap); neither `packet.frame` nor a frame drawn from it may be used afterwards.
+    """
+    if packet.pool is not None:
+        packet.pool.release(packet.frame)
+
+# Colors (BGR) for the overlay: green box/black text for known people, red box/white text for unknown/intruders.
+_KNOWN_BOX_COLOR, _KNOWN_TEXT_COLOR = (0, 255, 0), (0, 0, 0)
+_INTRUDER_BOX_COLOR, _INTRUDER_TEXT_COLOR = (0, 0, 255), (255, 255, 255)
+_LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_LABEL_HEIGHT = 35 # Height of the filled name bar at the bottom of each box
+_NO_FACE_TEXT = "Non human object or no face detected"
+
+# Pre-rendered label sprites keyed by (text, box color), so putText runs once per name instead of once per frame.
+_label_sprite_cache = {}
+_LABEL_SPRITE_CACHE_LIMIT = 256 # Intruder IDs keep growing; start over rather than grow without bound
+
+def _label_sprite(text, box_color, text_color):
+    """Returns (and caches) an image of `text` on a `box_color` bar, laid out like the original putText call."""
+    key = (text, box_color)
+    sprite = _label_sprite_cache.get(key)
+    if sprite is None:
+        (text_width, _), _ = cv2.getTextSize(text, _LABEL_FONT, 0.8, 2)
+        sprite = np.empty((_LABEL_HEIGHT, text_width + 12, 3), dtype=np.uint8)
+        sprite[:] = box_color
+        cv2.putText(sprite, text, (6, _LABEL_HEIGHT - 6), _LABEL_FONT, 0.8, text_color, 2)
+        if len(_label_sprite_cache) >= _LABEL_SPRITE_CACHE_LIMIT:
+            _label_sprite_cache.clear()
+        _label_sprite_cache[key] = sprite
+    return sprite
+
+def _no_face_sprite():
+    """Returns (and caches) the red 'no face detected' banner."""
+    sprite = _label_sprite_cache.get(_NO_FACE_TEXT)
+    if sprite is None:
+        (text_width, text_height), _ = cv2.getTextSize(_NO_FACE_TEXT, _LABEL_FONT, 0.7, 2)
+        sprite = np.empty((text_height + 10, text_width + 10, 3), dtype=np.uint8)
+        sprite[:] = _INTRUDER_BOX_COLOR
+        cv2.putText(sprite, _NO_FACE_TEXT, (5, text_height + 5), _LABEL_FONT, 0.7, (255, 255, 255), 2)
+        _label_sprite_cache[_NO_FACE_TEXT] = sprite
+    return sprite
+
+def _blit(frame, sprite, x, y):
+    """Copies `sprite` into `frame` with its top-left corner at (x, y), clipped to the frame."""
+    frame_height, frame_width = frame.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + sprite.shape[1], frame_width), min(y + sprite.shape[0], frame_height)
+    if x0 < x1 and y0 < y1:
+        frame[y0:y1, x0:x1] = sprite[y0 - y:y1 - y, x0 - x:x1 - x]
+
+def frame_to_bgr(frame):
+    """
+    Returns `frame` as a BGR image. Raw packed YUYV frames (H x W x 2, see config.CAMERA_KEEP_RAW_YUYV)
+    are converted; BGR frames are returned unchanged.
+    """
+    if frame.ndim == 3 and frame.shape[2] == 2:
+        return cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_YUYV)
+    return frame
+
+def draw_frame_packet(packet):
+    """
+    Draws the recognition results of a FramePacket onto its frame (in place) and returns the frame.
+    Called by the display thread, so box/label drawing does not cost the recognition thread any time.
+    Frames that are still raw YUYV (frames not run through recognition) are converted to BGR here first.
+    All boxes of one color are drawn with a single cv2.polylines call and labels are blitted from cached sprites.
+    """
+    frame = frame_to_bgr(packet.frame)
+    if packet.boxes is None:
+        return frame # Frame was not processed; show it raw
+
+    if len(packet.boxes) == 0:
+        _blit(frame, _no_face_sprite(), 5, 30 - _no_face_sprite().shape[0] + 5)
+        return frame
+
+    known_polygons, intruder_polygons = [], []
+    for (top, right, bottom, left), display_name_on_frame in zip(packet.boxes, packet.labels):
+        is_known = display_name_on_frame != "Unknown" and not display_name_on_frame.startswith("Intruder_")
+        box_color = _KNOWN_BOX_COLOR if is_known else _INTRUDER_BOX_COLOR
+        text_color = _KNOWN_TEXT_COLOR if is_known else _INTRUDER_TEXT_COLOR
+        (known_polygons if is_known else intruder_polygons).append(
+            np.array([[left, top], [right, top], [right, bottom], [left, bottom]], dtype=np.int32))
+
+        # Filled name bar across the box bottom, then the pre-rendered name on top of it
+        frame[max(bottom - _LABEL_HEIGHT, 0):max(bottom, 0), max(left, 0):max(right, 0)] = box_color
+        _blit(frame, _label_sprite(display_name_on_frame, box_color, text_color), left, bottom - _LABEL_HEIGHT)
+
+    if known_polygons:
+        cv2.polylines(frame, known_polygons, True, _KNOWN_BOX_COLOR, 2)
+    if intruder_polygons:
+        cv2.polylines(frame, intruder_polygons, True, _INTRUDER_BOX_COLOR, 2)
+    return frame
+
+# Folder + filename prefix for intruder snapshots, joined once instead of per event.
+_INTRUDER_PATH_PREFIX = os.path.join(config.INTRUDERS_FOLDER, "intruder_")
+
+# Background worker for intruder snapshot/log/email I/O, so disk and SMTP latency never block recognition.
+_io_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="IntruderIO")
+
+def _persist_intruder_event(frame, image_path, intruder_id, camera_input, event_time):
+    """
+    Saves the intruder snapshot, logs the event and sends the email alert, in that order.
+    Runs on _io_executor; `frame` must be a private copy owned by this job.
+    """
+    try:
+        cv2.imwrite(image_path, frame) # Save the full frame of the intruder
+        logger.info("Camera %s: Captured NEW intruder image: %s", camera_input, image_path)
+
+        # Log the event with the path to the NEWLY CAPTURED IMAGE
+        logging_manager.write_log_entry(intruder_id, "Intruder", image_link=image_path)
+        logger.info("Camera %s: Logged intruder entry with image: '%s'", camera_input, image_path)
+
+        alert_time = event_time.strftime("%Y-%m-%d %H:%M:%S")
+        email_sender.send_alert_in_thread(image_path, alert_time, str(camera_input))
+        logger.debug("Camera %s: Queued email alert.", camera_input)
+    except Exception as e:
+        logger.error("Camera %s: Failed to persist intruder event (capture/log/email): %s", camera_input, e)
+
+def _quantize_rows(matrix):
+    """
+    Quantizes each row of a float matrix to int8 with its own scale (max |value| maps to 127).
+    Returns (int8 matrix, float32 per-row scales of shape (N,)).
+    """
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0 # All-zero rows would otherwise divide by zero
+    quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+# Matching data derived from the known-encoding matrix, keyed by the read-only known_encs array the streams were
+# given (main_recognition_logic passes the one matrix from face_data_manager, which is read-only, to every stream).
+_gallery_cache = {'source': None, 'data': None}
+_gallery_cache_lock = threading.Lock()
+
+def _shared_gallery_data(source, known_arr):
+    """
+    Returns (INT8 copy, per-row scales, squared norms, faiss index or None) for the float32 matrix known_arr,
+    computing them only when `source` is not the read-only array they were last computed for (anything that
+    could change in place, like a list or a writeable array, is never reused).
+    The INT8 copy (4x less memory traffic) is scanned for the closest candidate without faiss/numba; squared
+    distances are rebuilt from the cached squared norms: |a-b|^2 = |a|^2 + |b|^2 - 2*a.b
+    """
+    reusable = isinstance(source, np.ndarray) and not source.flags.writeable
+    with _gallery_cache_lock:
+        if not reusable or _gallery_cache['source'] is not source:
+            known_q, known_scales = _quantize_rows(known_arr)
+            known_norms_sq = np.einsum('ij,ij->i', known_arr, known_arr)
+            # With faiss installed, the candidate search goes through an L2 index instead of the INT8 scan
+            # (searching an index from several threads at once is safe). Large galleries get an HNSW graph,
+            # whose search visits a small part of the gallery instead of every row.
+            faiss_index = None
+            if faiss is not None and len(known_arr) > 0:
+                if len(known_arr) >= _ANN_GALLERY_SIZE:
+                    faiss_index = faiss.IndexHNSWFlat(known_arr.shape[1], 32)
+                    faiss_index.hnsw.efSearch = 64
+                else:
+                    faiss_index = faiss.IndexFlatL2(known_arr.shape[1])
+                faiss_index.add(known_arr)
+            _gallery_cache['source'] = source if reusable else None
+            _gallery_cache['data'] = (known_q, known_scales, known_norms_sq, faiss_index)
+        return _gallery_cache['data']
+
+# Galleries of at least this size are searched through an approximate faiss HNSW index (when faiss is installed);
+# its _ANN_CANDIDATES nearest candidates are then compared exactly.
+_ANN_GALLERY_SIZE = 1000
+_ANN_CANDIDATES = 5
+
+# Galleries smaller than this are matched with the numba early-exit kernel (when numba is installed).
+_SMALL_GALLERY_SIZE = 100
+
+
+# Sequential stream index used to stagger each camera's thread pinning across cores.
+_stream_index_counter = itertools.count()
+
+def _pin_current_thread(stream_index, core_offset, camera_input):
+    """
+    Pins the calling thread to one CPU core (Linux only): core 2*stream_index + core_offset, wrapped around
+    the cores this process may use. Reader (offset 0) and processor (offset 1) of a stream get adjacent cores.
+    """
+    if not config.PIN_CAMERA_THREADS_TO_CORES or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        cores = sorted(os.sched_getaffinity(0))
+        if len(cores) < 2:
+            return # Nothing to separate on a single core
+        core = cores[(2 * stream_index + core_offset) % len(cores)]
+        os.sched_setaffinity(0, {core}) # pid 0 = the calling thread on Linux
+        logger.debug("Camera %s: %s pinned to CPU core %s.", camera_input, threading.current_thread().name, core)
+    except OSError as e:
+        logger.warning("Camera %s: Could not set CPU affinity: %s", camera_input, e)
+
 class CameraStream:
     """
     Manages a single camera feed in a separate thread for face detection and recognition.
     It includes an internal reader thread to prevent cap.read() from blocking the processing thread.
-    Processed frames are put into a queue for display in the main thread (GUI).
+    Processed frames are placed in a single-frame slot (deque with maxlen=1) as FramePackets for display (and drawing) in the main thread (GUI).
     """
     def __init__(self, camera_input, known_encs, known_names, known_genders,
-                 stop_event, frame_queue): 
+                 stop_event, frame_queue, known_display_names=None, on_frame_ready=None): 
         self.camera_input = camera_input
         self.cap = None # OpenCV VideoCapture object
+        self._stream_index = next(_stream_index_counter) # For staggering CPU core pinning across cameras
         
         # Main processing thread for face recognition
         self.processing_thread = threading.Thread(target=self._run_processing_loop, name=f"CamProcThread-{camera_input}")
         
         # Internal reader thread for reading frames from the camera
         self.reader_thread = threading.Thread(target=self._run_reader_loop, name=f"CamReaderThread-{camera_input}")
+        # Set by the reader thread once its first attempt to open the camera is done; `opened` tells whether it
+        # worked. The camera is not checked separately beforehand (that would connect to IP cameras twice).
+        self.open_status = threading.Event()
+        self.opened = False
         
         self.stop_event = stop_event # Event to signal all threads to stop gracefully
-        self.frame_queue = frame_queue # Queue to send processed frames to the main thread for display
-        self.internal_frame_queue = queue.Queue(maxsize=1) # Internal queue from reader to processing thread
+        self.frame_queue = frame_queue # deque(maxlen=1) holding the latest processed frame for the main thread to display
+        # Optional callable(camera_input) run after each new frame is placed in frame_queue, so the
+        # display can be pushed instead of polling (the GUI passes a Qt signal's emit here).
+        self.on_frame_ready = on_frame_ready
+        # Latest-frame slot from reader to processing thread: appending to a maxlen=1 deque silently
+        # replaces any unprocessed frame, and the event wakes the processing thread without polling.
+        self._latest_frame = collections.deque(maxlen=1)
+        self._new_frame_event = threading.Event()
+        self._frame_pool = _FramePool(_FRAME_POOL_SIZE) # Reusable capture buffers (see _FramePool)
+        # Raw YUYV capture is only requested from USB webcams (int inputs); it is turned off again
+        # if the backend does not actually deliver YUYV.
+        self._keep_raw_yuyv = (config.CAMERA_KEEP_RAW_YUYV and isinstance(camera_input, int)
+                               and config.USB_CAMERA_FOURCC in (None, "YUYV"))
 
         # References to shared/global resources for use within the thread
-        self.known_face_encodings = known_encs
-        self.known_face_names = known_names
-        self.known_face_genders = known_genders
+        # Known faces are held as parallel arrays (SoA): an (N, 128) float32 encoding matrix plus
+        # name/gender/display-name arrays indexed by the same row. main_recognition_logic builds them
+        # once and shares them read-only; the conversions below are no-ops for arrays already in that form.
+        self.known_face_encodings = np.ascontiguousarray(known_encs, dtype=np.float32).reshape(-1, 128)
+        self.known_face_names = np.asarray(known_names, dtype=object)
+        self.known_face_genders = np.asarray(known_genders, dtype=object)
+        if known_display_names is None:
+            known_display_names = [name.split('__')[0] for name in known_names]
+        self.known_face_display_names = np.asarray(known_display_names, dtype=object)
         self.recognition_tolerance = config.RECOGNITION_TOLERANCE # Access directly from config
 
+        # The contiguous matrix lets each detected face be matched with a single distance pass
+        # instead of compare_faces() + face_distance().
+        self._known_arr = self.known_face_encodings
+        # Squared tolerance, so distances can be compared without taking a square root.
+        self._tolerance_sq = self.recognition_tolerance ** 2
+
+        # INT8 copy, squared norms and faiss index of the known matrix (see _shared_gallery_data), built once
+        # and shared by all streams that were given the same known_encs array.
+        self._known_q, self._known_scales, self._known_norms_sq, self._faiss_index = _shared_gallery_data(known_encs, self._known_arr)
+
+        # Reusable buffers for the downscaled BGR frame and its RGB conversion, (re)allocated
+        # only when the incoming frame size changes.
+        self._small_bgr_buf = None
+        self._small_rgb_buf = None
+
+        # Per-stream YuNet detector, created lazily by the processing thread (see _detect_faces).
+        self._yunet_detector = None
+
         # Per-stream debounce for logging known faces. This is specific to each CameraStream instance.
         self.last_logged_times = {}
 
+    def _detect_faces(self, frame, rgb_small_frame):
+        """
+        Returns face locations as (top, right, bottom, left) tuples in rgb_small_frame coordinates.
+        Uses YuNet on the full-size BGR frame when available (boxes are scaled down to the small frame),
+        otherwise face_recognition's dlib detector on the small RGB frame. (With the recognition pool and
+        without YuNet, the processing loop uses _detect_and_encode in the pool instead.)
+        """
+        if not _YUNET_AVAILABLE:
+            return face_recognition.face_locations(rgb_small_frame, model=_DETECTION_MODEL)
+
+        frame_height, frame_width = frame.shape[:2]
+        if self._yunet_detector is None:
+            self._yunet_detector = _create_yunet_detector(frame_width, frame_height)
+        else:
+            self._yunet_detector.setInputSize((frame_width, frame_height)) # IP cameras may change resolution
+
+        _, detections = self._yunet_detector.detect(frame)
+        if detections is None:
+            return []
+
+        small_height, small_width = rgb_small_frame.shape[:2]
+        scale_x, scale_y = small_width / frame_width, small_height / frame_height
+        face_locations = []
+        for x, y, w, h in detections[:, :4]:
+            top = max(int(y * scale_y), 0)
+            left = max(int(x * scale_x), 0)
+            bottom = min(int((y + h) * scale_y), small_height)
+            right = min(int((x + w) * scale_x), small_width)
+            face_locations.append((top, right, bottom, left))
+        return face_locations
+
+    def _match_known(self, query):
+        """
+        Returns the index of the known encoding that matches `query` (a float32 128-d vector), or -1 if none is
+        within the recognition tolerance. Small galleries use the numba early-exit kernel when available.
+        """
+        if face_matching.NUMBA_AVAILABLE and len(self._known_arr) < _SMALL_GALLERY_SIZE:
+            return int(face_matching.early_exit_match(self._known_arr, query, self._tolerance_sq)[0])
+
+        best_match_index = self._find_closest_known(query)
+        # The tolerance check itself uses the exact float distance of that one candidate,
+        # so an approximate search can never turn a non-match into a match.
+        diff = self._known_arr[best_match_index] - query
+        if np.dot(diff, diff) <= self._tolerance_sq:
+            return best_match_index
+        return -1
+
+    def _find_closest_known(self, query):
+        """
+        Returns the index of the known encoding closest to `query` (a float32 128-d vector).
+        Uses the faiss index when available (approximate for galleries of _ANN_GALLERY_SIZE and more), then the
+        exact numba kernel, otherwise the INT8-quantized scan.
+        """
+        if self._faiss_index is not None:
+            if len(self._known_arr) < _ANN_GALLERY_SIZE:
+                _, nearest = self._faiss_index.search(query[None, :], 1) # Flat index: exact
+                return int(nearest[0, 0])
+            # HNSW index: the closest of its candidates by exact distance (-1 marks missing candidates)
+            _, nearest = self._faiss_index.search(query[None, :], _ANN_CANDIDATES)
+            candidates = nearest[0][nearest[0] >= 0]
+            diff = self._known_arr[candidates] - query
+            return int(candidates[np.argmin(np.einsum('ij,ij->i', diff, diff))])
+        if face_matching.NUMBA_AVAILABLE:
+            return int(np.argmin(face_matching.squared_distances(self._known_arr, query)))
+
+        # Approximate squared L2 distances to every known encoding from the INT8 dot products
+        # (int32 accumulation), used only to pick the closest candidate.
+        query_q, query_scale = _quantize_rows(query[None, :])
+        dots = (self._known_q @ query_q[0].astype(np.int32)) * (self._known_scales * query_scale[0])
+        approx_distances_sq = self._known_norms_sq + np.dot(query, query) - 2.0 * dots
+        return int(np.argmin(approx_distances_sq))
+
+    def _open_capture(self):
+        """
+        Opens the VideoCapture for this stream. IP camera URLs go through config.IP_CAMERA_GSTREAMER_PIPELINE
+        when one is configured; otherwise the default backend is used and the configured resolution is requested.
+        USB webcams are opened through V4L2 on Linux, request config.USB_CAMERA_FOURCC,
+        and deliver raw YUYV frames when config.CAMERA_KEEP_RAW_YUYV is set.
+        """
+        if isinstance(self.camera_input, str) and config.IP_CAMERA_GSTREAMER_PIPELINE:
+            pipeline = config.IP_CAMERA_GSTREAMER_PIPELINE.format(url=self.camera_input,
+                                                                   width=config.CAMERA_FRAME_WIDTH,
+                                                                   height=config.CAMERA_FRAME_HEIGHT)
+            logger.debug("Camera %s: Opening through GStreamer pipeline.", self.camera_input)
+            return cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+
+        if isinstance(self.camera_input, int) and sys.platform.startswith("linux"):
+            cap = cv2.VideoCapture(self.camera_input, cv2.CAP_V4L2)
+        elif isinstance(self.camera_input, str) and hasattr(cv2, "CAP_PROP_OPEN_TIMEOUT_MSEC"):
+            # Unreachable IP cameras give up after config.CAMERA_OPEN_TIMEOUT_SECONDS instead of FFmpeg's ~30 s
+            cap = cv2.VideoCapture(self.camera_input, cv2.CAP_FFMPEG,
+                                   [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(config.CAMERA_OPEN_TIMEOUT_SECONDS * 1000)])
+        else:
+            cap = cv2.VideoCapture(self.camera_input)
+        if cap.isOpened():
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1) 
+            if isinstance(self.camera_input, int) and config.USB_CAMERA_FOURCC:
+                # The pixel format must be requested before the resolution (V4L2 picks the sizes per format)
+                if not cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config.USB_CAMERA_FOURCC)):
+                    logger.warning("Camera %s: Camera rejected pixel format %s.", self.camera_input, config.USB_CAMERA_FOURCC)
+            if self._keep_raw_yuyv:
+                # Deliver frames in the camera's native YUYV format; only frames that are run through
+                # recognition (and frames actually displayed) get converted to BGR.
+                cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+            # --- CAMERA RESOLUTION SETTINGS (NOW FROM CONFIG) ---
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_FRAME_WIDTH)  # Use config
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_FRAME_HEIGHT) # Use config
+            logger.debug("Camera %s: Attempting to set resolution to %sx%s.", self.camera_input, config.CAMERA_FRAME_WIDTH, config.CAMERA_FRAME_HEIGHT)
+        return cap
+
     def _run_reader_loop(self):
         """
         Internal thread loop for continuously reading frames from the camera.
         This prevents cap.read() from blocking the main processing thread.
         """
-        print(f"DEBUG: Camera {self.camera_input}: Reader thread entered.", flush=True)
+        logger.debug("Camera %s: Reader thread entered.", self.camera_input)
+        _pin_current_thread(self._stream_index, 0, self.camera_input)
         
-        self.cap = cv2.VideoCapture(self.camera_input)
-
-        if not self.cap.isOpened():
-            print(f"ERROR: Camera {self.camera_input}: Reader thread could not open webcam. Signaling global stop.", flush=True)
-            self.stop_event.set() 
+        self.cap = self._open_capture()
+        self.opened = self.cap.isOpened()
+        self.open_status.set()
+
+        if not self.opened:
+            # Only this camera stops (the other cameras keep running): wake the processing thread with the stop sentinel.
+            logger.error("Camera %s: Reader thread could not open webcam. Stopping this camera.", self.camera_input)
+            self._latest_frame.append(None)
+            self._new_frame_event.set()
             return
 
-        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1) 
-        
-        # --- CAMERA RESOLUTION SETTINGS (NOW FROM CONFIG) ---
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_FRAME_WIDTH)  # Use config
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_FRAME_HEIGHT) # Use config
-        print(f"DEBUG: Camera {self.camera_input}: Attempting to set resolution to {config.CAMERA_FRAME_WIDTH}x{config.CAMERA_FRAME_HEIGHT}.", flush=True)
-        # --- END CAMERA RESOLUTION SETTINGS ---
-
-        print(f"DEBUG: Camera {self.camera_input}: Reader thread capture device opened.", flush=True)
+        logger.debug("Camera %s: Reader thread capture device opened.", self.camera_input)
 
         while not self.stop_event.is_set():
-            ret, frame = self.cap.read()
+            reusable_buffer = self._frame_pool.acquire()
+            if reusable_buffer is not None:
+                ret, frame = self.cap.read(reusable_buffer) # Decodes into the pooled buffer
+            else:
+                ret, frame = self.cap.read()
             if not ret:
-                print(f"WARNING: Camera {self.camera_input}: Reader thread couldn't read frame. Attempting to re-open...", flush=True)
+                logger.warning("Camera %s: Reader thread couldn't read frame. Attempting to re-open...", self.camera_input)
                 self.cap.release()
                 time.sleep(0.5) 
-                self.cap = cv2.VideoCapture(self.camera_input) 
+                self.cap = self._open_capture()
                 if not self.cap.isOpened():
-                    print(f"ERROR: Camera {self.camera_input}: Reader thread failed to re-open. Signaling global stop.", flush=True)
+                    logger.error("Camera %s: Reader thread failed to re-open. Signaling global stop.", self.camera_input)
                     self.stop_event.set()
                     break 
-                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-                if isinstance(self.camera_input, int): 
-                    self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
-                    self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
                 continue
+
+            if self._keep_raw_yuyv and (frame.ndim != 3 or frame.shape[2] not in (2, 3)):
+                # This backend's unconverted output is not packed YUYV (e.g. an undecoded MJPEG buffer):
+                # switch this camera back to BGR frames.
+                logger.warning("Camera %s: Raw frames of shape %s are not YUYV. Using BGR frames instead.", self.camera_input, frame.shape)
+                self._keep_raw_yuyv = False
+                self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+                continue
+
+            self._frame_pool.set_shape(frame.shape)
+
+            # Cameras that ignore the requested resolution (typical for IP cameras) are downscaled here,
+            # so the processing and display threads only ever see frames of the configured size.
+            frame_height, frame_width = frame.shape[:2]
+            if frame_width > config.CAMERA_FRAME_WIDTH:
+                captured_frame = frame
+                frame = frame_to_bgr(frame) # Packed YUYV cannot be resized directly
+                scaled_height = int(round(frame_height * config.CAMERA_FRAME_WIDTH / frame_width))
+                frame = cv2.resize(frame, (config.CAMERA_FRAME_WIDTH, scaled_height), interpolation=cv2.INTER_AREA)
+                self._frame_pool.release(captured_frame) # The capture buffer can be read into again right away
             
+            # Replace a frame the processing thread has not picked up yet, recycling its buffer.
+            # Only one of this pop and the processing thread's pop can get the old frame.
             try:
-                if not self.internal_frame_queue.empty():
-                    self.internal_frame_queue.get_nowait() 
-                self.internal_frame_queue.put_nowait(frame) 
-            except queue.Full:
-                print(f"WARNING: Camera {self.camera_input}: Reader internal queue full. Dropping frame.", flush=True)
-                pass 
-            except Exception as e:
-                print(f"ERROR: Camera {self.camera_input}: Reader thread queue operation error: {e}", flush=True)
-            
-            time.sleep(0.001) 
-
-        print(f"DEBUG: Camera {self.camera_input}: Reader thread loop exited. Releasing camera.", flush=True)
+                stale_frame = self._latest_frame.pop()
+            except IndexError:
+                stale_frame = None
+            self._latest_frame.append(frame)
+            self._new_frame_event.set()
+            self._frame_pool.release(stale_frame)
+
+        logger.debug("Camera %s: Reader thread loop exited. Releasing camera.", self.camera_input)
         self.cap.release()
-        print(f"DEBUG: Camera {self.camera_input}: Reader thread camera resource released.", flush=True)
+        logger.debug("Camera %s: Reader thread camera resource released.", self.camera_input)
 
     def _run_processing_loop(self):
         """
         The main loop for the camera processing thread.
-        Gets frames from internal queue, performs face recognition, draws results, and puts frames into display queue.
+        Gets frames from the reader, performs face recognition, and places FramePackets (frame + results) in the display slot.
         """
-        print(f"DEBUG: Camera {self.camera_input}: Processing thread entered.", flush=True)
+        logger.debug("Camera %s: Processing thread entered.", self.camera_input)
+        _pin_current_thread(self._stream_index, 1, self.camera_input)
         
         frame_counter = 0 
 
+        # The stop event is checked once per iteration; stop() also publishes a None sentinel
+        # so a processing thread blocked on the frame event wakes up and exits immediately.
         while not self.stop_event.is_set(): 
-            if self.stop_event.is_set():
-                print(f"DEBUG: Camera {self.camera_input}: Processing detected stop event at loop start. Breaking loop.", flush=True)
-                break 
-
-            frame = None
-            try:
-                frame = self.internal_frame_queue.get(timeout=0.05) 
-            except queue.Empty:
-                time.sleep(0.005) 
-                continue 
-            except Exception as e:
-                print(f"ERROR: Camera {self.camera_input}: Processing thread frame retrieval error: {e}. Skipping frame.", flush=True)
-                time.sleep(0.005) 
+            # Block until the reader publishes a frame (timeout so the stop event is re-checked).
+            if not self._new_frame_event.wait(timeout=0.05):
                 continue
+            self._new_frame_event.clear()
+            try:
+                frame = self._latest_frame.pop()
+            except IndexError:
+                continue # Already consumed on a previous wake-up
 
-            if frame is None:
-                print(f"WARNING: Camera {self.camera_input}: Processing received None frame. Skipping.", flush=True)
-                time.sleep(0.005) 
-                continue
+            if frame is None: # Stop sentinel from stop()
+                logger.debug("Camera %s: Processing received stop sentinel. Breaking loop.", self.camera_input)
+                break
 
             frame_counter += 1
 
             process_this_frame = (frame_counter % config.FRAME_PROCESS_SKIP_RATE == 0) # Use config
 
-            drawn_frame = frame.copy() 
+            # Frames that are not processed are passed on as-is (boxes=None: nothing to draw).
+            packet = FramePacket(frame, None, None, self._frame_pool)
 
             if process_this_frame:
-                small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
-                rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+                captured_frame = frame
+                frame = frame_to_bgr(frame) # Raw YUYV frames are converted only when they are run through recognition
+                if frame is not captured_frame:
+                    self._frame_pool.release(captured_frame)
+                small_h, small_w = int(round(frame.shape[0] * 0.25)), int(round(frame.shape[1] * 0.25))
+                if self._small_bgr_buf is None or self._small_bgr_buf.shape[:2] != (small_h, small_w):
+                    self._small_bgr_buf = np.empty((small_h, small_w, 3), dtype=np.uint8)
+                    self._small_rgb_buf = np.empty((small_h, small_w, 3), dtype=np.uint8)
+                small_frame = cv2.resize(frame, (small_w, small_h), dst=self._small_bgr_buf)
+                rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB, dst=self._small_rgb_buf)
 
                 if rgb_small_frame is None or rgb_small_frame.size == 0:
-                    print(f"WARNING: Camera {self.camera_input}: rgb_small_frame is invalid. Skipping face detection.", flush=True)
-                    try:
-                        self.frame_queue.put_nowait(drawn_frame) 
-                    except queue.Full:
-                        pass
-                    time.sleep(0.005)
+                    logger.warning("Camera %s: rgb_small_frame is invalid. Skipping face detection.", self.camera_input)
+                    self._publish_frame(packet)
                     continue
 
                 face_locations = []
                 face_encodings = []
                 try:
-                    face_locations = face_recognition.face_locations(rgb_small_frame, model=config.FACE_DETECTION_MODEL)
+                    # This thread schedules the work; the heavy dlib calls run in the shared recognition pool
+                    # when there is one. Without YuNet, detection and encoding go there in one round trip.
+                    pool_encodings = None
+                    recognition_pool = _recognition_pool # Read once: stop_recognition_pool() may reset it meanwhile
+                    if recognition_pool is not None and not _YUNET_AVAILABLE:
+                        face_locations, pool_encodings = _run_in_pool(recognition_pool, _detect_and_encode, (rgb_small_frame, _DETECTION_MODEL), self.stop_event)
+                    else:
+                        face_locations = self._detect_faces(frame, rgb_small_frame)
                     
-                    MAX_REASONABLE_FACES = 10 
-                    if len(face_locations) > MAX_REASONABLE_FACES:
-                        print(f"ERROR: Camera {self.camera_input}: Detected {len(face_locations)} faces (max {MAX_REASONABLE_FACES} allowed). Resetting to 0.", flush=True)
+                    if len(face_locations) > _MAX_REASONABLE_FACES:
+                        logger.error("Camera %s: Detected %s faces (max %s allowed). Resetting to 0.", self.camera_input, len(face_locations), _MAX_REASONABLE_FACES)
                         face_locations = []
                         continue
                         
-                    valid_face_locations = []
-                    min_face_size = 20  
-                    for (top, right, bottom, left) in face_locations:
-                        face_height = bottom - top
-                        face_width = right - left
-                        if face_height >= min_face_size and face_width >= min_face_size:
-                            valid_face_locations.append((top, right, bottom, left))
-                        else:
-                            print(f"WARNING: Camera {self.camera_input}: Discarding too small face ({face_width}x{face_height}px) in frame {frame_counter}.", flush=True)
+                    valid_face_locations = _valid_face_locations(face_locations)
+                    if len(valid_face_locations) < len(face_locations):
+                        for (top, right, bottom, left) in face_locations:
+                            if bottom - top < _MIN_FACE_SIZE or right - left < _MIN_FACE_SIZE:
+                                logger.warning("Camera %s: Discarding too small face (%sx%spx) in frame %s.", self.camera_input, right - left, bottom - top, frame_counter)
                     face_locations = valid_face_locations
 
-                    face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
+                    if pool_encodings is not None:
+                        face_encodings = pool_encodings # Already encoded by _detect_and_encode
+                    elif recognition_pool is not None and face_locations:
+                        face_encodings = _run_in_pool(recognition_pool, face_embedding.encode_faces, (rgb_small_frame, face_locations), self.stop_event)
+                    else:
+                        face_encodings = face_embedding.encode_faces(rgb_small_frame, face_locations)
+                except _PoolCallAborted:
+                    break # Stopping: the pool result for this frame is not needed any more
                 except Exception as e:
-                    print(f"CRITICAL ERROR: Camera {self.camera_input}: Unhandled face detection/encoding exception: {e}. THIS IS LIKELY A STABILITY ISSUE.", flush=True)
+                    logger.critical("Camera %s: Unhandled face detection/encoding exception: %s. THIS IS LIKELY A STABILITY ISSUE.", self.camera_input, e)
                     self.stop_event.set()
-                    try:
-                        self.frame_queue.put_nowait(drawn_frame)
-                    except queue.Full:
-                        pass
+                    self._publish_frame(packet)
                     time.sleep(0.005)
                     break 
-                
-                if self.stop_event.is_set():
-                    print(f"DEBUG: Camera {self.camera_input}: Processing detected stop event after face recognition. Breaking loop.", flush=True)
-                    break 
 
                 faces_to_display_on_frame = []
                 current_frame_has_unknown_intruder = False # Renamed for clarity
@@ -200,17 +715,12 @@ class CameraStream:
                     recognized_name_with_gender = "Unknown" # Default if unknown
                     recognized_person_name_only = "Unknown" # Default for display
 
-                    if self.known_face_encodings: 
-                        matches = face_recognition.compare_faces(self.known_face_encodings, face_encoding, tolerance=self.recognition_tolerance)
-                        face_distances = face_recognition.face_distance(self.known_face_encodings, face_encoding)
-
-                        if len(face_distances) > 0:
-                            best_match_index = np.argmin(face_distances)
-                            if matches[best_match_index]:
-                                recognized_name_with_gender = self.known_face_names[best_match_index]
-                                recognized_gender_only = self.known_face_genders[best_match_index]
-                                recognized_person_name_only = recognized_name_with_gender.split('__')[0] \
-                                                              if '__' in recognized_name_with_gender else recognized_name_with_gender
+                    if len(self._known_arr) > 0: 
+                        best_match_index = self._match_known(face_encoding.astype(np.float32))
+                        if best_match_index >= 0:
+                            recognized_name_with_gender = self.known_face_names[best_match_index]
+                            recognized_gender_only = self.known_face_genders[best_match_index]
+                            recognized_person_name_only = self.known_face_display_names[best_match_index]
 
                     # If still unknown, it's an intruder
                     if recognized_name_with_gender == "Unknown":
@@ -232,35 +742,27 @@ class CameraStream:
                                 _last_unknown_capture_time = current_time_epoch # Update global debounce time
                                 trigger_full_intruder_event = True # Allowed to trigger the full event
                             else:
-                                print(f"DEBUG: Camera {self.camera_input}: Full intruder event debounce active. Skipping capture/log/email.", flush=True)
+                                logger.debug("Camera %s: Full intruder event debounce active. Skipping capture/log/email.", self.camera_input)
 
                         if trigger_full_intruder_event: 
                             try:
                                 # 1. Get/Assign Intruder ID from intruder_tracker
                                 # intruder_tracker now only returns the ID.
                                 intruder_id_for_event = intruder_tracker.match_or_add_intruder(face_encoding)
-                                print(f"INFO: Camera {self.camera_input}: [Intruder Event Triggered] ID: {intruder_id_for_event}", flush=True)
+                                logger.info("Camera %s: [Intruder Event Triggered] ID: %s", self.camera_input, intruder_id_for_event)
 
                                 # 2. Capture a NEW image for this specific event
                                 # Generate a unique filename and full path for this intruder snapshot.
-                                timestamp_str_for_capture = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-                                newly_captured_intruder_filename = f"intruder_{timestamp_str_for_capture}.jpg"
-                                full_path_for_new_capture = os.path.join(config.INTRUDERS_FOLDER, newly_captured_intruder_filename)
-                                
-                                cv2.imwrite(full_path_for_new_capture, frame) # Save the full frame of the intruder
-                                print(f"INFO: Camera {self.camera_input}: Captured NEW intruder image: {full_path_for_new_capture}", flush=True)
+                                # One timestamp is shared by the snapshot name and the email alert.
+                                event_time = datetime.datetime.now()
+                                full_path_for_new_capture = f"{_INTRUDER_PATH_PREFIX}{event_time:%Y%m%d_%H%M%S_%f}.jpg"
                                 
-                                # 3. Log the event with the path to the NEWLY CAPTURED IMAGE
-                                logging_manager.write_log_entry(intruder_id_for_event, "Intruder", image_link=full_path_for_new_capture)
-                                print(f"INFO: Camera {self.camera_input}: Logged intruder entry with image: '{full_path_for_new_capture}'", flush=True)
-                                
-                                # 4. Send Email Alert
-                                alert_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                email_sender.send_alert_in_thread(full_path_for_new_capture, alert_time, str(self.camera_input))
-                                print(f"DEBUG: Camera {self.camera_input}: Started email alert thread.", flush=True)
+                                # 3. Save the image, log the event and send the email alert in the background
+                                _io_executor.submit(_persist_intruder_event, frame.copy(), full_path_for_new_capture,
+                                                    intruder_id_for_event, self.camera_input, event_time)
                                 
                             except Exception as e:
-                                print(f"ERROR: Camera {self.camera_input}: Failed to handle full intruder event (capture/log/email): {e}", flush=True)
+                                logger.error("Camera %s: Failed to handle full intruder event (capture/log/email): %s", self.camera_input, e)
                         
                         # Update display name for this specific intruder
                         recognized_person_name_only = intruder_id_for_event # Display "Intruder_X"
@@ -282,49 +784,45 @@ class CameraStream:
                             logging_manager.write_log_entry(recognized_person_name_only, recognized_gender_only, image_link=None) 
                             self.last_logged_times[recognized_name_with_gender] = current_time_dt
                     
-                # --- Display results (drawing on drawn_frame) ---
-                # This part is outside the 'if unknown_face_detected_in_current_frame' block,
-                # so it applies to both known and unknown faces that were detected.
-                if len(face_locations) > 0:
-                    for (top, right, bottom, left), display_name_on_frame in zip(face_locations, faces_to_display_on_frame):
-                        top *= 4 ; right *= 4 ; bottom *= 4 ; left *= 4
-                        color = (0, 255, 0) if display_name_on_frame != "Unknown" and not display_name_on_frame.startswith("Intruder_") else (0, 0, 255) # Green for known, Red for unknown/intruder
-                        cv2.rectangle(drawn_frame, (left, top), (right, bottom), color, 2)
-
-                        cv2.rectangle(drawn_frame, (left, bottom - 35), (right, bottom), color, cv2.FILLED)
-                        font = cv2.FONT_HERSHEY_SIMPLEX
-                        font_scale = 0.8
-                        font_thickness = 2
-                        text_color = (0, 0, 0) if display_name_on_frame != "Unknown" and not display_name_on_frame.startswith("Intruder_") else (255, 255, 255)
-                        cv2.putText(drawn_frame, display_name_on_frame, (left + 6, bottom - 6), font, font_scale, text_color, font_thickness)
-                else: 
-                    text = "Non human object or no face detected"
-                    font = cv2.FONT_HERSHEY_SIMPLEX
-                    font_scale = 0.7
-                    font_thickness = 2
-                    text_x = 10 ; text_y = 30
-                    text_size = cv2.getTextSize(text, font, font_scale, font_thickness)[0]
-                    cv2.rectangle(drawn_frame, (text_x - 5, text_y - text_size[1] - 5),
-                                (text_x + text_size[0] + 5, text_y + 5), (0, 0, 255), cv2.FILLED)
-                    cv2.putText(drawn_frame, text, (text_x, text_y), font, font_scale, (255, 255, 255), font_thickness)
+                # --- Display results ---
+                # Boxes are scaled back up to the full frame; drawing happens in the display thread (draw_frame_packet).
+                face_boxes = [(top * 4, right * 4, bottom * 4, left * 4) for (top, right, bottom, left) in face_locations]
+                packet = FramePacket(frame, face_boxes, faces_to_display_on_frame, self._frame_pool)
             
-            try:
-                self.frame_queue.put_nowait(drawn_frame)
-            except queue.Full:
-                print(f"WARNING: Camera {self.camera_input}: Display queue full for main thread. Dropping frame.", flush=True)
-                pass 
+            self._publish_frame(packet)
 
-            time.sleep(0.001) 
+        logger.debug("Camera %s: Processing thread loop exited cleanly.", self.camera_input) 
 
-        print(f"DEBUG: Camera {self.camera_input}: Processing thread loop exited cleanly.", flush=True) 
+    def _publish_frame(self, packet):
+        """
+        Places a FramePacket in the display slot and notifies the display, if a callback was given.
+        The packet's frame must be a C-contiguous uint8 array (H x W x 3 BGR, or H x W x 2 raw YUYV); the
+        display draws on it and scales it without defensive copies. Checked only when assertions are enabled.
+        """
+        assert packet.frame.flags["C_CONTIGUOUS"] and packet.frame.dtype == np.uint8, "display frames must be C-contiguous uint8"
+        # frame_queue is a deque(maxlen=1): the frame the display has not shown yet is replaced, so
+        # the display always gets the newest one and never lags behind. The replaced frame's buffer is
+        # recycled (only one of this pop and the display's pop can get it).
+        try:
+            stale_packet = self.frame_queue.pop()
+        except IndexError:
+            stale_packet = None
+        self.frame_queue.append(packet)
+        if stale_packet is not None:
+            release_frame_packet(stale_packet)
+        if self.on_frame_ready is not None:
+            self.on_frame_ready(self.camera_input)
 
     def start(self):
         """Starts the camera stream's reader and processing threads."""
         self.reader_thread.start()
         self.processing_thread.start()
-        print(f"DEBUG: Camera {self.camera_input}: Threads initiated and started.", flush=True)
+        logger.debug("Camera %s: Threads initiated and started.", self.camera_input)
 
     def stop(self):
         """Signals the camera stream threads to stop."""
-        print(f"DEBUG: Camera {self.camera_input}: Stop method called. Setting stop_event.", flush=True)
-        self.stop_event.set()
\ No newline at end of file
+        logger.debug("Camera %s: Stop method called. Setting stop_event.", self.camera_input)
+        self.stop_event.set()
+        # Wake the processing thread with a None sentinel instead of letting it time out.
+        self._latest_frame.append(None)
+        self._new_frame_event.set()
\ No newline at end of file
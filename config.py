@@ -9,9 +9,18 @@ DATASET_BASE_PATH = r"E:\sem 6\face recg wts\changingview\images"
 
 # Other data file paths. These names are derived from your existing scripts.
 LOG_FILE_PATH = "entry_log_dataset2.txt"  # Used in gpt31standalone.py 
-ENCODINGS_FILE = "encodings1.pkl"         # Used in gpt31standalone.py , delete_person.py , update_face_encodings.py 
+ENCODINGS_FILE = "encodings1.pkl"         # Legacy pickle; only read once to create the store below
+# Append-only encoding store used by the application (face_data_manager), delete_person.py and update_face_encodings.py.
+# ENCODINGS_FILE above is imported into it automatically the first time, if the store does not exist yet.
+ENCODINGS_MATRIX_FILE = "encodings1.f32"           # Raw float32 rows, 128 values per face
+ENCODINGS_NAMES_FILE = "encodings1_names.jsonl"    # One JSON string ("Name__gender") per line, same order as the rows
+ENCODINGS_MANIFEST_FILE = "encodings1_manifest.json" # Dataset images already encoded: path -> [mtime_ns, size]
 INTRUDERS_FOLDER = "intruders"            # Used in gpt31standalone.py 
 INTRUDER_ENCODINGS_FILE = "intruder_encodings.pkl" # Used in intruder_tracker.py 
+# Store used by intruder_tracker, like the known-face store above. INTRUDER_ENCODINGS_FILE is imported into it
+# automatically the first time, if the store does not exist yet.
+INTRUDER_ENCODINGS_MATRIX_FILE = "intruder_encodings.f32" # Raw float32 rows, 128 values per intruder
+INTRUDER_IDS_FILE = "intruder_ids.jsonl"                  # One JSON string ("Intruder_N") per line, same order as the rows
 
 
 # --- Debounce Times (in seconds) ---
@@ -23,6 +32,19 @@ KNOWN_FACE_LOG_DEBOUNCE_TIME = 25   # From gpt31standalone.py
 # --- Face Recognition Settings ---
 # 'hog' is faster but less accurate; 'cnn' is slower but more accurate.
 FACE_DETECTION_MODEL = "hog" # From gpt31standalone.py 
+# Use dlib's 'cnn' detector when dlib was built with CUDA (checked at runtime).
+# Without a CUDA build, FACE_DETECTION_MODEL above is used as the fallback.
+USE_GPU_DETECTOR = True
+# Optional OpenCV YuNet detector (several times faster than HOG on CPU). Download
+# 'face_detection_yunet_2023mar.onnx' from the OpenCV model zoo and place it next to this file.
+# If the model file is missing (or OpenCV is older than 4.5.4), FACE_DETECTION_MODEL is used instead.
+YUNET_MODEL_PATH = "face_detection_yunet_2023mar.onnx"
+YUNET_SCORE_THRESHOLD = 0.6 # Minimum detection confidence for YuNet
+# Optional ONNX face embedder (e.g. MobileFaceNet with 128-d output, INT8-quantized with
+# onnxruntime.quantization.quantize_dynamic) used instead of dlib's ResNet; needs onnxruntime.
+# Its encodings are NOT compatible with dlib's: point ENCODINGS_MATRIX_FILE / ENCODINGS_NAMES_FILE at new files, re-run
+# "Update Existing Encodings", and retune RECOGNITION_TOLERANCE (embeddings are L2-normalized).
+FACE_EMBEDDER_ONNX_PATH = None # e.g. "mobilefacenet_int8.onnx"
 # Matching tolerance (lower = stricter match, fewer false positives).
 RECOGNITION_TOLERANCE = 0.6 # From gpt31standalone.py 
 
@@ -32,6 +54,44 @@ RECOGNITION_TOLERANCE = 0.6 # From gpt31standalone.py
 CAMERA_FRAME_WIDTH = 320 # Default to your current setting for consistency
 CAMERA_FRAME_HEIGHT = 240 # Default to your current setting for consistency
 
+# USB webcams: keep frames in the camera's native YUYV format (CAP_PROP_CONVERT_RGB=0, 2 bytes per pixel
+# instead of 3) and convert to BGR only for frames that are run through recognition or displayed.
+# Cameras/backends that do not deliver YUYV this way automatically fall back to BGR frames.
+CAMERA_KEEP_RAW_YUYV = True
+
+# USB webcams: pixel format requested from the camera (a FourCC such as "MJPG" or "YUYV"; None = driver default).
+# Most webcams reach their full frame rate at 640x480 and above only with "MJPG", which OpenCV decodes with
+# libjpeg-turbo. Any format other than "YUYV" turns CAMERA_KEEP_RAW_YUYV off. On Linux, USB webcams are
+# always opened through V4L2 directly (cv2.CAP_V4L2) so the format request reaches the driver.
+USB_CAMERA_FOURCC = None
+
+# Optional GStreamer pipeline for IP camera URLs (requires OpenCV built with GStreamer).
+# Decoding and scaling then happen inside the capture pipeline (in hardware with a suitable decoder)
+# instead of in Python. Placeholders: {url}, {width}, {height}. None = plain cv2.VideoCapture(url).
+# Example for RTSP/H.264 on a Jetson:
+#   "rtspsrc location={url} latency=0 ! rtph264depay ! h264parse ! nvv4l2decoder ! nvvidconv ! "
+#   "video/x-raw,format=BGRx,width={width},height={height} ! videoconvert ! video/x-raw,format=BGR ! appsink drop=1"
+IP_CAMERA_GSTREAMER_PIPELINE = None
+
+# Seconds to wait for an IP camera to connect when it is opened, before it is skipped
+# (instead of FFmpeg's default of about 30 seconds; needs OpenCV 4.5.3 or newer).
+CAMERA_OPEN_TIMEOUT_SECONDS = 5
+
+# FFmpeg options for IP cameras opened without a GStreamer pipeline ("key;value" pairs separated by "|").
+# RTSP over TCP avoids the smeared or dropped frames UDP loses packets to; other protocols ignore it.
+# An OPENCV_FFMPEG_CAPTURE_OPTIONS environment variable, if set, is used instead. None = FFmpeg defaults.
+IP_CAMERA_FFMPEG_OPTIONS = "rtsp_transport;tcp"
+
+# Worker processes shared by all camera streams for face detection/encoding (bypasses the GIL).
+# None = one per active camera (capped at CPU count - 1), when 2+ cameras are active or the GUI displays the
+#        cameras (keeps the GUI responsive during detection; not on single-CPU machines).
+# 0 = always run detection/encoding inside each camera's own thread.
+RECOGNITION_WORKER_PROCESSES = None
+
+# Linux only: pin each camera's reader and processing threads to two adjacent, distinct CPU cores
+# (cameras are staggered across the available cores). Ignored on other platforms.
+PIN_CAMERA_THREADS_TO_CORES = True
+
 # Number of frames to skip before processing (face detection/recognition).
 # 1 = process every frame, 2 = process every 2nd frame, 4 = process every 4th frame (your current)
 FRAME_PROCESS_SKIP_RATE = 4 # Default to your current setting
@@ -46,6 +106,16 @@ EMAIL_CONFIG = { # From gpt31standalone.py
     'subject': ' INTRUDER ALERT - kewal Face Recognition System'
 }
 
+# Worker threads that send email alerts, and how many alerts may wait for them in memory.
+# Further alerts wait in EMAIL_SPOOL_FOLDER on disk, where failed sends are also kept for retrying.
+EMAIL_WORKERS = 2
+EMAIL_MAX_PENDING = 20
+EMAIL_SPOOL_FOLDER = "email_spool"
+# Seconds an SMTP connect, STARTTLS, login or send may block before the attempt fails and is retried from the spool.
+EMAIL_SMTP_TIMEOUT_SECONDS = 30
+# Minimum seconds between two email alerts from the same camera (snapshots and log entries are not affected).
+EMAIL_MIN_INTERVAL_PER_CAMERA = 60
+
 # --- Camera Configuration ---
 # For USB webcams, add their numerical indices here (e.g., [0, 1]).
 # If you have a built-in webcam, it's usually 0.
@@ -1,5 +1,5 @@
-import random
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import datetime
 
 # Output file name
 output_file = "cctv_log.txt"
@@ -11,6 +11,9 @@ known_people = [
     {"name": "chaitali", "gender": "female"},
 ]
 
+# Number of rows to generate
+num_rows = 100
+
 # Start time
 base_time = datetime(2025, 7, 31, 14, 27, 40)
 
@@ -18,31 +21,42 @@ base_time = datetime(2025, 7, 31, 14, 27, 40)
 header = "NAME                      | GENDER   | DAY    | DATE         | TIME     | IMAGE_LINK\n"
 separator = "-" * 26 + "+" + "-" * 10 + "+" + "-" * 8 + "+" + "-" * 14 + "+" + "-" * 10 + "+" + "-" * 50 + "\n"
 
-# Store lines
-lines = [header, separator]
-
-# Generate 100 rows
-for _ in range(100):
-    base_time += timedelta(seconds=random.randint(3, 15))
-    day = base_time.strftime("%a")
-    date = base_time.strftime("%Y-%m-%d")
-    time_str = base_time.strftime("%H:%M:%S")
-
-    if random.random() < 0.3:
-        person = random.choice(known_people)
-        name = person["name"]
-        gender = person["gender"]
-        image_link = "N/A"
-    else:
-        intruder_id = random.randint(111, 1110)
-        name = f"Intruder_{intruder_id}"
-        gender = "Intruder"
-        rand_num = random.randint(100000, 999999)
-        image_link = f"intruders\\intruder_{base_time.strftime('%Y%m%d_%H%M%S')}_{rand_num}.jpg"
-
-    # Format line
-    line = f"{name:<26}| {gender:<9}| {day:<6}| {date:<12}| {time_str:<9}| {image_link}"
-    lines.append(line)
+rng = np.random.default_rng()
+
+# Timestamps: each row is 3-15 seconds after the previous one
+offsets = rng.integers(3, 16, size=num_rows).cumsum()
+timestamps = np.datetime64(base_time, "s") + offsets.astype("timedelta64[s]")
+iso = np.datetime_as_string(timestamps)            # e.g. 2025-07-31T14:27:51
+date = np.char.partition(iso, "T")[:, 0]           # e.g. 2025-07-31
+time_str = np.char.partition(iso, "T")[:, 2]       # e.g. 14:27:51
+# 1970-01-01 was a Thursday, so (days since epoch + 3) % 7 gives Monday=0
+day_names = np.array(["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"])
+day = day_names[(timestamps.astype("datetime64[D]").astype(np.int64) + 3) % 7]
+
+# ~30% known people, the rest intruders
+is_known = rng.random(num_rows) < 0.3
+known_names = np.array([p["name"] for p in known_people])
+known_genders = np.array([p["gender"] for p in known_people])
+person_idx = rng.integers(0, len(known_people), size=num_rows)
+intruder_ids = rng.integers(111, 1111, size=num_rows).astype(str)
+rand_nums = rng.integers(100000, 1000000, size=num_rows).astype(str)
+
+name = np.where(is_known, known_names[person_idx], np.char.add("Intruder_", intruder_ids))
+gender = np.where(is_known, known_genders[person_idx], "Intruder")
+stamp = np.char.add(np.char.add(np.char.replace(date, "-", ""), "_"), np.char.replace(time_str, ":", ""))
+intruder_links = np.char.add(np.char.add(np.char.add("intruders\\intruder_", stamp), "_"), np.char.add(rand_nums, ".jpg"))
+image_link = np.where(is_known, "N/A", intruder_links)
+
+# Format lines: NAME | GENDER | DAY | DATE | TIME | IMAGE_LINK
+columns = [
+    np.char.ljust(name, 26), np.char.ljust(gender, 9), np.char.ljust(day, 6),
+    np.char.ljust(date, 12), np.char.ljust(time_str, 9), image_link,
+]
+rows = columns[0]
+for column in columns[1:]:
+    rows = np.char.add(np.char.add(rows, "| "), column)
+
+lines = [header, separator] + rows.tolist()
 
 # Write to file
 with open(output_file, "w") as f:
@@ -1,40 +1,32 @@
 import sys
-import pickle
-import os
+import numpy as np
+
+import face_data_manager # The application's encoding store (matrix + names files)
 
 if len(sys.argv) < 2:
     print(" No name provided to delete.")
     exit()
 
 person_to_remove = sys.argv[1]  # ✅ Get name from argument
-encoding_file = "encodings1.pkl"
 
-# Check if encoding file exists
-if not os.path.exists(encoding_file):
-    print(" Encoding file not found.")
+# Load the existing data from the encoding store the application reads (imports the old encodings1.pkl once)
+known_face_encodings, known_face_names, _ = face_data_manager.load_known_face_encodings()
+
+# Check if there is anything to delete from
+if not known_face_names:
+    print(" No face encodings found.")
     exit()
 
-# Load the existing data
-with open(encoding_file, "rb") as f:
-    known_face_encodings, known_face_names = pickle.load(f)
+# Filter out the person to remove with a boolean mask
+keep_mask = np.array(known_face_names, dtype=object) != person_to_remove
 
-if person_to_remove not in known_face_names:
+if keep_mask.all():
     print(f"No person named '{person_to_remove}' found in encodings.")
     exit()
 
-
-# Filter out the person to remove
-filtered_encodings = []
-filtered_names = []
-
-for encoding, name in zip(known_face_encodings, known_face_names):
-    if name != person_to_remove:
-        filtered_encodings.append(encoding)
-        filtered_names.append(name)
-
-# Save updated data
-with open(encoding_file, "wb") as f:
-    pickle.dump((filtered_encodings, filtered_names), f)
+# Rewrite the store without the person's rows
+face_data_manager.save_known_face_encodings(known_face_encodings[keep_mask],
+                                            [name for name, keep in zip(known_face_names, keep_mask) if keep])
 
 print(f" Removed '{person_to_remove}' from encodings.")
-#print(f" {len(filtered_names)} people remaining.")
+#print(f" {int(keep_mask.sum())} people remaining.")
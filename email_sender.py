@@ -1,18 +1,286 @@
 # email_sender.py
 import os
+import re
+import base64
+import mimetypes
+import string
+import io
+import json
+import uuid
 import smtplib
+import socket
 import ssl
 import datetime
 import numpy as np
 import cv2
-import threading # For sending emails in a separate thread
+import threading
+import time
+import queue
+import atexit
+import concurrent.futures # Bounded worker pool for sending emails
 
+import email.policy
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.mime.image import MIMEImage
+from email.mime.base import MIMEBase
 
 import config # Import the centralized configuration
 
+# Shared worker pool for all alerts. A bounded semaphore caps queued + running alerts in memory; the rest
+# wait in the email spool on disk (see below).
+_EMAIL_WORKERS = config.EMAIL_WORKERS or 2
+_EMAIL_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=_EMAIL_WORKERS, thread_name_prefix="email")
+_pending_slots = threading.BoundedSemaphore(_EMAIL_WORKERS + config.EMAIL_MAX_PENDING)
+
+def _cancel_pending_emails():
+    """
+    Drops the queued (not yet started) sends at interpreter exit. The pool's workers are not daemon threads and
+    concurrent.futures joins them before atexit hooks run, so this is registered with threading's own exit hooks,
+    which run (newest first) before that join. The alerts stay in the spool on disk and are sent on the next start.
+    """
+    _EMAIL_POOL.shutdown(wait=False, cancel_futures=True)
+
+threading._register_atexit(_cancel_pending_emails)
+
+# Reuse an authenticated SMTP session for several alerts instead of connecting, STARTTLS-ing and logging in
+# for every one. A session is dropped after being idle this long or after this many messages.
+_SMTP_MAX_IDLE_SECONDS = 90
+_SMTP_MAX_MESSAGES = 100
+
+# TLS context built once (parsing the system CA bundle is not free) and shared by all SMTP sessions.
+_SSL_CONTEXT = ssl.create_default_context()
+
+# SMTP server addresses resolved once and reused for reconnects; refreshed after this many seconds.
+_SMTP_DNS_TTL_SECONDS = 300
+_smtp_address_cache = {} # (hostname, port) -> (list of getaddrinfo() results, time.monotonic() of resolution)
+_smtp_address_lock = threading.Lock()
+
+def _resolve_smtp_addresses(hostname, port):
+    """
+    Returns (all getaddrinfo() results for the SMTP server, True if they came from the cache), resolving again
+    when the cached ones are older than the TTL.
+    """
+    with _smtp_address_lock:
+        cached = _smtp_address_cache.get((hostname, port))
+    if cached is not None and time.monotonic() - cached[1] < _SMTP_DNS_TTL_SECONDS:
+        return cached[0], True
+    addresses = socket.getaddrinfo(hostname, port, type=socket.SOCK_STREAM)
+    with _smtp_address_lock:
+        _smtp_address_cache[(hostname, port)] = (addresses, time.monotonic())
+    return addresses, False
+
+def _prefer_smtp_address(hostname, port, address_info):
+    """Moves an address that accepted a connection to the front of the cached list, so reconnects try it first."""
+    with _smtp_address_lock:
+        cached = _smtp_address_cache.get((hostname, port))
+        if cached is not None and address_info in cached[0]:
+            _smtp_address_cache[(hostname, port)] = ([address_info] + [a for a in cached[0] if a != address_info], cached[1])
+
+class _CachedAddressSMTP(smtplib.SMTP):
+    """
+    smtplib.SMTP that connects through the cached server addresses (see _resolve_smtp_addresses), trying each
+    in turn like socket.create_connection does. Create it with the hostname (which connects): STARTTLS then uses
+    the hostname for SNI and the certificate check. If no cached address answers, the hostname is resolved again once.
+    """
+
+    def _get_socket(self, host, port, timeout):
+        last_error = OSError(f"No addresses found for {host}")
+        while True:
+            addresses, from_cache = _resolve_smtp_addresses(host, port)
+            for address_info in addresses:
+                try:
+                    sock = socket.create_connection(address_info[4][:2], timeout, self.source_address)
+                except OSError as e:
+                    last_error = e
+                    continue
+                _prefer_smtp_address(host, port, address_info)
+                return sock
+            # None answered: the cached addresses may be stale
+            with _smtp_address_lock:
+                _smtp_address_cache.pop((host, port), None)
+            if not from_cache:
+                raise last_error
+
+class _SmtpConnection:
+    """One cached, logged-in SMTP session. Reconnects on demand when stale, over-used or disconnected."""
+
+    def __init__(self):
+        self.server = None
+        self.last_used = 0.0
+        self.sent_count = 0
+        self.lock = threading.Lock()
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass # Connection may already be gone
+        self.server = None
+
+    def _connect(self, email_config):
+        print(f"DEBUG: email_sender: Connecting to SMTP server {email_config['smtp_server']}:{email_config['smtp_port']}...", flush=True)
+        hostname, port = email_config['smtp_server'], email_config['smtp_port']
+        # Bounds every blocking socket call of the session, so a half-open connection cannot hold a worker forever
+        # Connects through the cached addresses, without a DNS lookup per reconnect
+        server = _CachedAddressSMTP(hostname, port, timeout=config.EMAIL_SMTP_TIMEOUT_SECONDS)
+        try:
+            # No Nagle delay on the small command/reply exchanges; larger send buffer for the attachment.
+            # Set on the plain socket; the options carry over to the TLS-wrapped one.
+            server.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            server.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SMTP_SNDBUF_BYTES)
+            server.starttls(context=_SSL_CONTEXT) # Upgrade the connection to a secure encrypted SSL/TLS connection
+            server.login(email_config['sender'], email_config['password']) # Login to the SMTP server
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+        self.sent_count = 0
+
+    def _ensure_connected(self, email_config):
+        """Returns a live server, replacing the cached one if it is stale, over-used or no longer answers NOOP."""
+        if self.server is not None:
+            stale = time.monotonic() - self.last_used > _SMTP_MAX_IDLE_SECONDS or self.sent_count >= _SMTP_MAX_MESSAGES
+            if not stale:
+                try:
+                    if self.server.noop()[0] == 250:
+                        return self.server
+                except (smtplib.SMTPException, OSError):
+                    pass # Server dropped the connection or timed out; reconnect below
+            self.close()
+        self._connect(email_config)
+        return self.server
+
+    def send(self, transmit, email_config):
+        """
+        Calls transmit(server) on the cached session, retrying once on a fresh connection if the server disconnected.
+        """
+        with self.lock:
+            try:
+                try:
+                    transmit(self._ensure_connected(email_config))
+                except smtplib.SMTPServerDisconnected:
+                    self.close()
+                    transmit(self._ensure_connected(email_config))
+            except Exception:
+                self.close() # Never reuse a session in an unknown state
+                raise
+            self.sent_count += 1
+            self.last_used = time.monotonic()
+
+# One session per email worker; a worker takes one for the duration of a send and returns it afterwards.
+_smtp_connections = queue.LifoQueue() # LIFO: reuse the most recently used (still warm) session first
+for _ in range(_EMAIL_WORKERS):
+    _smtp_connections.put(_SmtpConnection())
+
+def _close_smtp_connections():
+    """Logs out of any cached SMTP sessions at interpreter exit."""
+    while not _smtp_connections.empty():
+        _smtp_connections.get_nowait().close()
+
+atexit.register(_close_smtp_connections)
+
+# Email body with HTML formatting for better presentation. Built once; only the time and camera are filled in per alert.
+_BODY_TEMPLATE = string.Template("""
+    <html>
+    <head></head>
+    <body>
+        <h2>Intruder Detected!</h2>
+        <p><b>Time:</b> $timestamp</p>
+        <p><b>Camera ID:</b> $camera_id</p>
+        <p>The face recognition system detected an unrecognized face.</p>
+        <p>Please review the attached image for details.</p>
+        <br>
+        <p>This is an automated alert from your surveillance system.</p>
+    </body>
+    </html>
+    """)
+
+# Send buffer requested for SMTP sockets, so a whole attachment chunk sequence fits without stalling on the kernel buffer.
+_SMTP_SNDBUF_BYTES = 256 * 1024
+
+# The image attachment is never held in memory as a whole: the message is serialized with this placeholder as the
+# attachment payload, and the file is base64-encoded and written to the SMTP socket chunk by chunk in its place.
+_ATTACHMENT_PLACEHOLDER = b"@@ATTACHMENT_DATA@@"
+_ATTACHMENT_CHUNK_BYTES = 57 * 72 # 57 raw bytes = one 76-character base64 line; ~4 KB per read
+
+def _dot_stuff(data):
+    """Escapes lines starting with '.' as required inside SMTP DATA (RFC 5321 4.5.2)."""
+    return re.sub(rb'(?m)^\.', b'..', data)
+
+# Attachments larger than this are checked and, if over _THUMBNAIL_MAX_SIDE pixels, re-encoded smaller.
+# Snapshots from the (downscaled) camera frames are far below it and are sent as they are, without decoding.
+_THUMBNAIL_MIN_BYTES = 100 * 1024
+_THUMBNAIL_MAX_SIDE = 800
+_THUMBNAIL_JPEG_QUALITY = 80
+
+def _thumbnail_jpeg(image_path):
+    """
+    Returns JPEG bytes of the image scaled to fit _THUMBNAIL_MAX_SIDE, or None if the image is already small
+    (or cannot be decoded), in which case the original file is attached.
+    """
+    if os.path.getsize(image_path) <= _THUMBNAIL_MIN_BYTES:
+        return None
+    image = cv2.imread(image_path, cv2.IMREAD_COLOR)
+    if image is None:
+        return None
+    height, width = image.shape[:2]
+    scale = _THUMBNAIL_MAX_SIDE / max(height, width)
+    if scale < 1.0:
+        image = cv2.resize(image, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+    ok, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, _THUMBNAIL_JPEG_QUALITY])
+    return encoded.tobytes() if ok else None
+
+def _streamed_attachment_part(image_path, content_type=None):
+    """Returns a base64 image MIME part whose payload is the placeholder (filled in by _stream_message)."""
+    content_type = content_type or mimetypes.guess_type(image_path)[0] or "image/jpeg"
+    maintype, subtype = content_type.split("/", 1)
+    part = MIMEBase(maintype, subtype, name=os.path.basename(image_path))
+    part['Content-Transfer-Encoding'] = 'base64'
+    part.set_payload(_ATTACHMENT_PLACEHOLDER.decode())
+    return part
+
+def _stream_message(server, msg, sender, receiver, attachment=None):
+    """
+    Sends msg over server. With an attachment (a file path, or the bytes of a thumbnail), msg must contain the
+    placeholder part from _streamed_attachment_part; the data is then streamed in base64 in its place within
+    the DATA command.
+    """
+    if attachment is None:
+        server.send_message(msg)
+        return
+
+    head, tail = msg.as_bytes(policy=email.policy.SMTP).split(_ATTACHMENT_PLACEHOLDER, 1)
+    if tail.startswith(b"\r\n"):
+        tail = tail[2:] # The last base64 line already ends with CRLF
+    if not tail.endswith(b"\r\n"):
+        tail += b"\r\n"
+
+    with (io.BytesIO(attachment) if isinstance(attachment, bytes) else open(attachment, 'rb')) as f:
+        if server.has_extn('pipelining'):
+            # RFC 2920: send MAIL, RCPT and DATA in one write and read the three replies afterwards (one round trip).
+            server.send(f"MAIL FROM:{smtplib.quoteaddr(sender)}\r\nRCPT TO:{smtplib.quoteaddr(receiver)}\r\nDATA\r\n")
+            replies = [server.getreply() for _ in range(3)]
+        else:
+            replies = [server.mail(sender), server.rcpt(receiver), server.docmd("data")]
+        (mail_code, mail_resp), (rcpt_code, rcpt_resp), (data_code, data_resp) = replies
+        if mail_code != 250:
+            raise smtplib.SMTPSenderRefused(mail_code, mail_resp, sender)
+        if rcpt_code not in (250, 251):
+            raise smtplib.SMTPRecipientsRefused({receiver: (rcpt_code, rcpt_resp)})
+        if data_code != 354:
+            raise smtplib.SMTPDataError(data_code, data_resp)
+
+        server.send(_dot_stuff(head))
+        # Base64 output contains no '.', so the encoded chunks need no dot-stuffing.
+        for chunk in iter(lambda: f.read(_ATTACHMENT_CHUNK_BYTES), b""):
+            server.send(base64.encodebytes(chunk).replace(b"\n", b"\r\n"))
+        server.send(_dot_stuff(tail) + b".\r\n")
+
+        code, resp = server.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, resp)
+
 def _send_email_actual(image_path, timestamp, camera_id=""):
     """
     Internal function to send an email alert with intruder image attachment.
@@ -22,7 +290,7 @@ def _send_email_actual(image_path, timestamp, camera_id=""):
     email_config = config.EMAIL_CONFIG # Get email configuration from the config module
 
     # Basic validation for email configuration
-    if not all(key in email_config and email_config[key] for key in ['sender', 'password', 'receiver']):
+    if not _email_configured():
         print("DEBUG: email_sender: Email alerts disabled - incomplete or missing configuration.", flush=True)
         return False # Indicate failure due to config
 
@@ -33,46 +301,32 @@ def _send_email_actual(image_path, timestamp, camera_id=""):
     msg['To'] = email_config['receiver']
     msg['Subject'] = email_config['subject']
     
-    # Email body with HTML formatting for better presentation
-    body = f"""
-    <html>
-    <head></head>
-    <body>
-        <h2>Intruder Detected!</h2>
-        <p><b>Time:</b> {timestamp}</p>
-        <p><b>Camera ID:</b> {camera_id}</p>
-        <p>The face recognition system detected an unrecognized face.</p>
-        <p>Please review the attached image for details.</p>
-        <br>
-        <p>This is an automated alert from your surveillance system.</p>
-    </body>
-    </html>
-    """
+    body = _BODY_TEMPLATE.substitute(timestamp=timestamp, camera_id=camera_id)
     msg.attach(MIMEText(body, 'html'))
     
-    # Attach the intruder image if path is valid
+    # Attach the intruder image if path is valid. Large images are sent as a smaller JPEG thumbnail;
+    # otherwise the file is streamed from disk while sending.
+    attachment = None
     if image_path and os.path.exists(image_path):
         try:
-            with open(image_path, 'rb') as f:
-                img_data = f.read()
-            image = MIMEImage(img_data, name=os.path.basename(image_path))
-            msg.attach(image)
-            print(f"DEBUG: email_sender: Attached image: {os.path.basename(image_path)}", flush=True)
+            attachment = _thumbnail_jpeg(image_path)
         except Exception as e:
-            print(f"ERROR: email_sender: Failed to attach image {image_path}: {e}", flush=True)
-            # Decide if you want to send email without image or abort. For now, continue without image.
+            print(f"WARNING: email_sender: Could not create thumbnail of {image_path}: {e}. Attaching the original.", flush=True)
+        if attachment is not None:
+            msg.attach(_streamed_attachment_part(image_path, "image/jpeg"))
+        else:
+            msg.attach(_streamed_attachment_part(image_path))
+            attachment = image_path
+        print(f"DEBUG: email_sender: Attached image: {os.path.basename(image_path)}", flush=True)
     else:
         print(f"WARNING: email_sender: Image file '{image_path}' not found or path invalid. Email will be sent without attachment.", flush=True)
 
+    def transmit(server):
+        _stream_message(server, msg, email_config['sender'], email_config['receiver'], attachment)
+
+    connection = _smtp_connections.get()
     try:
-        # Secure connection to SMTP server using TLS
-        context = ssl.create_default_context()
-        print(f"DEBUG: email_sender: Connecting to SMTP server {email_config['smtp_server']}:{email_config['smtp_port']}...", flush=True)
-        with smtplib.SMTP(email_config['smtp_server'], email_config['smtp_port']) as server:
-            server.starttls(context=context) # Upgrade the connection to a secure encrypted SSL/TLS connection
-            server.login(email_config['sender'], email_config['password']) # Login to the SMTP server
-            server.send_message(msg) # Send the constructed email message
-        
+        connection.send(transmit, email_config) # Secure (STARTTLS) session, reused across alerts
         print(f"DEBUG: email_sender: Email alert sent successfully to {email_config['receiver']}.", flush=True)
         return True # Indicate success
     except smtplib.SMTPAuthenticationError as e:
@@ -87,21 +341,152 @@ def _send_email_actual(image_path, timestamp, camera_id=""):
     except Exception as e:
         print(f"CRITICAL ERROR: email_sender: An unexpected error occurred while sending email: {e}", flush=True)
         return False
+    finally:
+        _smtp_connections.put(connection)
+
+# --- Email spool ---
+# Alerts are first written as small JSON files to config.EMAIL_SPOOL_FOLDER, so the caller only pays for one file
+# write and no alert is lost while SMTP is unreachable (or when the application restarts). A single spool thread
+# hands them to the worker pool; failed sends are moved to the retry folder with an exponential backoff.
+_SPOOL_PENDING = os.path.join(config.EMAIL_SPOOL_FOLDER, "pending")
+_SPOOL_RETRY = os.path.join(config.EMAIL_SPOOL_FOLDER, "retry") # Files named "<due epoch ms>_<id>.json"
+_SPOOL_MAX_ATTEMPTS = 8
+_SPOOL_BACKOFF_BASE_SECONDS = 30
+_SPOOL_BACKOFF_MAX_SECONDS = 3600
+_SPOOL_RESCAN_SECONDS = 1.0 # Retry entries become due without a wake-up, so the folders are also rescanned periodically
+
+_spool_wakeup = threading.Event()
+_spool_in_flight = set() # Spool files handed to the pool and not finished yet
+_spool_in_flight_lock = threading.Lock()
+_spool_thread = None
+_spool_thread_lock = threading.Lock()
+
+# Per-camera email rate limit: time.monotonic() of the last alert queued for each camera_id.
+_last_alert_times = {}
+_rate_limit_lock = threading.Lock()
+
+def _email_configured():
+    """True if sender, password and receiver are all set in config.EMAIL_CONFIG."""
+    return all(key in config.EMAIL_CONFIG and config.EMAIL_CONFIG[key] for key in ['sender', 'password', 'receiver'])
+
+def _write_spool_file(folder, file_name, alert):
+    """Writes an alert descriptor atomically (temporary file + rename), so the spool thread never sees a partial file."""
+    path = os.path.join(folder, file_name)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(alert, f)
+    os.replace(path + ".tmp", path)
+
+def _process_spool_file(path):
+    """
+    Worker-pool task: sends the alert described by one spool file. The file is removed on success; on failure it
+    is moved to the retry folder with its next due time, or dropped after _SPOOL_MAX_ATTEMPTS attempts.
+    """
+    try:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                alert = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: email_sender: Dropping unreadable spool file {path}: {e}", flush=True)
+            os.remove(path)
+            return
+
+        if _send_email_actual(alert['image_path'], alert['timestamp'], alert['camera_id']):
+            os.remove(path)
+            return
+
+        alert['attempts'] = alert.get('attempts', 0) + 1
+        if alert['attempts'] >= _SPOOL_MAX_ATTEMPTS:
+            print(f"ERROR: email_sender: Giving up on alert for {alert['image_path']} after {alert['attempts']} attempts.", flush=True)
+            os.remove(path)
+            return
+        delay = min(_SPOOL_BACKOFF_BASE_SECONDS * 2 ** (alert['attempts'] - 1), _SPOOL_BACKOFF_MAX_SECONDS)
+        alert_id = os.path.basename(path).rsplit("_", 1)[-1] # "<id>.json", also for files already in the retry folder
+        _write_spool_file(_SPOOL_RETRY, f"{int((time.time() + delay) * 1000)}_{alert_id}", alert)
+        os.remove(path)
+        print(f"WARNING: email_sender: Alert for {alert['image_path']} failed (attempt {alert['attempts']}). Retrying in {delay} s.", flush=True)
+    except Exception as e:
+        print(f"ERROR: email_sender: Spool processing failed for {path}: {e}", flush=True)
+    finally:
+        with _spool_in_flight_lock:
+            _spool_in_flight.discard(path)
+        _pending_slots.release()
+
+def _due_spool_files():
+    """Returns pending spool files and retry files whose due time has passed, oldest first."""
+    now_ms = time.time() * 1000
+    due = []
+    with os.scandir(_SPOOL_PENDING) as entries:
+        due.extend((entry.stat().st_mtime, entry.path) for entry in entries if entry.name.endswith(".json"))
+    with os.scandir(_SPOOL_RETRY) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and int(entry.name.split("_", 1)[0]) <= now_ms:
+                due.append((entry.stat().st_mtime, entry.path))
+    return [path for _, path in sorted(due)]
+
+def _run_spool_loop():
+    """Spool thread: waits for new alerts (or the periodic rescan) and hands due spool files to the worker pool."""
+    while True:
+        _spool_wakeup.wait(_SPOOL_RESCAN_SECONDS)
+        _spool_wakeup.clear()
+        try:
+            due_files = _due_spool_files()
+        except OSError as e:
+            print(f"ERROR: email_sender: Cannot scan email spool: {e}", flush=True)
+            continue
+        for path in due_files:
+            with _spool_in_flight_lock:
+                if path in _spool_in_flight:
+                    continue
+                _spool_in_flight.add(path)
+            _pending_slots.acquire() # Back-pressure: at most EMAIL_WORKERS + EMAIL_MAX_PENDING alerts in memory
+            try:
+                _EMAIL_POOL.submit(_process_spool_file, path)
+            except RuntimeError: # Pool shut down (interpreter exiting); the file stays in the spool for next time
+                _pending_slots.release()
+                return
+
+def start_spool_worker():
+    """
+    Starts the spool thread once per process (idempotent). Called on the first alert and by the recognition
+    system at startup, so alerts left in the spool by a previous run are sent as well.
+    """
+    global _spool_thread
+    with _spool_thread_lock:
+        if _spool_thread is not None:
+            return
+        os.makedirs(_SPOOL_PENDING, exist_ok=True)
+        os.makedirs(_SPOOL_RETRY, exist_ok=True)
+        _spool_thread = threading.Thread(target=_run_spool_loop, name="EmailSpool", daemon=True)
+        _spool_thread.start()
+    _spool_wakeup.set() # Pick up anything already in the spool
 
 def send_alert_in_thread(image_path, timestamp, camera_id=""):
     """
-    Creates and starts a new daemon thread to send an email alert.
+    Queues an email alert by writing it to the email spool and returns immediately.
     This function should be called from the main process or another thread
     when an email needs to be sent without blocking.
+    The spool thread sends it from the shared email worker pool and retries it if sending fails.
+    At most one alert per camera_id is queued every config.EMAIL_MIN_INTERVAL_PER_CAMERA seconds.
     """
-    print(f"DEBUG: email_sender: Starting new thread to send email alert for {image_path}.", flush=True)
-    # daemon=True ensures the thread will exit automatically when the main program exits
-    email_thread = threading.Thread(
-        target=_send_email_actual,
-        args=(image_path, timestamp, camera_id),
-        daemon=True
-    )
-    email_thread.start()
+    if not _email_configured():
+        print("DEBUG: email_sender: Email alerts disabled - incomplete or missing configuration.", flush=True)
+        return
+    with _rate_limit_lock:
+        now = time.monotonic()
+        last_sent = _last_alert_times.get(camera_id)
+        if last_sent is not None and now - last_sent < config.EMAIL_MIN_INTERVAL_PER_CAMERA:
+            print(f"DEBUG: email_sender: Camera {camera_id}: Email rate limit active. Skipping alert for {image_path}.", flush=True)
+            return
+        _last_alert_times[camera_id] = now
+    start_spool_worker()
+    alert = {'image_path': image_path, 'timestamp': timestamp, 'camera_id': camera_id, 'attempts': 0}
+    try:
+        _write_spool_file(_SPOOL_PENDING, f"{uuid.uuid4().hex}.json", alert)
+    except OSError as e:
+        print(f"ERROR: email_sender: Could not spool email alert for {image_path}: {e}", flush=True)
+        return
+    print(f"DEBUG: email_sender: Queued email alert for {image_path}.", flush=True)
+    _spool_wakeup.set()
 
 # Optional: Standalone test for this module
 if __name__ == "__main__":
@@ -133,9 +518,8 @@ if __name__ == "__main__":
         print(f"\nAttempting to send a test email alert to {config.EMAIL_CONFIG['receiver']}...", flush=True)
         send_alert_in_thread(dummy_image_path, test_timestamp, test_camera_id)
         
-        # Give some time for the thread to run and send the email
-        print("Waiting 5 seconds for email thread to attempt sending...", flush=True)
-        import time
+        # Give some time for the worker to run and send the email
+        print("Waiting 5 seconds for email worker to attempt sending...", flush=True)
         time.sleep(5) 
         print("Check your receiver inbox for the test email. Also check spam/junk folder.", flush=True)
 
@@ -1,82 +1,490 @@
 # face_data_manager.py
 import os
-import pickle
+import pickle # Only for importing the old encodings pickle once
+import json
+import struct
+import numpy as np
 import face_recognition
+import dlib
 import shutil # For deleting person's image folders
 import datetime # For saving new face images with timestamp
 import cv2 # For saving new face images (specifically for cv2.imwrite)
+import concurrent.futures # For encoding dataset images in parallel worker processes
+import collections
+import itertools
+import threading
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB # Optional: SIMD libjpeg-turbo decoding for dataset JPEGs
+except ImportError:
+    TurboJPEG = None
 
 import config # Import the centralized configuration
+import face_embedding # Same embedder as the live recognition, so dataset and live encodings are comparable
+
+# Bytes per stored encoding row in config.ENCODINGS_MATRIX_FILE (128 little-endian float32 values).
+_ROW_BYTES = 128 * 4
+# config.ENCODINGS_MATRIX_FILE starts with a 16-byte header: magic + format version, row width, generation.
+# The rows follow directly, so appending stays a plain write at the end of the file.
+# Every full rewrite stores a new random generation id in this header and in the first line of
+# config.ENCODINGS_NAMES_FILE ({"generation": id}), so a matrix and names file from different rewrites are never paired.
+# Stores written before the generation id existed have 0 in the header and no generation line.
+_MATRIX_MAGIC = b"VPFACE\x00\x01"
+_MATRIX_HEADER_FORMAT = "<8sII"
+_MATRIX_HEADER_SIZE = struct.calcsize(_MATRIX_HEADER_FORMAT)
+
+def _new_store_generation():
+    """Returns a random non-zero 32-bit generation id for a full rewrite of the store."""
+    return int.from_bytes(os.urandom(4), "little") or 1
+
+def _read_matrix_header(path):
+    """
+    Returns (byte offset of the first row, generation id) of the matrix file, after validating its header.
+    Files without a header (raw rows, as first written by the append-only store) start at offset 0, generation 0.
+    """
+    with open(path, "rb") as f:
+        header = f.read(_MATRIX_HEADER_SIZE)
+    if len(header) < _MATRIX_HEADER_SIZE or not header.startswith(_MATRIX_MAGIC):
+        return 0, 0
+    _, dim, generation = struct.unpack(_MATRIX_HEADER_FORMAT, header)
+    if dim != 128:
+        raise ValueError(f"{path} holds {dim}-d encodings, expected 128-d.")
+    return _MATRIX_HEADER_SIZE, generation
+
+def stored_encoding_row_count():
+    """
+    Returns the number of encoding rows in config.ENCODINGS_MATRIX_FILE (0 if there is no store), from its size
+    alone. Lets tools tell an empty store from one that has rows but could not be loaded.
+    """
+    try:
+        return (os.path.getsize(config.ENCODINGS_MATRIX_FILE) - _read_matrix_header(config.ENCODINGS_MATRIX_FILE)[0]) // _ROW_BYTES
+    except FileNotFoundError:
+        return 0
+
+def _read_names_file(path):
+    """Returns (generation id, list of names) of a names file. Files without a generation line have generation 0."""
+    with open(path, "r", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    if entries and isinstance(entries[0], dict):
+        return entries[0]["generation"], entries[1:]
+    return 0, entries
+
+def _pending_names(matrix_generation):
+    """
+    Returns the names in the names temporary file if they belong to a matrix with `matrix_generation`, i.e. a
+    save_known_face_encodings() swapped in its matrix but not (yet) its names file; None otherwise.
+    """
+    try:
+        pending_generation, pending_names = _read_names_file(config.ENCODINGS_NAMES_FILE + ".tmp")
+    except (FileNotFoundError, ValueError): # No temporary file, or a half-written one whose matrix was never swapped in
+        return None
+    return pending_names if pending_generation != 0 and pending_generation == matrix_generation else None
+
+def _complete_interrupted_save():
+    """
+    Write path only: finishes a save_known_face_encodings() that crashed between swapping in the matrix and the
+    names file, whose new names are then still in the temporary file.
+    """
+    if not os.path.exists(config.ENCODINGS_MATRIX_FILE):
+        return
+    if _pending_names(_read_matrix_header(config.ENCODINGS_MATRIX_FILE)[1]) is not None:
+        print(f"WARNING: face_data_manager: Completing an interrupted save of {config.ENCODINGS_NAMES_FILE}.", flush=True)
+        os.replace(config.ENCODINGS_NAMES_FILE + ".tmp", config.ENCODINGS_NAMES_FILE)
+
+def _read_encoding_store():
+    """
+    Reads the append-only store: the raw float32 matrix file and its JSON-lines names file.
+    If an earlier append was interrupted between the two files (rows written, names not), the extra rows are ignored.
+    If a save swapped in its matrix but not yet its names file, the names are read from its temporary file.
+    Raises ValueError if the two files belong to different rewrites otherwise or there are names without rows,
+    since pairing them would put the wrong names on faces. Raises FileNotFoundError if the store does not exist.
+    Never changes the files (another process may be in the middle of writing them).
+    """
+    offset, matrix_generation = _read_matrix_header(config.ENCODINGS_MATRIX_FILE)
+    names_generation, names = _read_names_file(config.ENCODINGS_NAMES_FILE)
+    if matrix_generation != names_generation:
+        pending_names = _pending_names(matrix_generation)
+        if pending_names is not None:
+            names_generation, names = matrix_generation, pending_names
+    if matrix_generation != names_generation:
+        raise ValueError(f"{config.ENCODINGS_MATRIX_FILE} and {config.ENCODINGS_NAMES_FILE} come from different saves "
+                         f"(generation {matrix_generation} vs {names_generation}). Re-run the dataset update to rebuild them.")
+    matrix = np.fromfile(config.ENCODINGS_MATRIX_FILE, dtype="<f4", offset=offset) # One bulk read, no unpickling
+    matrix = matrix[:matrix.size - matrix.size % 128].reshape(-1, 128)
+    if len(matrix) < len(names):
+        raise ValueError(f"{config.ENCODINGS_NAMES_FILE} lists {len(names)} names but {config.ENCODINGS_MATRIX_FILE} "
+                         f"holds only {len(matrix)} rows. Re-run the dataset update to rebuild them.")
+    if len(matrix) > len(names):
+        print(f"WARNING: face_data_manager: Ignoring {len(matrix) - len(names)} encoding rows without names (interrupted append).", flush=True)
+        matrix = matrix[:len(names)]
+    return matrix, names
+
+def _migrate_legacy_pickle():
+    """
+    One-time import of the old (encodings, names) pickle (config.ENCODINGS_FILE) into the append-only store.
+    Does nothing if the store already exists or there is no old pickle.
+    """
+    if os.path.exists(config.ENCODINGS_MATRIX_FILE) or not os.path.exists(config.ENCODINGS_FILE):
+        return
+    print(f"INFO: face_data_manager: Migrating {config.ENCODINGS_FILE} to {config.ENCODINGS_MATRIX_FILE} / {config.ENCODINGS_NAMES_FILE}.", flush=True)
+    try:
+        with open(config.ENCODINGS_FILE, "rb") as file:
+            stored_encodings, stored_names = pickle.load(file)
+    except EOFError:
+        return # Empty legacy file: nothing to migrate
+    save_known_face_encodings(stored_encodings, stored_names)
+
+# Last loaded store, reused while neither file has changed (GUI flows often load several times in a row).
+_store_cache = {'fingerprint': None, 'data': None}
+_store_cache_lock = threading.Lock()
+
+def _store_fingerprint():
+    """(mtime_ns, size, inode) of both store files; changes on every append or rewrite. Raises FileNotFoundError."""
+    fingerprint = ()
+    for path in (config.ENCODINGS_MATRIX_FILE, config.ENCODINGS_NAMES_FILE):
+        st = os.stat(path)
+        fingerprint += (st.st_mtime_ns, st.st_size, st.st_ino)
+    return fingerprint
+
+def _invalidate_store_cache():
+    """Forgets the cached store after this process writes it (mtime alone may not change on coarse filesystems)."""
+    with _store_cache_lock:
+        _store_cache['fingerprint'] = None
+        _store_cache['data'] = None
 
 def load_known_face_encodings():
     """
     Loads known face encodings, names, and extracts genders from the name format "Name__Gender".
-    If the encodings file is not found or empty, it returns empty lists.
-    Returns a tuple: (known_face_encodings, known_face_names, known_face_genders).
+    If the encodings file is not found or empty, it returns no faces.
+    Returns a tuple: (known_face_encodings, known_face_names, known_face_genders), where known_face_encodings
+    is one contiguous (N, 128) float32 array (row i belongs to known_face_names[i]).
     """
-    known_face_encodings = []
+    known_face_encodings = np.empty((0, 128), dtype=np.float32)
     known_face_names = []
     known_face_genders = []
     try:
-        # Use the path from config.py to load the encodings file
-        print(f"DEBUG: face_data_manager: Attempting to load known faces from {config.ENCODINGS_FILE}.", flush=True)
-        with open(config.ENCODINGS_FILE, "rb") as file:
-            known_face_encodings, known_face_names = pickle.load(file)
-        print(f"DEBUG: face_data_manager: Loaded {len(known_face_encodings)} existing face encodings.", flush=True)
-
-        # Extract genders from names based on the assumed format "Name__Gender"
-        # This logic ensures that gender information is parsed if available.
-        for name_with_gender in known_face_names:
-            if '__' in name_with_gender:
-                try:
-                    _, gender = name_with_gender.split('__', 1) # Split only on the first '__'
-                    known_face_genders.append(gender.lower())
-                except ValueError:
-                    # Fallback for malformed names (e.g., "Name__")
-                    known_face_genders.append("unknown") 
-            else:
-                # If no '__' separator, gender is considered unknown for this entry
-                known_face_genders.append("unknown") 
-
-    except (FileNotFoundError, EOFError):
-        # Handle cases where the encodings file doesn't exist or is empty
-        print(f"DEBUG: face_data_manager: {config.ENCODINGS_FILE} not found or empty. Starting with no known faces.", flush=True)
+        _migrate_legacy_pickle()
+        with _store_cache_lock:
+            fingerprint = _store_fingerprint()
+            if _store_cache['fingerprint'] == fingerprint:
+                # Files unchanged since the last load: reuse it (the matrix is read-only, the lists are copied)
+                known_face_encodings, cached_names, cached_genders = _store_cache['data']
+                return known_face_encodings, list(cached_names), list(cached_genders)
+
+            # Use the paths from config.py to load the encoding store
+            print(f"DEBUG: face_data_manager: Attempting to load known faces from {config.ENCODINGS_MATRIX_FILE}.", flush=True)
+            known_face_encodings, known_face_names = _read_encoding_store()
+            print(f"DEBUG: face_data_manager: Loaded {len(known_face_encodings)} existing face encodings.", flush=True)
+
+            # Extract genders from names based on the assumed format "Name__Gender", for all names at once.
+            # Split only on the first '__'; if there is no '__' separator, gender is considered unknown.
+            if known_face_names:
+                parts = np.char.partition(np.asarray(known_face_names, dtype=str), '__')
+                known_face_genders = np.where(parts[:, 1] == '__', np.char.lower(parts[:, 2]), "unknown").tolist()
+
+            known_face_encodings.flags.writeable = False # Shared by every caller until the files change
+            _store_cache['fingerprint'] = fingerprint
+            _store_cache['data'] = (known_face_encodings, list(known_face_names), list(known_face_genders))
+
+    except FileNotFoundError:
+        # Handle cases where the encoding store doesn't exist yet
+        print(f"DEBUG: face_data_manager: {config.ENCODINGS_MATRIX_FILE} not found. Starting with no known faces.", flush=True)
     except Exception as e:
         # Catch any other unexpected errors during loading
-        print(f"ERROR: face_data_manager: An unexpected error occurred while loading {config.ENCODINGS_FILE}: {e}", flush=True)
+        print(f"ERROR: face_data_manager: An unexpected error occurred while loading {config.ENCODINGS_MATRIX_FILE}: {e}", flush=True)
 
     return known_face_encodings, known_face_names, known_face_genders
 
+def _as_float32_matrix(encodings):
+    """Stacks an (N, 128) array or a list of 128-d arrays into one contiguous float32 matrix."""
+    if len(encodings) == 0:
+        return np.empty((0, 128), dtype=np.float32)
+    return np.ascontiguousarray(np.vstack(encodings), dtype=np.float32)
+
 def save_known_face_encodings(encodings, names):
     """
-    Saves the current known face encodings and their corresponding names to the pickle file.
+    Rewrites the whole encoding store with the given encodings and their corresponding names.
+    `encodings` may be an (N, 128) array or a list of 128-d arrays. Both files are written to temporary
+    files first and then swapped in one after the other. Both carry the same new generation id: after a crash
+    between the two swaps the new names are still in the temporary file, from which they are loaded (and swapped
+    in by the next append), and a matrix and names file from different saves are refused instead of being paired.
+    Only needed when rows are removed; new faces are added with append_known_face_encodings().
     """
     try:
-        print(f"DEBUG: face_data_manager: Attempting to save {len(encodings)} encodings to {config.ENCODINGS_FILE}.", flush=True)
-        with open(config.ENCODINGS_FILE, "wb") as f:
-            pickle.dump((encodings, names), f)
-        print(f"DEBUG: face_data_manager: Saved encodings successfully.", flush=True)
+        print(f"DEBUG: face_data_manager: Attempting to save {len(encodings)} encodings to {config.ENCODINGS_MATRIX_FILE}.", flush=True)
+        encodings_matrix = _as_float32_matrix(encodings)
+        generation = _new_store_generation()
+        with open(config.ENCODINGS_NAMES_FILE + ".tmp", "w", encoding="utf-8") as f:
+            f.write(json.dumps({"generation": generation}) + "\n")
+            f.writelines(json.dumps(name) + "\n" for name in names)
+        with open(config.ENCODINGS_MATRIX_FILE + ".tmp", "wb") as f:
+            f.write(struct.pack(_MATRIX_HEADER_FORMAT, _MATRIX_MAGIC, 128, generation))
+            f.write(encodings_matrix.astype("<f4", copy=False).tobytes())
+        # Matrix first: until the names file is swapped in too, the new names wait in its temporary file
+        os.replace(config.ENCODINGS_MATRIX_FILE + ".tmp", config.ENCODINGS_MATRIX_FILE)
+        os.replace(config.ENCODINGS_NAMES_FILE + ".tmp", config.ENCODINGS_NAMES_FILE)
+        _invalidate_store_cache()
+        print("DEBUG: face_data_manager: Saved encodings successfully.", flush=True)
     except Exception as e:
         # Re-raise the exception to allow the calling function (e.g., in GUI) to handle it
         print(f"ERROR: face_data_manager: Failed to save encodings: {e}", flush=True)
         raise 
 
-def update_encodings_from_dataset():
+def append_known_face_encodings(encodings, names):
+    """
+    Adds new face encodings and names to the end of the encoding store, writing only the new rows
+    (128 * 4 bytes per face plus one names line) instead of rewriting the whole store.
+    If the two files disagree (an earlier append was interrupted), the store is repaired with a full rewrite;
+    files from different saves raise ValueError instead (see _read_encoding_store).
+    """
+    try:
+        print(f"DEBUG: face_data_manager: Appending {len(encodings)} encodings to {config.ENCODINGS_MATRIX_FILE}.", flush=True)
+        _migrate_legacy_pickle()
+        _complete_interrupted_save()
+        if not os.path.exists(config.ENCODINGS_MATRIX_FILE):
+            save_known_face_encodings(encodings, names) # First faces: create the store
+            return
+
+        offset, matrix_generation = _read_matrix_header(config.ENCODINGS_MATRIX_FILE)
+        matrix_bytes = os.path.getsize(config.ENCODINGS_MATRIX_FILE) - offset
+        names_generation, stored_names = _read_names_file(config.ENCODINGS_NAMES_FILE)
+        if matrix_bytes != len(stored_names) * _ROW_BYTES or matrix_generation != names_generation:
+            # Raises if the files cannot be paired safely; repairs an interrupted append otherwise
+            existing_encodings, existing_names = _read_encoding_store()
+            save_known_face_encodings(np.vstack([existing_encodings, _as_float32_matrix(encodings)]),
+                                      list(existing_names) + list(names))
+            return
+
+        # Rows first, then names: the loader ignores rows that have no name yet.
+        with open(config.ENCODINGS_MATRIX_FILE, "ab") as f:
+            f.write(_as_float32_matrix(encodings).astype("<f4", copy=False).tobytes())
+        with open(config.ENCODINGS_NAMES_FILE, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(name) + "\n" for name in names)
+        _invalidate_store_cache()
+        print("DEBUG: face_data_manager: Appended encodings successfully.", flush=True)
+    except Exception as e:
+        # Re-raise the exception to allow the calling function (e.g., in GUI) to handle it
+        print(f"ERROR: face_data_manager: Failed to append encodings: {e}", flush=True)
+        raise 
+
+def _create_jpeg_decoder():
+    """Returns a TurboJPEG decoder, or None if PyTurboJPEG or the libturbojpeg library is not available."""
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError) as e: # Python package installed but native library not found
+        print(f"WARNING: face_data_manager: libturbojpeg unavailable ({e}). Using PIL for JPEG decoding.", flush=True)
+        return None
+
+# Created once per process (worker processes get their own on import).
+_JPEG_DECODER = _create_jpeg_decoder()
+
+def _load_rgb_image(image_path):
+    """
+    Loads an image file as an RGB uint8 array. JPEGs are decoded with libjpeg-turbo when available
+    (several times faster than PIL); everything else goes through face_recognition.load_image_file (PIL).
+    JPEGs that libjpeg-turbo cannot decode to RGB (e.g. CMYK) fall back to PIL as well.
+    """
+    if _JPEG_DECODER is not None and image_path.lower().endswith(('.jpg', '.jpeg')):
+        with open(image_path, 'rb') as f:
+            jpeg_data = f.read()
+        try:
+            return _JPEG_DECODER.decode(jpeg_data, pixel_format=TJPF_RGB)
+        except Exception as e:
+            print(f"DEBUG: face_data_manager: libjpeg-turbo could not decode {image_path} ({e}). Using PIL.", flush=True)
+    return face_recognition.load_image_file(image_path)
+
+def _encode_image_file(image_path):
+    """
+    Worker for update_encodings_from_dataset (runs in a child process).
+    Returns (first face encoding or None, None) on success, or (None, error message) if the image could not be processed.
+    """
+    try:
+        image = _load_rgb_image(image_path)
+        encodings = face_embedding.encode_faces(image, face_recognition.face_locations(image))
+        return (encodings[0] if len(encodings) > 0 else None), None
+    except Exception as e:
+        return None, str(e)
+
+# Images per batched CNN detection / encoding call on a CUDA build of dlib.
+_GPU_BATCH_SIZE = 32
+# How many images are read and decoded ahead of the GPU by background threads.
+_PREFETCH_LOOKAHEAD = 8
+
+def _prefetch_images(image_paths):
+    """
+    Yields the decoded RGB image for each path in order (or the Exception raised while loading it).
+    Up to _PREFETCH_LOOKAHEAD images are read and decoded by background threads while the caller works,
+    so disk reads and JPEG decoding overlap with the GPU batches instead of running between them.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="ImagePrefetch") as executor:
+        pending = collections.deque()
+        paths = iter(image_paths)
+        for image_path in itertools.islice(paths, _PREFETCH_LOOKAHEAD):
+            pending.append(executor.submit(_load_rgb_image, image_path))
+        while pending:
+            future = pending.popleft()
+            next_path = next(paths, None)
+            if next_path is not None:
+                pending.append(executor.submit(_load_rgb_image, next_path))
+            try:
+                yield future.result()
+            except Exception as e:
+                yield e
+
+def _encode_image_files_gpu(image_paths, cancel_event=None):
+    """
+    CUDA variant of _encode_image_files: decodes images in this process and runs face detection (dlib CNN)
+    and encoding on the GPU in batches of _GPU_BATCH_SIZE. dlib's batched detector needs equally sized
+    images, so images are grouped by shape. Returns results in the same order and format as _encode_image_file
+    (only for the leading images that were finished, if cancel_event was set).
+    """
+    results = [None] * len(image_paths)
+    pending_by_shape = {} # image shape -> list of (index, image) waiting for a full batch
+
+    def flush(batch):
+        images = [image for _, image in batch]
+        locations = face_recognition.batch_face_locations(images, number_of_times_to_upsample=1, batch_size=len(images))
+        # Only the first face of each image is kept, so only that one is encoded.
+        encodings = face_embedding.encode_faces_batch(images, [locs[:1] for locs in locations])
+        for (index, _), image_encodings in zip(batch, encodings):
+            results[index] = ((image_encodings[0] if len(image_encodings) > 0 else None), None)
+
+    for index, image in enumerate(_prefetch_images(image_paths)):
+        if cancel_event is not None and cancel_event.is_set():
+            # Batches still waiting are dropped; return the results up to the first unfinished image.
+            finished = next((i for i, result in enumerate(results) if result is None), len(results))
+            return results[:finished]
+        if isinstance(image, Exception):
+            results[index] = (None, str(image))
+            continue
+        batch = pending_by_shape.setdefault(image.shape, [])
+        batch.append((index, image))
+        if len(batch) == _GPU_BATCH_SIZE:
+            flush(pending_by_shape.pop(image.shape))
+    for batch in pending_by_shape.values():
+        flush(batch)
+    return results
+
+def _encode_image_files(image_paths, cancel_event=None):
+    """
+    Encodes the given image files across all CPU cores (face detection and encoding are CPU-bound and
+    independent per image), or in GPU batches when dlib was built with CUDA.
+    Returns a list of _encode_image_file results in the same order as image_paths. If cancel_event
+    (a threading.Event) gets set, images not started yet are cancelled and the list only covers
+    the leading images that were finished.
+    """
+    if dlib.DLIB_USE_CUDA and image_paths:
+        print(f"DEBUG: face_data_manager: Encoding {len(image_paths)} images on the GPU in batches of {_GPU_BATCH_SIZE}.", flush=True)
+        return _encode_image_files_gpu(image_paths, cancel_event)
+    workers = min(os.cpu_count() or 1, len(image_paths))
+    results = []
+    if workers <= 1:
+        for path in image_paths: # Not worth starting worker processes
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            results.append(_encode_image_file(path))
+        return results
+    print(f"DEBUG: face_data_manager: Encoding {len(image_paths)} images with {workers} worker processes.", flush=True)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(_encode_image_file, image_paths, chunksize=4):
+            if cancel_event is not None and cancel_event.is_set():
+                print(f"INFO: face_data_manager: Encoding cancelled after {len(results)} of {len(image_paths)} images.", flush=True)
+                executor.shutdown(wait=True, cancel_futures=True) # Drops the chunks not started yet
+                break
+            results.append(result)
+    return results
+
+def _store_generation():
+    """Returns the generation id in the encoding store's matrix header, or None if there is no store."""
+    try:
+        return _read_matrix_header(config.ENCODINGS_MATRIX_FILE)[1]
+    except FileNotFoundError:
+        return None
+
+def _load_image_manifest():
+    """
+    Loads the dataset image manifest. Returns (store generation, {image path: [mtime_ns, size, row]}), where row is
+    the image's encoding row in the store (None if it has none, e.g. no face was found). The rows are only valid
+    while the store still has that generation id. Manifests written before rows were recorded
+    ({image path: [mtime_ns, size]}) are returned with generation None. Returns (None, None) if there is no manifest yet.
+    """
+    try:
+        with open(config.ENCODINGS_MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None, None
+    except (ValueError, OSError) as e:
+        print(f"WARNING: face_data_manager: Could not read {config.ENCODINGS_MANIFEST_FILE} ({e}). Rebuilding it.", flush=True)
+        return None, None
+    if isinstance(manifest.get("images"), dict) and "generation" in manifest:
+        return manifest["generation"], manifest["images"]
+    return None, manifest
+
+def _save_image_manifest(generation, images):
+    """Writes the image manifest for the given store generation atomically (temporary file + rename)."""
+    with open(config.ENCODINGS_MANIFEST_FILE + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"generation": generation, "images": images}, f)
+    os.replace(config.ENCODINGS_MANIFEST_FILE + ".tmp", config.ENCODINGS_MANIFEST_FILE)
+
+def _load_image_manifest_for_store():
+    """
+    Returns _load_image_manifest() with every entry as [mtime_ns, size, row], where the rows are cleared to None
+    unless the manifest was written for the store's current generation (another tool may have rewritten it since).
+    """
+    manifest_generation, images = _load_image_manifest()
+    if images is None:
+        return manifest_generation, None
+    rows_valid = manifest_generation is not None and manifest_generation == _store_generation()
+    return manifest_generation, {path: entry[:2] + [entry[2] if rows_valid and len(entry) > 2 else None]
+                                 for path, entry in images.items()}
+
+def _remap_manifest_rows(images, keep_mask):
+    """
+    Returns the manifest `images` after the store rows not in keep_mask were removed: entries of removed rows are
+    dropped, the other rows are renumbered. Rows outside the mask (invalid) are cleared to None.
+    """
+    new_row_of_old = np.cumsum(keep_mask) - 1
+    remapped = {}
+    for image_path, (mtime_ns, size, row) in images.items():
+        if row is not None and 0 <= row < len(keep_mask):
+            if not keep_mask[row]:
+                continue # Its encoding was removed
+            row = int(new_row_of_old[row])
+        else:
+            row = None
+        remapped[image_path] = [mtime_ns, size, row]
+    return remapped
+
+def update_encodings_from_dataset(cancel_event=None):
     """
     Scans the configured dataset path for new person image folders or new images in existing folders,
     encodes any new faces found, and updates the main encoding file.
+    Images whose modification time and size match the image manifest are not decoded or encoded again.
+    If cancel_event (a threading.Event) is set while encoding, the faces encoded so far are still saved
+    and the remaining images are picked up by the next update.
     Returns a descriptive message string indicating the outcome.
     Raises FileNotFoundError if the dataset base path is not found.
     """
     # Load existing data first so we only process new additions
     known_face_encodings, known_face_names, _ = load_known_face_encodings() 
+    new_face_names = [] # Only the new rows are written (appended) at the end, unless old rows must be replaced
     
     # Create a set of already processed people (using only the name part before '__')
-    # This helps avoid re-processing individuals who are already in the encodings file.
+    # Their images are only encoded again if they are new or changed according to the image manifest.
     existing_people_names_only = set(name.split('__')[0] for name in known_face_names if '__' in name)
     # Also add names without gender if they exist in old format
     existing_people_names_only.update(name for name in known_face_names if '__' not in name)
 
+    # Fingerprints (mtime_ns, size) and encoding rows of the images already encoded. Without a manifest yet (first
+    # run after upgrading), every image of an already known person counts as encoded, as before. The recorded rows
+    # are only used while the store has not been rewritten since (same generation id); otherwise they are unknown.
+    manifest_generation, manifest = _load_image_manifest_for_store()
+    updated_manifest = {}
+    stale_rows = set() # Store rows of images that were changed or deleted since they were encoded
+    scanned_paths = set()
+    people_queued_this_run = set()
 
     newly_added_person_count = 0
     total_images_scanned = 0
@@ -87,59 +495,109 @@ def update_encodings_from_dataset():
 
     print(f"DEBUG: face_data_manager: Scanning dataset at {config.DATASET_BASE_PATH} for new faces...", flush=True)
     
+    # Collect all new images first as (image_path, person_name, gender, fingerprint) tasks; they are encoded in parallel below.
+    tasks = []
+    # os.scandir returns each entry's type with the directory listing, so no extra stat() per entry is needed.
     # Iterate through gender subfolders (e.g., 'male', 'female', 'other')
-    for gender_folder_name in os.listdir(config.DATASET_BASE_PATH):
-        gender_folder_path = os.path.join(config.DATASET_BASE_PATH, gender_folder_name)
-        if not os.path.isdir(gender_folder_path):
-            continue # Skip if it's not a directory
-
-        # Iterate through person-specific subfolders within each gender folder
-        for person_name_in_folder in os.listdir(gender_folder_path):
-            person_folder_path = os.path.join(gender_folder_path, person_name_in_folder)
-            
-            # Skip if it's not a directory or if this person has already been encoded.
-            if not os.path.isdir(person_folder_path) or person_name_in_folder in existing_people_names_only:
-                print(f"DEBUG: face_data_manager: Skipping '{person_name_in_folder}' (already encoded or not a directory).", flush=True)
-                continue
-
-            print(f"DEBUG: face_data_manager: Processing new person: '{person_name_in_folder}' from gender '{gender_folder_name}'.", flush=True)
-
-            person_had_new_images_encoded_this_pass = False
-            for filename in os.listdir(person_folder_path):
-                image_path = os.path.join(person_folder_path, filename)
-                # Only process common image file types
-                if not os.path.isfile(image_path) or not filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-                    continue 
-
-                try:
-                    image = face_recognition.load_image_file(image_path)
-                    encodings = face_recognition.face_encodings(image)
-                    total_images_scanned += 1
-
-                    if encodings:
-                        # Add only the first encoding found in the image.
-                        known_face_encodings.append(encodings[0])
-                        # Store name as "PersonName__Gender" for future gender retrieval
-                        full_name_with_gender = f"{person_name_in_folder}__{gender_folder_name.lower()}" # Ensure gender is lowercase
-                        known_face_names.append(full_name_with_gender)
-                        faces_encoded_in_this_run += 1
-                        person_had_new_images_encoded_this_pass = True
-                        print(f"DEBUG: face_data_manager:    Image '{filename}' encoded successfully.", flush=True)
-                    else:
-                        print(f"WARNING: face_data_manager:    No face found in '{filename}' for '{person_name_in_folder}'.", flush=True)
-                except Exception as img_e:
-                    print(f"ERROR: face_data_manager: Failed to process image '{image_path}': {img_e}", flush=True)
-
-            if person_had_new_images_encoded_this_pass:
-                newly_added_person_count += 1
-                # Add this person's base name to the set of existing people for this run
-                existing_people_names_only.add(person_name_in_folder)
-
-    # Save updated data back to the pickle file if any changes occurred
-    if newly_added_person_count > 0 or faces_encoded_in_this_run > 0:
-        save_known_face_encodings(known_face_encodings, known_face_names)
+    with os.scandir(config.DATASET_BASE_PATH) as gender_entries:
+        for gender_entry in gender_entries:
+            if not gender_entry.is_dir():
+                continue # Skip if it's not a directory
+
+            # Iterate through person-specific subfolders within each gender folder
+            with os.scandir(gender_entry.path) as person_entries:
+                for person_entry in person_entries:
+                    person_name_in_folder = person_entry.name
+                    person_is_known = person_name_in_folder in existing_people_names_only
+
+                    # Skip if it's not a directory or if this new person was already queued from another gender folder.
+                    if person_name_in_folder in people_queued_this_run or not person_entry.is_dir():
+                        print(f"DEBUG: face_data_manager: Skipping '{person_name_in_folder}' (already queued or not a directory).", flush=True)
+                        continue
+                    if not person_is_known:
+                        print(f"DEBUG: face_data_manager: Processing new person: '{person_name_in_folder}' from gender '{gender_entry.name}'.", flush=True)
+                        people_queued_this_run.add(person_name_in_folder)
+
+                    with os.scandir(person_entry.path) as image_entries:
+                        for image_entry in image_entries:
+                            # Only process common image file types (extension checked first; it needs no syscall)
+                            if not image_entry.name.lower().endswith(('.png', '.jpg', '.jpeg')) or not image_entry.is_file():
+                                continue
+                            image_stat = image_entry.stat()
+                            fingerprint = [image_stat.st_mtime_ns, image_stat.st_size]
+                            scanned_paths.add(image_entry.path)
+                            manifest_entry = manifest.get(image_entry.path) if manifest is not None else None
+                            if person_is_known and (manifest is None or (manifest_entry is not None and manifest_entry[:2] == fingerprint)):
+                                # Unchanged and already encoded
+                                updated_manifest[image_entry.path] = manifest_entry or fingerprint + [None]
+                                continue
+                            if manifest_entry is not None and manifest_entry[2] is not None:
+                                stale_rows.add(manifest_entry[2]) # Changed image: its old encoding is replaced
+                            tasks.append((image_entry.path, person_name_in_folder, gender_entry.name.lower(), fingerprint)) # Ensure gender is lowercase
+
+    # Encodings of images deleted from the dataset are removed as well
+    if manifest is not None:
+        for image_path, manifest_entry in manifest.items():
+            if manifest_entry[2] is not None and image_path not in scanned_paths and not os.path.exists(image_path):
+                stale_rows.add(manifest_entry[2])
+    stale_rows = [row for row in stale_rows if 0 <= row < len(known_face_names)]
+
+    print(f"DEBUG: face_data_manager: {len(tasks)} new or changed images to encode, {len(stale_rows)} outdated encodings to remove.", flush=True)
+
+    # Merge results in task order, so the saved order does not depend on which worker finished first.
+    # Rows are written by index into one pre-sized matrix; rows of images without a face are masked out afterwards.
+    people_with_new_faces = set()
+    new_manifest_entries = {} # image path -> [mtime_ns, size, index among the new faces or None]
+    new_face_encodings = np.empty((len(tasks), 128), dtype=np.float32)
+    has_face = np.zeros(len(tasks), dtype=bool)
+    encode_results = _encode_image_files([t[0] for t in tasks], cancel_event)
+    was_cancelled = len(encode_results) < len(tasks) # Unfinished images stay out of the manifest
+    for task_index, ((image_path, person_name, gender, fingerprint), (encoding, error)) in enumerate(zip(tasks, encode_results)):
+        filename = os.path.basename(image_path)
+        if error is not None:
+            print(f"ERROR: face_data_manager: Failed to process image '{image_path}': {error}", flush=True)
+            continue # Not recorded in the manifest, so it is retried next time
+        total_images_scanned += 1
+        new_manifest_entries[image_path] = fingerprint + [None]
+        if encoding is not None:
+            # Add only the first encoding found in the image.
+            new_face_encodings[task_index] = encoding
+            has_face[task_index] = True
+            new_manifest_entries[image_path][2] = len(new_face_names)
+            # Store name as "PersonName__Gender" for future gender retrieval
+            new_face_names.append(f"{person_name}__{gender}")
+            faces_encoded_in_this_run += 1
+            people_with_new_faces.add(person_name)
+            print(f"DEBUG: face_data_manager:    Image '{filename}' encoded successfully.", flush=True)
+        else:
+            print(f"WARNING: face_data_manager:    No face found in '{filename}' for '{person_name}'.", flush=True)
+    new_face_encodings = new_face_encodings[has_face]
+    newly_added_person_count = len(people_with_new_faces - existing_people_names_only)
+
+    if stale_rows:
+        # Outdated rows are dropped: rewrite the store without them, with the new faces at the end
+        keep_mask = np.ones(len(known_face_names), dtype=bool)
+        keep_mask[stale_rows] = False
+        save_known_face_encodings(np.vstack([known_face_encodings[keep_mask], new_face_encodings]),
+                                  [name for name, keep in zip(known_face_names, keep_mask) if keep] + new_face_names)
+        updated_manifest = _remap_manifest_rows(updated_manifest, keep_mask)
+        first_new_row = int(keep_mask.sum())
+    else:
+        # Append only the new faces to the encoding store if any changes occurred
+        if newly_added_person_count > 0 or faces_encoded_in_this_run > 0:
+            append_known_face_encodings(new_face_encodings, new_face_names)
+        first_new_row = len(known_face_names)
+    for image_path, (mtime_ns, size, new_face_index) in new_manifest_entries.items():
+        updated_manifest[image_path] = [mtime_ns, size, None if new_face_index is None else first_new_row + new_face_index]
+    # Written after the encodings, so a crash in between re-encodes images instead of losing them
+    store_generation = _store_generation()
+    if updated_manifest != manifest or store_generation != manifest_generation:
+        _save_image_manifest(store_generation, updated_manifest)
 
     # Construct and return a descriptive summary message
+    if was_cancelled:
+        return (f"Encoding update cancelled. {faces_encoded_in_this_run} faces encoded from {total_images_scanned} images were saved; "
+                f"the remaining {len(tasks) - len(encode_results)} images will be processed by the next update.")
     if newly_added_person_count == 0 and faces_encoded_in_this_run == 0:
         return "No new faces found or no new images processed in the dataset."
     elif newly_added_person_count > 0:
@@ -154,45 +612,39 @@ def update_encodings_from_dataset():
 
 def delete_person_from_encodings(person_to_remove):
     """
-    Removes a person's data (their face encodings from the pickle file and
+    Removes a person's data (their face encodings from the encoding store and
     their corresponding image folder from the dataset).
     Expects `person_to_remove` as the full name (e.g., 'John_Doe__male') or just the base name ('John_Doe').
     Raises ValueError if the person is not found in the encodings.
     """
     known_face_encodings, known_face_names, _ = load_known_face_encodings() # Get existing data
 
-    # Determine which full names (e.g., "John_Doe__male") from the list need to be deleted.
-    # This handles cases where input might be "John_Doe" but stored as "John_Doe__male".
-    names_in_encodings_to_filter_out = []
-    
     # Extract the base name (e.g., "John_Doe" from "John_Doe__male") for folder deletion.
     person_base_name = person_to_remove.split('__')[0] 
 
-    found_any_matching_encoding = False
-    for name_in_list in known_face_names:
-        # Check if the full `person_to_remove` string matches an entry
-        # OR if the base name part of the list entry matches the base name of the input.
-        if name_in_list == person_to_remove or name_in_list.split('__')[0] == person_base_name:
-            names_in_encodings_to_filter_out.append(name_in_list)
-            found_any_matching_encoding = True
+    # Map each base name to the rows that belong to it, so all of a person's entries are found with one lookup.
+    # This handles cases where input might be "John_Doe" but stored as "John_Doe__male" (an exact full-name
+    # match always has the same base name, so it is covered too).
+    base_to_indices = collections.defaultdict(list)
+    for i, name_in_list in enumerate(known_face_names):
+        base_to_indices[name_in_list.split('__', 1)[0]].append(i)
+    indices_to_remove = base_to_indices.get(person_base_name)
 
-    if not found_any_matching_encoding:
+    if not indices_to_remove:
         raise ValueError(f"No person named '{person_to_remove}' found in encodings to delete.")
 
-    # Filter out the encodings and names for the person(s) to remove
-    filtered_encodings = []
-    filtered_names = []
-    removed_encoding_count = 0
-
-    for encoding, name in zip(known_face_encodings, known_face_names):
-        if name not in names_in_encodings_to_filter_out:
-            filtered_encodings.append(encoding)
-            filtered_names.append(name)
-        else:
-            removed_encoding_count += 1
+    # Filter out the encodings and names for the person(s) to remove with one boolean mask
+    keep_mask = np.ones(len(known_face_names), dtype=bool)
+    keep_mask[indices_to_remove] = False
+    filtered_encodings = known_face_encodings[keep_mask]
+    filtered_names = [name for name, keep in zip(known_face_names, keep_mask) if keep]
+    removed_encoding_count = len(indices_to_remove)
 
-    # Save the updated (filtered) data back to the pickle file
+    # Rewrite the encoding store with the updated (filtered) data, and renumber the image manifest's rows to match
+    _, manifest = _load_image_manifest_for_store()
     save_known_face_encodings(filtered_encodings, filtered_names)
+    if manifest is not None:
+        _save_image_manifest(_store_generation(), _remap_manifest_rows(manifest, keep_mask))
     
     # --- Delete corresponding image folder(s) from the dataset ---
     # The folder structure is assumed to be DATASET_BASE_PATH/gender_folder/person_name_folder
@@ -238,8 +690,8 @@ def delete_person_from_encodings(person_to_remove):
 
 def save_new_face_image(frame, person_name, gender):
     """
-    Saves a captured face image (OpenCV frame) to the appropriate person's folder
-    within the dataset based on provided name and gender.
+    Saves a captured face image (OpenCV frame, BGR channel order) to the appropriate person's folder
+    within the dataset based on provided name and gender. The frame is written as-is, without conversion.
     The folder structure is DATASET_BASE_PATH/gender/person_name.
     Returns the absolute path where the image was saved.
     """
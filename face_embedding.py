@@ -0,0 +1,93 @@
+# face_embedding.py
+import logging # Diagnostics go through a level-checked logger (DEBUG messages cost nothing unless enabled)
+import os
+import dlib
+import numpy as np
+from face_recognition import api as face_recognition_api # Exposes the already-loaded dlib model singletons
+try:
+    import onnxruntime # Optional: only needed for the ONNX embedder (see config.FACE_EMBEDDER_ONNX_PATH)
+except ImportError:
+    onnxruntime = None
+
+import config # Import the centralized configuration
+
+# Logger for this module; DEBUG messages are formatted and written only if enabled (see logging_manager.logger).
+logger = logging.getLogger("face_embedding")
+
+# dlib models used for landmarks and encoding. face_recognition loads these once at import time, so we reuse its
+# instances instead of loading a second copy. The 5-point predictor matches face_recognition.face_encodings().
+_POSE_PREDICTOR = face_recognition_api.pose_predictor_5_point
+_FACE_ENCODER = face_recognition_api.face_encoder
+
+# Input size of the ONNX embedder (MobileFaceNet-style models take aligned 112x112 RGB crops).
+_ONNX_INPUT_SIZE = 112
+
+def _create_onnx_session():
+    """
+    Creates the onnxruntime session for config.FACE_EMBEDDER_ONNX_PATH, preferring GPU providers when present.
+    Returns None (dlib embedder is used) if no model is configured, the file is missing or onnxruntime is not installed.
+    """
+    model_path = config.FACE_EMBEDDER_ONNX_PATH
+    if not model_path:
+        return None
+    if onnxruntime is None or not os.path.exists(model_path):
+        logger.warning("face_embedding: ONNX embedder '%s' unavailable (missing file or onnxruntime). Using dlib.", model_path)
+        return None
+    preferred = ["TensorrtExecutionProvider", "CUDAExecutionProvider", "CPUExecutionProvider"]
+    providers = [p for p in preferred if p in onnxruntime.get_available_providers()]
+    session = onnxruntime.InferenceSession(model_path, providers=providers)
+    logger.debug("face_embedding: Using ONNX embedder '%s' with providers %s.", model_path, providers)
+    return session
+
+# Created once at import; onnxruntime sessions can be run concurrently from several threads.
+_ONNX_SESSION = _create_onnx_session()
+
+def _landmarks(rgb_image, face_locations):
+    """Returns dlib 5-point landmarks for each (top, right, bottom, left) location."""
+    shapes = dlib.full_object_detections()
+    for (top, right, bottom, left) in face_locations:
+        shapes.append(_POSE_PREDICTOR(rgb_image, dlib.rectangle(left, top, right, bottom)))
+    return shapes
+
+def _onnx_encodings(rgb_image, shapes):
+    """Aligns each face to a 112x112 chip and embeds the whole batch with one ONNX run; returns L2-normalized rows."""
+    chips = np.asarray(dlib.get_face_chips(rgb_image, shapes, size=_ONNX_INPUT_SIZE), dtype=np.float32)
+    batch = ((chips - 127.5) / 128.0).transpose(0, 3, 1, 2) # (K, 3, 112, 112)
+    input_name = _ONNX_SESSION.get_inputs()[0].name
+    embeddings = _ONNX_SESSION.run(None, {input_name: batch})[0]
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+def encode_faces(rgb_image, face_locations):
+    """
+    Encodes all faces of an RGB image in one batched call.
+    face_locations are (top, right, bottom, left) tuples, as returned by face_recognition.face_locations().
+    Returns a (K, 128) array with one encoding per location (empty if there are no locations).
+    Encodings come from the ONNX embedder when configured, otherwise from dlib's ResNet (face_recognition's model);
+    the two are not comparable, so known faces must be encoded with the same embedder.
+    """
+    if not face_locations:
+        return np.empty((0, 128))
+    shapes = _landmarks(rgb_image, face_locations)
+    if _ONNX_SESSION is not None:
+        return _onnx_encodings(rgb_image, shapes)
+    return np.asarray(_FACE_ENCODER.compute_face_descriptor(rgb_image, shapes, 1))
+
+def encode_faces_batch(rgb_images, face_locations_per_image):
+    """
+    Batched form of encode_faces for several images at once (e.g. dataset ingest on a CUDA build of dlib,
+    where one forward pass over many faces amortizes the per-call GPU overhead).
+    Returns a list with one (K_i, 128) array per image.
+    """
+    results = [np.empty((0, 128)) for _ in rgb_images]
+    indices = [i for i, locations in enumerate(face_locations_per_image) if locations]
+    if not indices:
+        return results
+    if _ONNX_SESSION is not None:
+        for i in indices:
+            results[i] = encode_faces(rgb_images[i], face_locations_per_image[i])
+        return results
+    images = [rgb_images[i] for i in indices]
+    shapes = [_landmarks(rgb_images[i], face_locations_per_image[i]) for i in indices]
+    for i, descriptors in zip(indices, _FACE_ENCODER.compute_face_descriptor(images, shapes, 1)):
+        results[i] = np.asarray(descriptors)
+    return results
@@ -0,0 +1,74 @@
+# face_matching.py
+import numpy as np
+try:
+    from numba import njit, prange # Optional: JIT-compiled distance kernels
+except ImportError:
+    njit = None
+
+# True when the compiled kernels below are available; otherwise callers fall back to NumPy.
+NUMBA_AVAILABLE = njit is not None
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def early_exit_match(known, query, tol2):
+        """
+        Returns (index, squared distance) of the known row closest to `query` within tol2, or (-1, tol2).
+        A row is abandoned as soon as its partial sum exceeds the best distance so far (initially tol2).
+        """
+        best_index = -1
+        best_d = tol2
+        for i in range(known.shape[0]):
+            d = 0.0
+            for k in range(known.shape[1]):
+                x = known[i, k] - query[k]
+                d += x * x
+                if d > best_d:
+                    break
+            if d <= best_d:
+                best_index = i
+                best_d = d
+        return best_index, best_d
+
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _squared_distances_kernel(known, query, out):
+        for i in prange(known.shape[0]):
+            d = 0.0
+            for k in range(known.shape[1]):
+                x = known[i, k] - query[k]
+                d += x * x
+            out[i] = d
+else:
+    early_exit_match = None
+
+def squared_distances(known, query):
+    """
+    Squared L2 distance from `query` (a 128-d vector) to every row of `known` (N, 128), as an (N,) float32 array.
+    With numba, subtract/square/sum run fused across cores without the (N, 128) temporaries NumPy allocates.
+    """
+    if NUMBA_AVAILABLE:
+        out = np.empty(len(known), dtype=np.float32)
+        _squared_distances_kernel(known, query, out)
+        return out
+    diff = known - query
+    return np.einsum('ij,ij->i', diff, diff)
+
+def pairwise_squared_distances(known, queries):
+    """
+    Squared L2 distances from every row of `queries` (K, 128) to every row of `known` (N, 128), as a (K, N) array.
+    Expanded as |q|^2 + |k|^2 - 2 q.k, so the bulk of the work is one BLAS matrix product for all K queries.
+    """
+    distances = (np.einsum('ij,ij->i', queries, queries)[:, None] + np.einsum('ij,ij->i', known, known)[None, :]
+                 - 2.0 * (queries @ known.T))
+    return np.maximum(distances, 0.0, out=distances) # Rounding can leave tiny negatives for identical rows
+
+def warm_up():
+    """
+    Compiles (or loads from numba's on-disk cache) the kernels above for float32 inputs, so the first
+    recognized face does not pause its camera's processing thread for the JIT. Does nothing without numba.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    known = np.zeros((1, 128), dtype=np.float32)
+    query = np.zeros(128, dtype=np.float32)
+    early_exit_match(known, query, 0.36) # Python float, like the squared tolerance CameraStream passes
+    squared_distances(known, query)
@@ -2,90 +2,235 @@
 import sys
 import os
 import threading
-import queue
+import logging # GUI diagnostics go through a level-checked logger (DEBUG messages are skipped unless enabled)
+import time # For timing grab() calls in the capture dialog and spacing out display passes
 import subprocess # IMPORTANT: Make sure this is imported for os.startfile / subprocess.run
 from datetime import datetime, timedelta # Used for log filtering
-import cv2 # Used for camera capture dialog and for displaying frames in OpenCV windows
-from PIL import Image # PIL.Image is not directly used in the provided logic but is kept as it was in original gui.py
+import importlib # For the deferred imports below
+import numpy as np # Reused display buffers
 from PyQt5 import QtWidgets, QtGui, QtCore # Core PyQt5 library components
 
+
+class _LazyModule:
+    """
+    Stand-in for a heavy module that is imported on first attribute access, so the main window
+    opens without first loading OpenCV, dlib and the face recognition models.
+    """
+    def __init__(self, module_name):
+        self._module_name = module_name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        # Only called for attributes not found on the proxy itself, i.e. the module's attributes
+        if self._module is None:
+            self._module = importlib.import_module(self._module_name) # Thread-safe (import lock)
+        return getattr(self._module, attribute)
+
+
+cv2 = _LazyModule("cv2") # Used for the camera capture dialog and for scaling frames for display
+
 # Import your new modular components
 import config # Centralized configuration for paths, debounce times, email, etc.
-import face_data_manager # Module for loading, saving, updating, and deleting face encodings/data
 import logging_manager # Module for writing to and reading from the activity log file
-import main_recognition_logic # Module that orchestrates the live face recognition system backend
-
+# The backend modules load dlib/face_recognition when imported, so they are imported when first used.
+face_data_manager = _LazyModule("face_data_manager") # Loading, saving, updating, and deleting face encodings/data
+main_recognition_logic = _LazyModule("main_recognition_logic") # Orchestrates the live face recognition system backend
+camera_stream = _LazyModule("camera_stream") # For drawing recognition results (FramePackets) in the display thread
+
+# Logger for this module. Messages are formatted lazily ("%s" arguments), so disabled DEBUG messages cost
+# neither string formatting nor a flushed console write. The level is set in the __main__ block below.
+logger = logging.getLogger("gui3")
+
+# --- Stylesheets ---
+# Defined once here instead of as literals inside the methods that apply them.
+_MAIN_WINDOW_QSS = "background-color: #e6f2ff;" # Light blue background for the main window
+_MENU_BAR_QSS = ("QMenuBar { background-color: #4CAF50; color: white; }" # Green background for menu bar
+                 "QMenuBar::item:selected { background-color: #45a049; }" # Slightly darker green on selection
+                 "QMenu { background-color: white; border: 1px solid #ccc; border-radius: 4px; }" # White background for dropdown menus
+                 "QMenu::item { padding: 5px 20px; }" # Padding for individual menu items
+                 "QMenu::item:selected { background-color: #f0f0f0; }") # Light gray on menu item selection
+_MESSAGE_BOX_QSS = ("QMessageBox { background-color: #e6f2ff; border: 1px solid #cceeff; border-radius: 5px; }"
+                    "QLabel { color: #333333; font-size: 10pt; text-align: center; margin: 10px; }"
+                    "QPushButton { background-color: #007bff; color: white; padding: 5px 15px; border-radius: 4px; }"
+                    "QPushButton:hover { background-color: #0056b3; }")
+# Log table: colors of the 'View Image' / 'View History' buttons painted in every row (see LogButtonDelegate)
+_VIEW_IMAGE_BUTTON_COLOR = "#007bff"
+_VIEW_HISTORY_BUTTON_COLOR = "#28a745"
+
+# QImage format matching OpenCV's BGR frames, so they can be shown without a colour conversion (Qt 5.14+)
+_QIMAGE_FORMAT_BGR888 = getattr(QtGui.QImage, "Format_BGR888", None)
+
+# Upper bound on buffered frames skipped per capture dialog read, so a camera whose grab() never
+# blocks (e.g. a video file) still gets its preview updated.
+_CAPTURE_DIALOG_MAX_STALE_FRAMES = 8
+
+def _center_widget(widget, rect):
+    """Moves `widget` (at its current size) so it is centered on `rect`, e.g. the parent window's geometry; returns its new position."""
+    position = QtWidgets.QStyle.alignedRect(QtCore.Qt.LeftToRight, QtCore.Qt.AlignCenter, widget.size(), rect).topLeft()
+    widget.move(position)
+    return position
 
 # --- Helper Function for Non-Blocking Temporary Messages ---
 class TemporaryMessageBox(QtWidgets.QMessageBox):
     """
     A non-modal QMessageBox that closes automatically after a specified duration.
-    Implements a singleton-like behavior to ensure only one is active at a time,
-    preventing multiple overlapping message boxes from appearing.
+    A single instance is built on first use and reused for every later message (see `show_message`),
+    so only one is visible at a time and the widget is not rebuilt and restyled for each status update.
     """
-    _instance = None # Class variable to hold a single active instance
-
-    def __init__(self, title, message, duration_ms=3000, parent=None):
-        print(f"DEBUG: TemporaryMessageBox: Initializing '{title}' with message: '{message}'", flush=True)
-        # If an instance already exists, close it before creating a new one
-        if TemporaryMessageBox._instance is not None:
-            print("DEBUG: TemporaryMessageBox: Closing existing instance.", flush=True)
-            TemporaryMessageBox._instance.close()
+    _instance = None # Class variable holding the single, reused message box
 
+    def __init__(self, parent=None):
+        logger.debug("TemporaryMessageBox: Creating the shared message box.")
         super().__init__(parent)
-        TemporaryMessageBox._instance = self # Set this new instance as the singleton
-
-        self.setWindowTitle(title) # Set the window title for the message box
-        self.setText(message) # Set the message text to be displayed
         self.setStandardButtons(QtWidgets.QMessageBox.Ok) # Include an OK button for user acknowledgement
         self.setModal(False) # Non-modal: allows interaction with other windows while this one is open
 
-        # Apply custom CSS styling for a more modern and consistent look
-        self.setStyleSheet("QMessageBox { background-color: #e6f2ff; border: 1px solid #cceeff; border-radius: 5px; }"
-                           "QLabel { color: #333333; font-size: 10pt; text-align: center; margin: 10px; }"
-                           "QPushButton { background-color: #007bff; color: white; padding: 5px 15px; border-radius: 4px; }"
-                           "QPushButton:hover { background-color: #0056b3; }")
+        self.setStyleSheet(_MESSAGE_BOX_QSS) # Custom CSS styling for a more modern and consistent look
+
+        # One single-shot timer closes the box; every new message restarts it
+        self._close_timer = QtCore.QTimer(self)
+        self._close_timer.setSingleShot(True)
+        self._close_timer.timeout.connect(self.close)
+
+    @classmethod
+    def show_message(cls, title, message, duration_ms=3000, parent=None):
+        """
+        Shows `message` in the shared message box, replacing any message still on screen,
+        and closes it automatically after `duration_ms`.
+        May be called from any thread: off the GUI thread the call is posted (as one queued event)
+        to the parent's `_show_temporary_message` slot, since Qt widgets may only be used in the GUI thread.
+        """
+        if QtCore.QThread.currentThread() != QtWidgets.QApplication.instance().thread():
+            if parent is None or not hasattr(parent, "_show_temporary_message"):
+                logger.warning("TemporaryMessageBox: Message '%s' from a worker thread needs a FaceRecognitionApp parent. Dropped.", title)
+                return
+            QtCore.QMetaObject.invokeMethod(parent, "_show_temporary_message", QtCore.Qt.QueuedConnection,
+                                            QtCore.Q_ARG(str, title), QtCore.Q_ARG(str, message),
+                                            QtCore.Q_ARG(int, duration_ms))
+            return
+
+        logger.debug("TemporaryMessageBox: Showing '%s' with message: '%s'", title, message)
+        box = cls._instance
+        if box is None or box.parent() is not parent:
+            if box is not None:
+                box.deleteLater() # Shown for another parent window before; rebuild it for this one
+            box = cls._instance = cls(parent)
+
+        box.setWindowTitle(title) # Set the window title for the message box
+        box.setText(message) # Set the message text to be displayed
+        box.adjustSize() # Size for the new text before centering
 
         # Center the message box relative to its parent window or the desktop screen
         if parent:
-            parent_rect = parent.geometry()
-            x = parent_rect.x() + (parent_rect.width() - self.width()) // 2
-            y = parent_rect.y() + (parent_rect.height() - self.height()) // 2
-            self.move(x, y)
-            print(f"DEBUG: TemporaryMessageBox: Centered relative to parent at ({x},{y}).", flush=True)
+            _center_widget(box, parent.geometry())
         else:
-            screen_rect = QtWidgets.QApplication.desktop().screenGeometry()
-            x = (screen_rect.width() - self.width()) // 2
-            y = (screen_rect.height() - self.height()) // 2
-            self.move(x, y)
-            print(f"DEBUG: TemporaryMessageBox: Centered relative to screen at ({x},{y}).", flush=True)
-
-        QtCore.QTimer.singleShot(duration_ms, self.close) # Set a timer to automatically close the message box after `duration_ms`
-        self.finished.connect(self._clear_instance) # Connect the `finished` signal to clear the singleton instance
-        self.open() # Show the message box (non-blocking)
-        print(f"DEBUG: TemporaryMessageBox: Displaying message box. Auto-closing in {duration_ms}ms.", flush=True)
-
-    def _clear_instance(self, result):
-        """
-        Slot connected to the `finished` signal of the message box.
-        Resets the singleton instance reference when the message box is closed,
-        allowing a new TemporaryMessageBox to be created later.
-        """
-        print(f"DEBUG: TemporaryMessageBox: Instance finished signal received with result {result}.", flush=True)
-        if TemporaryMessageBox._instance == self: # Check if this is the active instance being closed
-            TemporaryMessageBox._instance = None # Reset the singleton reference
-            print("DEBUG: TemporaryMessageBox: Instance cleared (singleton reset).", flush=True)
+            _center_widget(box, QtWidgets.QApplication.primaryScreen().availableGeometry())
+
+        box._close_timer.start(duration_ms) # (Re)start the auto-close countdown for this message
+        if box.isVisible():
+            box.raise_()
+        else:
+            box.open() # Show the message box (non-blocking)
+        logger.debug("TemporaryMessageBox: Displaying message box. Auto-closing in %sms.", duration_ms)
+
+
+class LogTableModel(QtCore.QAbstractTableModel):
+    """
+    Read-only table model over parsed log rows (tuples of column values, as from `logging_manager.read_log_rows()`).
+    Cells are produced on demand when the view paints them, instead of one QTableWidgetItem per cell up front.
+    The IMAGE_LINK column shows "View Image" (UserRole: the image path) where a link exists, and the optional
+    history column "View History" (UserRole: the person's name); LogButtonDelegate paints both as buttons.
+    Rows with fewer columns than `headers` are shown empty.
+    """
+    def __init__(self, headers, display_headers, rows, name_col, image_link_col, history_col=-1, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.display_headers = display_headers
+        self.rows = rows
+        self.name_col = name_col
+        self.image_link_col = image_link_col
+        self.history_col = history_col # -1 = no history column
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.display_headers)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or role not in (QtCore.Qt.DisplayRole, QtCore.Qt.UserRole, QtCore.Qt.ToolTipRole):
+            return None
+        parts = self.rows[index.row()]
+        if len(parts) < len(self.headers): # Malformed log line (too few columns)
+            return "" if role == QtCore.Qt.DisplayRole else None
+        col = index.column()
+        if col == self.image_link_col:
+            image_link_data = parts[col]
+            if not image_link_data or image_link_data == "N/A":
+                return "N/A" if role == QtCore.Qt.DisplayRole else None
+            return "View Image" if role == QtCore.Qt.DisplayRole else image_link_data # Tooltip: the full path
+        if col == self.history_col:
+            if role == QtCore.Qt.DisplayRole:
+                return "View History"
+            return parts[self.name_col] if role == QtCore.Qt.UserRole else None
+        return parts[col] if role == QtCore.Qt.DisplayRole else None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self.display_headers[section]
+        return str(section + 1) # Row numbers, as QTableWidget showed them
+
+
+class LogButtonDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Paints the cells of a log table column as buttons and emits `clicked` with the cell's Qt.UserRole data
+    when one is clicked. Used instead of a QPushButton widget per row, which made large logs slow to open.
+    Cells without UserRole data (e.g. "N/A") are painted as normal text.
+    """
+    clicked = QtCore.pyqtSignal(object)
+
+    def __init__(self, background_color, parent=None):
+        super().__init__(parent)
+        self.background_color = QtGui.QColor(background_color)
+
+    def paint(self, painter, option, index):
+        if index.data(QtCore.Qt.UserRole) is None:
+            super().paint(painter, option, index)
+            return
+        button_rect = option.rect.adjusted(2, 2, -2, -2)
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(self.background_color)
+        painter.drawRoundedRect(QtCore.QRectF(button_rect), 3, 3)
+        painter.setPen(QtCore.Qt.white)
+        painter.drawText(button_rect, QtCore.Qt.AlignCenter, index.data(QtCore.Qt.DisplayRole))
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        return QtCore.QSize(size.width() + 14, size.height()) # Room for the button's margin and padding
+
+    def editorEvent(self, event, model, option, index):
+        # Called for mouse events even though the table is read-only
+        if (event.type() == QtCore.QEvent.MouseButtonRelease and event.button() == QtCore.Qt.LeftButton
+                and index.data(QtCore.Qt.UserRole) is not None and option.rect.contains(event.pos())):
+            self.clicked.emit(index.data(QtCore.Qt.UserRole))
+            return True
+        return super().editorEvent(event, model, option, index)
 
 
 # --- Main Application Window ---
 class FaceRecognitionApp(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
-        print("DEBUG: FaceRecognitionApp: Initializing main application window.", flush=True)
+        logger.debug("FaceRecognitionApp: Initializing main application window.")
         self.setWindowTitle("Face Recognition Control Panel") # Set the window title
         self.setGeometry(100, 100, 800, 600) # Set initial position and size
         self.setWindowState(QtCore.Qt.WindowMaximized) # Start the application window maximized
-        self.setStyleSheet("background-color: #e6f2ff;") # Apply a light blue background color
+        self.setStyleSheet(_MAIN_WINDOW_QSS) # Apply a light blue background color
 
         self.central_widget = QtWidgets.QWidget() # Create a central widget for the main window
         self.setCentralWidget(self.central_widget) # Set it as the main window's central widget
@@ -95,38 +240,61 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         self.create_menu_bar() # Setup the application's menu bar
         self.add_welcome_widgets() # Add initial welcome messages to the GUI
 
+        # Live camera feeds are shown in this grid inside the main window (one QLabel per camera)
+        self.camera_grid = QtWidgets.QGridLayout()
+        self.layout.addLayout(self.camera_grid)
+        # 'q' stops the live recognition, as it did in the former OpenCV display windows
+        self.stop_camera_shortcut = QtWidgets.QShortcut(QtGui.QKeySequence("Q"), self)
+        self.stop_camera_shortcut.activated.connect(self._stop_camera_from_shortcut)
+
         # --- QThread references for background processes ---
         # The QThread that will run the `main_recognition_logic` module (the core system)
         self.recognition_thread = None
         self.recognition_stop_event = threading.Event() # A standard Python Event to signal the recognition thread to stop
-        self.camera_display_queues = {} # Dictionary: {camera_input: queue.Queue} for receiving frames from recognition thread
-        self.camera_display_timers = {} # Dictionary: {camera_input: QTimer} for updating individual OpenCV display windows
+        self.camera_stopping = False # True between stop_camera() and the recognition thread's `finished` signal
+        self.camera_display_queues = {} # Dictionary: {camera_input: deque(maxlen=1)} holding the latest frame from the recognition thread
+        self.camera_display_labels = {} # Dictionary: {camera_input: QLabel} showing each camera in the main window
+        self.camera_display_buffers = {} # Dictionary: {camera_input: (BGR, RGB) label-sized buffers} (see _fit_frame_to_label)
+        self.disabled_camera_displays = set() # Cameras whose display failed (their frames are ignored)
+        # Display passes are spaced at least one screen refresh apart (see _run_display_pass); frames that
+        # arrive sooner are shown by this single-shot timer at the next refresh instead.
+        self.display_pass_interval = 0.0 # Seconds, set from the screen's refresh rate in start_camera
+        self.last_display_pass_time = 0.0
+        self.display_pass_timer = QtCore.QTimer(self)
+        self.display_pass_timer.setSingleShot(True)
+        self.display_pass_timer.timeout.connect(self._run_display_pass)
 
         # QThread for the encoding update process (replaces the old `update_face_encodings.py` subprocess)
         self.encoding_update_thread = None
         # QThread for the person deletion process (replaces the old `delete_person.py` subprocess)
         self.delete_person_thread = None
+        self.log_load_thread = None # LogLoadThread reading the log for the log dialogs
+        self.close_in_progress = False # True while closeEvent waits for the background threads
+
+        # 'Download Log' filter dialog, built on first use and reset each time it is shown again
+        self.filter_dialog = None
 
         # Variables for the 'Capture New Face' modal dialog
         self.camera_capture_dialog = None # Reference to the modal dialog itself
         self.capture_dialog_video_label = None # QLabel within the dialog to display the live video feed
         self.capture_dialog_camera_capture = None # cv2.VideoCapture object for direct camera access in the dialog
         self.capture_dialog_timer = None # QTimer for continuously updating frames in the capture dialog
-        print("DEBUG: FaceRecognitionApp: Initialization complete.", flush=True)
+        logger.debug("FaceRecognitionApp: Initialization complete.")
+
+    @QtCore.pyqtSlot(str, str, int)
+    def _show_temporary_message(self, title, message, duration_ms):
+        """Slot behind TemporaryMessageBox.show_message calls made from worker threads; runs in the GUI thread."""
+        TemporaryMessageBox.show_message(title, message, duration_ms=duration_ms, parent=self)
 
     def create_menu_bar(self):
         """
         Sets up the application's menu bar with a new, more organized structure:
         File, Registration, and Log menus.
         """
-        print("DEBUG: FaceRecognitionApp: Creating menu bar with new structure.", flush=True)
+        logger.debug("FaceRecognitionApp: Creating menu bar with new structure.")
         menu_bar = self.menuBar()
         # Apply custom CSS styling for the menu bar and its items for a consistent look
-        menu_bar.setStyleSheet("QMenuBar { background-color: #4CAF50; color: white; }" # Green background for menu bar
-                               "QMenuBar::item:selected { background-color: #45a049; }" # Slightly darker green on selection
-                               "QMenu { background-color: white; border: 1px solid #ccc; border-radius: 4px; }" # White background for dropdown menus
-                               "QMenu::item { padding: 5px 20px; }" # Padding for individual menu items
-                               "QMenu::item:selected { background-color: #f0f0f0; }") # Light gray on menu item selection
+        menu_bar.setStyleSheet(_MENU_BAR_QSS)
 
         # --- 1. File Menu ---
         file_menu = menu_bar.addMenu("&File")
@@ -135,20 +303,20 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         start_camera_action = QtWidgets.QAction("&Start Camera", self)
         start_camera_action.triggered.connect(self.start_camera)
         file_menu.addAction(start_camera_action)
-        print("DEBUG: Menu: File -> 'Start Camera' action added.", flush=True)
+        logger.debug("Menu: File -> 'Start Camera' action added.")
 
         # Stop Camera (stops the live face recognition system)
         stop_camera_action = QtWidgets.QAction("&Stop Camera", self)
         stop_camera_action.triggered.connect(self.stop_camera)
         file_menu.addAction(stop_camera_action)
         file_menu.addSeparator() # Separator after camera controls
-        print("DEBUG: Menu: File -> 'Stop Camera' action added.", flush=True)
+        logger.debug("Menu: File -> 'Stop Camera' action added.")
 
         # Exit Application
         exit_action = QtWidgets.QAction("&Exit", self)
         exit_action.triggered.connect(self.close) # Connects to QMainWindow's built-in close event
         file_menu.addAction(exit_action)
-        print("DEBUG: Menu: File -> 'Exit' action added.", flush=True)
+        logger.debug("Menu: File -> 'Exit' action added.")
 
 
         # --- 2. Registration Menu (NEW Top-Level Menu) ---
@@ -158,13 +326,13 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         new_face_action = QtWidgets.QAction("&New Face Registration", self)
         new_face_action.triggered.connect(self.add_new_face)
         registration_menu.addAction(new_face_action)
-        print("DEBUG: Menu: Registration -> 'New Face Registration' action added.", flush=True)
+        logger.debug("Menu: Registration -> 'New Face Registration' action added.")
 
         # Delete Registration (removes a person's data)
         delete_face_action = QtWidgets.QAction("&Delete Registration", self)
         delete_face_action.triggered.connect(self.delete_face)
         registration_menu.addAction(delete_face_action)
-        print("DEBUG: Menu: Registration -> 'Delete Registration' action added.", flush=True)
+        logger.debug("Menu: Registration -> 'Delete Registration' action added.")
 
 
         # --- 3. Log Menu (NEW Top-Level Menu) ---
@@ -174,33 +342,33 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         view_full_log_action = QtWidgets.QAction("&View Full Log", self)
         view_full_log_action.triggered.connect(self._view_full_log)
         log_menu.addAction(view_full_log_action)
-        print("DEBUG: Menu: Log -> 'View Full Log' action added.", flush=True)
+        logger.debug("Menu: Log -> 'View Full Log' action added.")
 
         # Search Log by Name
         search_log_by_name_action = QtWidgets.QAction("&Search Log by Name", self)
         search_log_by_name_action.triggered.connect(self._search_log_by_name)
         log_menu.addAction(search_log_by_name_action)
-        print("DEBUG: Menu: Log -> 'Search Log by Name' action added.", flush=True)
+        logger.debug("Menu: Log -> 'Search Log by Name' action added.")
 
         # View Person History (as a shortcut to search)
         # view_person_history_action = QtWidgets.QAction("&View Person History", self)
         # view_person_history_action.triggered.connect(self._view_person_history)
         # log_menu.addAction(view_person_history_action)
-        # print("DEBUG: Menu: Log -> 'View Person History' action added.", flush=True)
+        # logger.debug("Menu: Log -> 'View Person History' action added.")
         # log_menu.addSeparator() # Separator before Download Log
 
         # Download Log (Duration)
         download_log_action = QtWidgets.QAction("&Download Log (Duration)", self)
         download_log_action.triggered.connect(self.download_log)
         log_menu.addAction(download_log_action)
-        print("DEBUG: Menu: Log -> 'Download Log (Duration)' action added.", flush=True)
+        logger.debug("Menu: Log -> 'Download Log (Duration)' action added.")
 
 
-        print("DEBUG: FaceRecognitionApp: Menu bar creation complete.", flush=True)
+        logger.debug("FaceRecognitionApp: Menu bar creation complete.")
 
     def add_welcome_widgets(self):
         """Adds a welcome title and informational message to the central widget of the main window."""
-        print("DEBUG: FaceRecognitionApp: Adding welcome widgets.", flush=True)
+        logger.debug("FaceRecognitionApp: Adding welcome widgets.")
         title_label = QtWidgets.QLabel("Face Recognition Control Panel")
         title_label.setFont(QtGui.QFont("Helvetica", 18, QtGui.QFont.Bold))
         title_label.setAlignment(QtCore.Qt.AlignCenter)
@@ -212,7 +380,7 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         info_label.setAlignment(QtCore.Qt.AlignCenter)
         info_label.setStyleSheet("color: #555555;")
         self.layout.addWidget(info_label)
-        print("DEBUG: FaceRecognitionApp: Welcome widgets added.", flush=True)
+        logger.debug("FaceRecognitionApp: Welcome widgets added.")
         
     # --- Encoding Update via QThread (replaces QProcess for update_face_encodings.py) ---
     def run_manual_update_encodings(self):
@@ -220,11 +388,19 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         Initiates the face encoding update process in a background QThread.
         This function is called when the user selects "Update Existing Encodings".
         """
-        print("DEBUG: FaceRecognitionApp: Attempting to run manual update encodings.", flush=True)
+        logger.debug("FaceRecognitionApp: Attempting to run manual update encodings.")
         # Prevent starting multiple update threads simultaneously to avoid resource conflicts
         if self.encoding_update_thread and self.encoding_update_thread.isRunning():
-            TemporaryMessageBox("Process Running", "Face encoding update is already in progress. Please wait.", parent=self)
-            print("DEBUG: Encoding Update: Already running, not starting new.", flush=True)
+            logger.debug("Encoding Update: Already running, not starting new.")
+            # Offer to cancel the running update instead (faces encoded so far are kept)
+            reply = QtWidgets.QMessageBox.question(self, "Process Running",
+                                                   "Face encoding update is already in progress.\n"
+                                                   "Do you want to cancel it? Faces encoded so far are kept.",
+                                                   QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                                                   QtWidgets.QMessageBox.No)
+            if reply == QtWidgets.QMessageBox.Yes:
+                self.encoding_update_thread.cancel()
+                logger.debug("Encoding Update: Cancellation requested by user.")
             return
 
         # Create and start a new QThread dedicated to the encoding update operation
@@ -233,16 +409,16 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         self.encoding_update_thread.finished_signal.connect(self._handle_encoding_finished) # On success
         self.encoding_update_thread.error_signal.connect(self._handle_encoding_error) # On error
         self.encoding_update_thread.start() # Start the background thread
-        print("DEBUG: Encoding Update: Started EncodingUpdateThread.", flush=True)
-        TemporaryMessageBox("Encoding Update", "Face encoding update process started in the background. This may take a while.", parent=self)
+        logger.debug("Encoding Update: Started EncodingUpdateThread.")
+        TemporaryMessageBox.show_message("Encoding Update", "Face encoding update process started in the background. This may take a while.", parent=self)
 
     def _handle_encoding_finished(self, message):
         """
         Slot to handle the successful completion of the encoding update thread.
         Displays a success message to the user.
         """
-        print(f"DEBUG: Encoding Update: Finished with message: {message}", flush=True)
-        TemporaryMessageBox("Encoding Update", message, parent=self)
+        logger.debug("Encoding Update: Finished with message: %s", message)
+        TemporaryMessageBox.show_message("Encoding Update", message, parent=self)
         self.encoding_update_thread = None # Clear the thread reference after its completion
 
     def _handle_encoding_error(self, message):
@@ -250,8 +426,8 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         Slot to handle errors encountered during the encoding update thread.
         Displays an error message to the user.
         """
-        print(f"ERROR: Encoding Update: Failed with message: {message}", flush=True)
-        TemporaryMessageBox("Encoding Update Error", message, duration_ms=7000, parent=self)
+        logger.error("Encoding Update: Failed with message: %s", message)
+        TemporaryMessageBox.show_message("Encoding Update Error", message, duration_ms=7000, parent=self)
         self.encoding_update_thread = None # Clear the thread reference after an error
 
 
@@ -259,24 +435,29 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
     def start_camera(self):
         """
         Starts the live face recognition system by launching the `main_recognition_logic`
-        in a background QThread. This also sets up display timers for OpenCV windows.
+        in a background QThread. Frames are pushed to video labels in the main window through its `frames_ready` signal.
         """
-        print("DEBUG: FaceRecognitionApp: Attempting to start camera process.", flush=True)
+        logger.debug("FaceRecognitionApp: Attempting to start camera process.")
+        # A stop is still in progress: the old session cleans up in _handle_camera_finished first
+        if self.camera_stopping:
+            TemporaryMessageBox.show_message("Camera", "Live face recognition is still stopping. Please try again in a moment.", parent=self)
+            logger.debug("Camera Control: Stop still pending, not starting new.")
+            return
         # Prevent starting multiple recognition threads simultaneously
         if self.recognition_thread and self.recognition_thread.isRunning():
-            TemporaryMessageBox("Camera", "Live face recognition is already running.", parent=self)
-            print("DEBUG: Camera Control: Already running, not starting new.", flush=True)
+            TemporaryMessageBox.show_message("Camera", "Live face recognition is already running.", parent=self)
+            logger.debug("Camera Control: Already running, not starting new.")
             return
 
         # Prepare for a new recognition session:
         self.recognition_stop_event.clear() # Ensure the stop event is clear before starting a new session
         self.camera_display_queues = {} # Clear previous camera queues (will be repopulated by recognition thread)
         
-        # Stop and clear any existing display timers to avoid conflicts from a previous run
-        for timer in self.camera_display_timers.values():
-            if timer.isActive():
-                timer.stop()
-        self.camera_display_timers = {} # Clear timer references after stopping them
+        self._clear_camera_display_labels() # Labels are created when each camera's first frame arrives
+        # A frame shown sooner than one screen refresh after the previous one would never be seen
+        screen = self.windowHandle().screen() if self.windowHandle() is not None else QtWidgets.QApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen is not None else 0
+        self.display_pass_interval = 0.9 / refresh_rate if refresh_rate > 0 else 0.0
 
         # Create and start the QThread that will run `main_recognition_logic.start_live_face_recognition`
         self.recognition_thread = RecognitionSystemThread(
@@ -284,168 +465,183 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
             camera_display_queues=self.camera_display_queues # Pass the shared queues dictionary
         )
         # Connect signals:
-        # - When the recognition thread starts, set up the display timers.
+        # - New camera frames are pushed to the display slot. The signal is emitted from the camera
+        #   streams' own threads, so a queued connection runs the slot in the GUI's main thread.
         # - When the recognition thread finishes, handle final cleanup.
-        self.recognition_thread.started.connect(self._setup_camera_display_timers)
+        self.recognition_thread.frames_ready.connect(self._on_frames_ready, QtCore.Qt.QueuedConnection)
         self.recognition_thread.finished.connect(self._handle_camera_finished)
         self.recognition_thread.start() # Start the background thread
         
-        print("DEBUG: Camera Control: Started RecognitionSystemThread.", flush=True)
-        TemporaryMessageBox("Camera Control", "Live face recognition process started. OpenCV window(s) should appear.", parent=self)
+        logger.debug("Camera Control: Started RecognitionSystemThread.")
+        TemporaryMessageBox.show_message("Camera Control", "Live face recognition process started. Camera feed(s) will appear in this window.", parent=self)
 
-    def _setup_camera_display_timers(self):
+    def _on_frames_ready(self):
         """
-        Sets up QTimers for each active camera to pull frames from their respective queues
-        and display them in OpenCV windows. This method is called in the GUI's main thread
-        when the `RecognitionSystemThread` signals it has started.
+        Slot connected (queued) to `RecognitionSystemThread.frames_ready`, so it runs in the GUI's main
+        thread as soon as a camera stream has placed a new frame in its slot - no polling timer needed.
+        One call shows the latest frame of every camera, so the event loop is woken once per display pass
+        rather than once per camera frame.
         """
-        print("DEBUG: FaceRecognitionApp: Setting up camera display timers.", flush=True)
-        
-        # Use a singleShot timer to give `main_recognition_logic` a brief moment (1 second)
-        # to initialize cameras and populate initial `camera_display_queues` with keys.
-        # This prevents the display loop from immediately trying to access empty or non-existent queues.
-        QtCore.QTimer.singleShot(1000, self._start_display_for_active_cameras)
+        if self.sender() is not self.recognition_thread:
+            return # Signal from a session that has already been stopped
+        self._run_display_pass()
 
-    def _start_display_for_active_cameras(self):
+    def _run_display_pass(self):
         """
-        Iterates through the list of active cameras (obtained from `camera_display_queues`)
-        and sets up a dedicated QTimer for each to manage its corresponding OpenCV display window.
-        This allows multiple camera feeds to be displayed simultaneously in separate windows.
+        Shows the latest frame of every camera, at most once per screen refresh. When called sooner, the
+        pass is postponed to the next refresh by `display_pass_timer` (the cameras' newer frames replace
+        the waiting ones meanwhile), so no frame is drawn that would be overwritten before it is seen.
         """
-        print("DEBUG: FaceRecognitionApp: Iterating cameras to start display timers and windows.", flush=True)
-        # Iterate over a copy of keys, as `camera_display_queues` might be dynamically updated
-        # by the `RecognitionSystemThread` if new cameras come online (though not implemented here).
-        for cam_input in list(self.camera_display_queues.keys()):
-            # Only create a new timer and window if one doesn't already exist for this camera input
-            if cam_input not in self.camera_display_timers:
-                # --- CRUCIAL: Create the OpenCV window in the GUI's main thread ---
-                window_name = f'Live Face Recognition - Camera ({cam_input})'
-                try:
-                    cv2.namedWindow(window_name, cv2.WINDOW_NORMAL) # Create a resizable OpenCV window
-                    cv2.resizeWindow(window_name, 640, 480) # Set an initial default size for the window
-                    print(f"DEBUG: FaceRecognitionApp: Created OpenCV display window '{window_name}'.", flush=True)
-                except Exception as e:
-                    print(f"ERROR: FaceRecognitionApp: Failed to create OpenCV window for '{cam_input}': {e}. Skipping display for this camera.", flush=True)
-                    continue # If window creation fails, skip setting up its timer and move to next camera
-
-                timer = QtCore.QTimer(self)
-                # Use a lambda to capture the current `cam_input` value for the slot.
-                # This ensures the correct camera's queue is accessed when the timer fires.
-                timer.timeout.connect(lambda ci=cam_input: self._update_live_camera_display(ci))
-                timer.start(30) # Start the timer to update every 30ms (approx 33 FPS) for smooth video
-                self.camera_display_timers[cam_input] = timer # Store timer reference in the dictionary
-                print(f"DEBUG: FaceRecognitionApp: Started display timer for camera {cam_input}.", flush=True)
-
-    def _update_live_camera_display(self, cam_input):
+        recognition_thread = self.recognition_thread
+        if recognition_thread is None or self.recognition_stop_event.is_set():
+            return # Stopping: nothing to show
+        now = time.monotonic()
+        wait_time = self.last_display_pass_time + self.display_pass_interval - now
+        if wait_time > 0:
+            # display_pending stays set, so the cameras do not signal again while the pass waits
+            if not self.display_pass_timer.isActive():
+                self.display_pass_timer.start(max(int(wait_time * 1000), 1))
+            return
+        self.last_display_pass_time = now
+        # Cleared before the slots are read: a frame published after this point triggers a new pass
+        recognition_thread.display_pending.clear()
+        for cam_input, frame_slot in list(self.camera_display_queues.items()):
+            if frame_slot and cam_input not in self.disabled_camera_displays:
+                self._show_camera_frame(cam_input, frame_slot)
+
+    def _show_camera_frame(self, cam_input, frame_slot):
         """
-        Slot called by a QTimer for a specific camera.
-        It pulls a processed frame from the camera's queue and displays it in its dedicated OpenCV window.
-        Also handles window closure by the user and `q` key press.
+        Shows the latest frame from a camera's slot, creating the camera's video label in the main
+        window on its first frame. Called from `_on_frames_ready`.
         """
-        window_name = f'Live Face Recognition - Camera ({cam_input})'
-
-        # Check if the OpenCV window associated with this camera still exists.
-        # cv2.getWindowProperty returns -1 if the window has been manually closed by the user's 'X' button.
-        # If it's closed, stop the timer for this specific camera and clean up.
-        if cv2.getWindowProperty(window_name, cv2.WND_PROP_AUTOSIZE) == -1:
-            print(f"INFO: FaceRecognitionApp: OpenCV window '{window_name}' was closed by user. Stopping its timer.", flush=True)
-            if cam_input in self.camera_display_timers:
-                self.camera_display_timers[cam_input].stop() # Stop the QTimer for this closed window
-                del self.camera_display_timers[cam_input] # Remove the timer reference from our map
-            # We don't `return` here immediately. We still attempt to get frames from the queue
-            # even if the display window is gone. This is important to prevent the queue from constantly
-            # filling up and consuming memory, as the recognition thread is still pushing to it.
-            
         try:
-            # Get the latest frame from the queue (non-blocking).
-            # `get_nowait()` raises `queue.Empty` if no item is immediately available.
-            frame_to_display = self.camera_display_queues[cam_input].get_nowait()
+            # Take the latest FramePacket from the camera's single-frame slot (a deque with maxlen=1
+            # that the recognition thread overwrites) and draw its boxes/labels here.
+            # `pop()` raises IndexError if the slot was emptied since it was checked.
+            try:
+                frame_packet = frame_slot.pop()
+            except IndexError:
+                return
+            frame_to_display = camera_stream.draw_frame_packet(frame_packet)
             if frame_to_display is not None:
                 # Ensure the frame has valid data (is not empty) before attempting to display it
                 if frame_to_display.size > 0:
-                    cv2.imshow(window_name, frame_to_display)
-                    # `cv2.waitKey(1)` is crucial here:
-                    # - It processes OpenCV window events (like mouse clicks, resizing, window closing).
-                    # - It returns the ASCII value of any key pressed while an OpenCV window is active.
-                    # - It introduces a tiny delay (1ms) preventing the loop from hogging CPU, while
-                    #   still allowing for rapid updates.
-                    key = cv2.waitKey(1) & 0xFF # Process events and get key press (mask with 0xFF for ASCII)
-                    if key == ord('q'): # Check if 'q' key was pressed in this active OpenCV window
-                        print(f"INFO: FaceRecognitionApp: 'q' pressed in window {window_name}. Signaling stop cameras.", flush=True)
-                        self.stop_camera() # Call the GUI's method to gracefully stop the entire system
+                    assert frame_to_display.flags["C_CONTIGUOUS"] # See RecognitionSystemThread's frame contract
+                    video_label = self.camera_display_labels.get(cam_input)
+                    if video_label is None:
+                        video_label = self._add_camera_display_label(cam_input)
+                    display_image = self._fit_frame_to_label(cam_input, frame_to_display, video_label)
+                    # The frame has been copied into the label-sized buffer, so the capture buffer can be reused
+                    camera_stream.release_frame_packet(frame_packet)
+                    h, w = display_image.shape[:2]
+                    # Wrap the label-sized buffer in a QImage without copying it (strides[0] is the row length
+                    # in bytes); QPixmap.fromImage then makes the only copy, at the final size.
+                    qt_image = QtGui.QImage(display_image.data, w, h, display_image.strides[0],
+                                            _QIMAGE_FORMAT_BGR888 if _QIMAGE_FORMAT_BGR888 is not None else QtGui.QImage.Format_RGB888)
+                    video_label.setPixmap(QtGui.QPixmap.fromImage(qt_image))
                 else:
-                    print(f"WARNING: FaceRecognitionApp: Received empty frame for {cam_input}. Skipping imshow.", flush=True)
-        except queue.Empty:
-            pass # No new frame from this camera yet; simply skip displaying for this iteration
+                    logger.warning("FaceRecognitionApp: Received empty frame for %s. Skipping display.", cam_input)
         except Exception as e:
-            print(f"ERROR: FaceRecognitionApp: Error displaying frame for Camera ({cam_input}): {e}", flush=True)
-            # If a display error occurs, stop the timer for this problematic camera to prevent recurrence.
-            if cam_input in self.camera_display_timers:
-                self.camera_display_timers[cam_input].stop()
-                del self.camera_display_timers[cam_input]
+            logger.error("FaceRecognitionApp: Error displaying frame for Camera (%s): %s", cam_input, e)
+            # If a display error occurs, stop displaying this problematic camera to prevent recurrence.
+            self.disabled_camera_displays.add(cam_input)
 
+    def _fit_frame_to_label(self, cam_input, frame, video_label):
+        """
+        Scales a BGR frame to fit `video_label` (keeping its aspect ratio) into a per-camera buffer that is
+        reused while the label size stays the same, and returns that buffer. Only the label-sized image is
+        then handed to Qt, instead of Qt copying and scaling the full frame. Without Qt's BGR888 format the
+        RGB conversion is done here as well, on the small image, into a second reused buffer.
+        """
+        frame_height, frame_width = frame.shape[:2]
+        scale = min(video_label.width() / frame_width, video_label.height() / frame_height)
+        target_size = (max(int(frame_width * scale), 1), max(int(frame_height * scale), 1))
+
+        buffers = self.camera_display_buffers.get(cam_input)
+        if buffers is None or buffers[0].shape[:2] != (target_size[1], target_size[0]):
+            buffers = (np.empty((target_size[1], target_size[0], 3), dtype=np.uint8),
+                       np.empty((target_size[1], target_size[0], 3), dtype=np.uint8))
+            self.camera_display_buffers[cam_input] = buffers
+        scaled_bgr, scaled_rgb = buffers
+
+        # INTER_AREA averages pixels when shrinking; it is not meant for enlarging
+        interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+        cv2.resize(frame, target_size, dst=scaled_bgr, interpolation=interpolation)
+        if _QIMAGE_FORMAT_BGR888 is not None:
+            return scaled_bgr
+        return cv2.cvtColor(scaled_bgr, cv2.COLOR_BGR2RGB, dst=scaled_rgb)
+
+    def _add_camera_display_label(self, cam_input):
+        """
+        Creates the video label for a camera in the main window's camera grid (two cameras per row)
+        and returns it. Called from `_show_camera_frame` when the camera's first frame arrives.
+        """
+        video_label = QtWidgets.QLabel()
+        video_label.setAlignment(QtCore.Qt.AlignCenter)
+        video_label.setMinimumSize(320, 240)
+        video_label.setSizePolicy(QtWidgets.QSizePolicy.Ignored, QtWidgets.QSizePolicy.Ignored) # Pixmaps must not grow the label
+        video_label.setStyleSheet("background-color: black;")
+        video_label.setToolTip(f"Camera ({cam_input})")
+        row, column = divmod(len(self.camera_display_labels), 2)
+        self.camera_grid.addWidget(video_label, row, column)
+        self.camera_display_labels[cam_input] = video_label
+        logger.debug("FaceRecognitionApp: Created display label for camera %s at grid (%s,%s).", cam_input, row, column)
+        return video_label
+
+    def _clear_camera_display_labels(self):
+        """Removes all camera video labels from the main window (replaces closing the OpenCV windows)."""
+        for video_label in self.camera_display_labels.values():
+            self.camera_grid.removeWidget(video_label)
+            video_label.deleteLater()
+        self.camera_display_labels = {}
+        self.camera_display_buffers = {}
+        self.disabled_camera_displays = set()
 
     def _handle_camera_finished(self):
         """
         Slot connected to the `recognition_thread.finished` signal.
         This method is called when the `RecognitionSystemThread` (the main backend thread)
-        has completed its execution or has been stopped. It performs final cleanup actions.
+        has completed its execution or has been stopped (see `stop_camera`). It performs all the final cleanup.
         """
-        print("DEBUG: FaceRecognitionApp: RecognitionSystemThread finished signal received.", flush=True)
-        # Ensure all display timers are stopped and cleared
-        for cam_input, timer in list(self.camera_display_timers.items()):
-            if timer.isActive():
-                timer.stop()
-            print(f"DEBUG: FaceRecognitionApp: Stopped display timer for camera {cam_input}.", flush=True)
-            del self.camera_display_timers[cam_input]
-        self.camera_display_timers = {} # Clear the dictionary after processing all timers
-
-        cv2.destroyAllWindows() # Close all OpenCV windows that might still be open
-        TemporaryMessageBox("Camera Control", "Live face recognition process closed normally.", parent=self)
+        logger.debug("FaceRecognitionApp: RecognitionSystemThread finished signal received.")
+        self._clear_camera_display_labels() # Remove the camera feeds from the main window
+        if self.camera_stopping:
+            TemporaryMessageBox.show_message("Camera Control", "Live face recognition process stopped successfully.", parent=self)
+        else:
+            TemporaryMessageBox.show_message("Camera Control", "Live face recognition process closed normally.", parent=self)
+        self.camera_stopping = False
         self.recognition_thread = None # Clear the thread reference
         self.recognition_stop_event.clear() # Clear the event for a fresh start next time
         self.camera_display_queues = {} # Clear the communication queues
-        print("DEBUG: FaceRecognitionApp: All camera resources and threads cleaned up after finish signal.", flush=True)
+        logger.debug("FaceRecognitionApp: All camera resources and threads cleaned up after finish signal.")
 
 
+    def _stop_camera_from_shortcut(self):
+        """Slot for the 'q' shortcut: stops the live recognition only while it is running."""
+        if self.recognition_thread and self.recognition_thread.isRunning():
+            logger.info("FaceRecognitionApp: 'q' pressed. Signaling stop cameras.")
+            self.stop_camera()
+
     def stop_camera(self):
         """
         Stops the live face recognition system.
-        This method signals the background recognition thread to stop,
-        cleans up display timers, and closes OpenCV windows.
+        This method only signals the background recognition thread to stop and returns immediately,
+        so the GUI stays responsive while the cameras shut down. The cleanup happens in
+        `_handle_camera_finished` once the thread's `finished` signal arrives.
         """
-        print("DEBUG: FaceRecognitionApp: Attempting to stop camera process.", flush=True)
-        if self.recognition_thread and self.recognition_thread.isRunning():
-            print("DEBUG: Camera Control: Signaling recognition thread to stop...", flush=True)
+        logger.debug("FaceRecognitionApp: Attempting to stop camera process.")
+        if self.camera_stopping:
+            TemporaryMessageBox.show_message("Camera Control", "Live face recognition is already stopping.", parent=self)
+            logger.debug("Camera Control: Stop already pending.")
+        elif self.recognition_thread and self.recognition_thread.isRunning():
+            logger.debug("Camera Control: Signaling recognition thread to stop...")
+            self.camera_stopping = True
             self.recognition_stop_event.set() # Signal the background thread to exit its internal loops
-            
-            # Stop all active display timers immediately to prevent new frames from being drawn
-            for cam_input, timer in list(self.camera_display_timers.items()): # Iterate over a copy to allow deletion during loop
-                if timer.isActive():
-                    timer.stop()
-                print(f"DEBUG: FaceRecognitionApp: Stopped display timer for camera {cam_input}.", flush=True)
-                del self.camera_display_timers[cam_input] # Remove timer reference from map
-            self.camera_display_timers = {} # Clear the dictionary completely
-
-            # Wait for the recognition thread to finish gracefully
-            # A timeout is provided to prevent the GUI from freezing indefinitely if the thread is stuck.
-            if not self.recognition_thread.wait(5000): # Wait up to 5 seconds for thread to clean up
-                print("WARNING: Camera Control: Recognition thread did not terminate gracefully within timeout. It might be unresponsive.", flush=True)
-                # For critical unresponsiveness, you might use self.recognition_thread.terminate() here,
-                # but it's less graceful and can leave resources in an uncertain state.
-            else:
-                print("DEBUG: Camera Control: Recognition thread terminated successfully.", flush=True)
-
-            self.recognition_thread = None # Clear the thread object reference
-            self.recognition_stop_event.clear() # Reset the event for the next time 'Start Camera' is clicked
-            self.camera_display_queues = {} # Clear the queues used for frame communication
-
-            cv2.destroyAllWindows() # Close all OpenCV windows that were opened by the system
-            TemporaryMessageBox("Camera Control", "Live face recognition process stopped successfully.", parent=self)
-            print("DEBUG: Camera Control: All camera resources and threads cleaned up after stop.", flush=True)
+            # Frame signals still queued are ignored by _on_frames_ready once the stop event is set.
+            TemporaryMessageBox.show_message("Camera Control", "Stopping live face recognition...", parent=self)
         else:
-            TemporaryMessageBox("Camera Control", "Live face recognition is not currently running.", parent=self)
-            print("DEBUG: Camera Control: Not running, no action needed.", flush=True)
+            TemporaryMessageBox.show_message("Camera Control", "Live face recognition is not currently running.", parent=self)
+            logger.debug("Camera Control: Not running, no action needed.")
 
 
     # --- New Face Registration (UI flow) ---
@@ -454,18 +650,15 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         Presents options for new face registration: capture from live camera feed
         or trigger a scan of the dataset folder for newly added images.
         """
-        print("DEBUG: FaceRecognitionApp: Opening 'New Face Registration Options' dialog.", flush=True)
+        logger.debug("FaceRecognitionApp: Opening 'New Face Registration Options' dialog.")
         choice_dialog = QtWidgets.QDialog(self)
         choice_dialog.setWindowTitle("New Face Registration Options")
         choice_dialog.setFixedSize(350, 180) # Fixed size for layout consistency
         choice_dialog.setModal(True) # Make it modal to block interaction with main window until closed
 
         # Center the dialog on the parent window for better user experience
-        parent_rect = self.geometry()
-        x = parent_rect.x() + (parent_rect.width() - choice_dialog.width()) // 2
-        y = parent_rect.y() + (parent_rect.height() - choice_dialog.height()) // 2
-        choice_dialog.move(x, y)
-        print(f"DEBUG: New Face Dialog: Centered at ({x},{y}).", flush=True)
+        position = _center_widget(choice_dialog, self.geometry())
+        logger.debug("New Face Dialog: Centered at (%s,%s).", position.x(), position.y())
 
         # Layout for buttons in the choice dialog
         layout = QtWidgets.QVBoxLayout(choice_dialog)
@@ -480,7 +673,7 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         btn_capture.clicked.connect(lambda: (choice_dialog.accept(), self.capture_new_face_from_camera()))
         btn_capture.setFixedSize(280, 35) # Fixed size for button consistency
         layout.addWidget(btn_capture, alignment=QtCore.Qt.AlignCenter)
-        print("DEBUG: New Face Dialog: 'Capture New Face' button added.", flush=True)
+        logger.debug("New Face Dialog: 'Capture New Face' button added.")
 
         # Option 2: Update Existing Encodings (scans the dataset folder for new images)
         btn_manual = QtWidgets.QPushButton("Update Existing Encodings (Scan Folder)")
@@ -489,11 +682,11 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         btn_manual.clicked.connect(lambda: (choice_dialog.accept(), self.run_manual_update_encodings()))
         btn_manual.setFixedSize(280, 35) # Fixed size for button consistency
         layout.addWidget(btn_manual, alignment=QtCore.Qt.AlignCenter)
-        print("DEBUG: New Face Dialog: 'Update Existing Encodings' button added.", flush=True)
+        logger.debug("New Face Dialog: 'Update Existing Encodings' button added.")
 
         layout.addStretch(1) # Adds stretchable space to push buttons to the center vertically
         result = choice_dialog.exec_() # Show the dialog modally and wait for user interaction
-        print(f"DEBUG: New Face Dialog: Dialog closed with result {result}.", flush=True)
+        logger.debug("New Face Dialog: Dialog closed with result %s.", result)
 
 
     def capture_new_face_from_camera(self):
@@ -501,7 +694,63 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         Opens a modal dialog to capture a new face image from the live camera feed.
         Allows the user to preview the feed and capture a photo which is then saved to the dataset.
         """
-        print("DEBUG: FaceRecognitionApp: Opening 'Capture New Face' camera dialog.", flush=True)
+        logger.debug("FaceRecognitionApp: Opening 'Capture New Face' camera dialog.")
+        # The dialog and its widgets are built on first use and reused afterwards; only the camera
+        # is opened again each time (it is released whenever the dialog closes).
+        if self.camera_capture_dialog is None:
+            self._build_capture_dialog()
+        else:
+            self.capture_dialog_video_label.setText("Opening camera...")
+
+        # Center the dialog on the parent window for better user experience
+        position = _center_widget(self.camera_capture_dialog, self.geometry())
+        logger.debug("Capture Face Dialog: Centered at (%s,%s).", position.x(), position.y())
+
+        # Initialize OpenCV VideoCapture for the dialog's camera.
+        # Uses camera ID 0 (default webcam), or you could make this configurable (e.g., from config.py)
+        # On Linux the camera is opened through V4L2 directly so config.USB_CAMERA_FOURCC reaches the driver.
+        if sys.platform.startswith("linux"):
+            self.capture_dialog_camera_capture = cv2.VideoCapture(0, cv2.CAP_V4L2)
+        else:
+            self.capture_dialog_camera_capture = cv2.VideoCapture(0)
+        logger.debug("Capture Face Dialog: Attempting to open camera (ID 0).")
+        if not self.capture_dialog_camera_capture.isOpened():
+            QtWidgets.QMessageBox.critical(self, "Camera Error",
+                                           "Failed to open camera (ID 0) for capture. "
+                                           "Please check if camera is connected and not in use by another application.",
+                                           parent=self.camera_capture_dialog)
+            logger.error("Capture Face Dialog: Failed to open camera ID 0 for capture.")
+            self._release_capture_dialog_camera() # Clean up resources
+            self.camera_capture_dialog.close() # Close the dialog if camera failed to open
+            return
+        # Request the configured pixel format (e.g. MJPG) before the resolution, which depends on it
+        if config.USB_CAMERA_FOURCC:
+            if not self.capture_dialog_camera_capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config.USB_CAMERA_FOURCC)):
+                logger.warning("Capture Face Dialog: Camera rejected pixel format %s.", config.USB_CAMERA_FOURCC)
+        # Set resolution for the capture camera for consistency and quality
+        self.capture_dialog_camera_capture.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        self.capture_dialog_camera_capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        # Keep the driver's frame buffer minimal so the preview is not several frames behind
+        # (not every backend supports this; _read_latest_capture_dialog_frame drains the rest).
+        if not self.capture_dialog_camera_capture.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            logger.warning("Capture Face Dialog: Camera backend ignored CAP_PROP_BUFFERSIZE=1.")
+        logger.debug("Capture Face Dialog: Camera opened successfully for capture.")
+
+        # Continuously update the video feed in the QLabel of the dialog
+        self.capture_dialog_timer.start(50) # Update every 50ms (20 FPS), plenty for positioning a face
+        logger.debug("Capture Face Dialog: QTimer started for frame updates.")
+
+        # Show the dialog modally and wait for user interaction (accept or reject).
+        # This blocks the main GUI until the dialog is closed.
+        result = self.camera_capture_dialog.exec_()
+        logger.debug("Capture Face Dialog: Dialog closed with result %s.", result)
+
+
+    def _build_capture_dialog(self):
+        """
+        Creates the 'Capture New Face' dialog with its video label, buttons and preview timer.
+        Called once, on the first `capture_new_face_from_camera`.
+        """
         self.camera_capture_dialog = QtWidgets.QDialog(self) # Create a new QDialog instance
         self.camera_capture_dialog.setWindowTitle("Capture New Face") # Set dialog title
         self.camera_capture_dialog.setFixedSize(680, 600) # Fixed size for the dialog
@@ -509,20 +758,13 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         self.camera_capture_dialog.setLayout(QtWidgets.QVBoxLayout()) # Set a vertical layout for dialog content
         self.camera_capture_dialog.layout().setAlignment(QtCore.Qt.AlignCenter) # Center content within its layout
 
-        # Center the dialog on the parent window for better user experience
-        parent_rect = self.geometry()
-        x = parent_rect.x() + (parent_rect.width() - self.camera_capture_dialog.width()) // 2
-        y = parent_rect.y() + (parent_rect.height() - self.camera_capture_dialog.height()) // 2
-        self.camera_capture_dialog.move(x, y)
-        print(f"DEBUG: Capture Face Dialog: Centered at ({x},{y}).", flush=True)
-
         # QLabel to display the live video feed. It will show "Opening camera..." initially.
         self.capture_dialog_video_label = QtWidgets.QLabel("Opening camera...")
         self.capture_dialog_video_label.setAlignment(QtCore.Qt.AlignCenter)
         self.capture_dialog_video_label.setFixedSize(640, 480) # Fixed size for the video display area
         self.capture_dialog_video_label.setStyleSheet("border: 1px solid gray; background-color: black; color: lightgray;")
         self.camera_capture_dialog.layout().addWidget(self.capture_dialog_video_label)
-        print("DEBUG: Capture Face Dialog: Video label added.", flush=True)
+        logger.debug("Capture Face Dialog: Video label added.")
 
         # Button to capture a photo from the current frame
         self.capture_button = QtWidgets.QPushButton("Capture Photo")
@@ -530,64 +772,76 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         # Connect to a new function to process the captured frame after click
         self.capture_button.clicked.connect(self._process_captured_face_from_dialog)
         self.camera_capture_dialog.layout().addWidget(self.capture_button, alignment=QtCore.Qt.AlignCenter)
-        print("DEBUG: Capture Face Dialog: 'Capture Photo' button added.", flush=True)
+        logger.debug("Capture Face Dialog: 'Capture Photo' button added.")
 
         # Button to cancel the capture process and close the dialog
         self.cancel_button = QtWidgets.QPushButton("Cancel")
         self.cancel_button.setStyleSheet("background-color: #f44336; color: white; padding: 8px;")
         self.cancel_button.clicked.connect(self.camera_capture_dialog.reject) # Reject closes dialog with rejected status
         self.camera_capture_dialog.layout().addWidget(self.cancel_button, alignment=QtCore.Qt.AlignCenter)
-        print("DEBUG: Capture Face Dialog: 'Cancel' button added.", flush=True)
-
-        # Initialize OpenCV VideoCapture for the dialog's camera.
-        # Uses camera ID 0 (default webcam), or you could make this configurable (e.g., from config.py)
-        self.capture_dialog_camera_capture = cv2.VideoCapture(0)
-        print("DEBUG: Capture Face Dialog: Attempting to open camera (ID 0).", flush=True)
-        if not self.capture_dialog_camera_capture.isOpened():
-            QtWidgets.QMessageBox.critical(self, "Camera Error",
-                                           "Failed to open camera (ID 0) for capture. "
-                                           "Please check if camera is connected and not in use by another application.",
-                                           parent=self.camera_capture_dialog)
-            print("ERROR: Capture Face Dialog: Failed to open camera ID 0 for capture.", flush=True)
-            self._release_capture_dialog_camera() # Clean up resources
-            self.camera_capture_dialog.close() # Close the dialog if camera failed to open
-            return
-        # Set resolution for the capture camera for consistency and quality
-        self.capture_dialog_camera_capture.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.capture_dialog_camera_capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        print("DEBUG: Capture Face Dialog: Camera opened successfully for capture.", flush=True)
+        logger.debug("Capture Face Dialog: 'Cancel' button added.")
 
-        # QTimer to continuously update the video feed in the QLabel of the dialog
+        # QTimer to continuously update the video feed in the QLabel of the dialog (started when the camera is open)
         self.capture_dialog_timer = QtCore.QTimer(self)
         self.capture_dialog_timer.timeout.connect(self._update_capture_dialog_frame)
-        self.capture_dialog_timer.start(30) # Update every 30ms (approx 33 FPS) for smooth preview
-        print("DEBUG: Capture Face Dialog: QTimer started for frame updates.", flush=True)
+        # Preview frames are decoded into one reused array, which one reused QImage wraps (see _update_capture_dialog_frame)
+        self.capture_dialog_preview_frame = None
+        self.capture_dialog_preview_image = None # The array wrapped by capture_dialog_preview_qimage
+        self.capture_dialog_preview_qimage = None
 
         # Connect dialog's finished signal to cleanup function, ensuring camera is released regardless of how dialog closes
         self.camera_capture_dialog.finished.connect(self._release_capture_dialog_camera)
-        
-        # Show the dialog modally and wait for user interaction (accept or reject).
-        # This blocks the main GUI until the dialog is closed.
-        result = self.camera_capture_dialog.exec_()
-        print(f"DEBUG: Capture Face Dialog: Dialog closed with result {result}.", flush=True)
 
+    def _read_latest_capture_dialog_frame(self, out_frame=None):
+        """
+        Reads the newest frame from the capture dialog's camera, like `cap.read()`.
+        Frames already waiting in the driver's buffer are skipped with `grab()`, which does not decode them:
+        grabbing continues until a grab has to wait for the camera (>= 5 ms, so the frame is fresh),
+        and only that frame is decoded with `retrieve()` - into `out_frame` if given and of the frame's size.
+        """
+        cap = self.capture_dialog_camera_capture
+        grabbed = False
+        for _ in range(_CAPTURE_DIALOG_MAX_STALE_FRAMES + 1):
+            grab_start = time.perf_counter()
+            if not cap.grab():
+                break
+            grabbed = True
+            if time.perf_counter() - grab_start >= 0.005:
+                break # This grab waited for the camera: it holds a fresh frame
+        if not grabbed:
+            return False, None
+        return cap.retrieve(out_frame)
 
     def _update_capture_dialog_frame(self):
-        ret, frame = self.capture_dialog_camera_capture.read()
+        # Nothing to update while the preview cannot be seen (the next visible tick reads the newest frame)
+        if not self.capture_dialog_video_label.isVisible() or self.camera_capture_dialog.isMinimized():
+            return
+        ret, frame = self._read_latest_capture_dialog_frame(self.capture_dialog_preview_frame)
         if ret:
-            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
-            qt_image = QtGui.QImage(rgb_image.data, w, h, bytes_per_line, QtGui.QImage.Format_RGB888)
-
-            pixmap = QtGui.QPixmap.fromImage(qt_image).scaled(
-                self.capture_dialog_video_label.width(), self.capture_dialog_video_label.height(),
-                QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation
-            )
+            # The next frame is decoded into this same array again (a new one only if the frame size changes)
+            self.capture_dialog_preview_frame = frame
+            if _QIMAGE_FORMAT_BGR888 is not None:
+                image, image_format = frame, _QIMAGE_FORMAT_BGR888 # Qt reads OpenCV's BGR layout directly
+            else:
+                rgb_buffer = self.capture_dialog_preview_image if self.capture_dialog_preview_image is not frame else None
+                image, image_format = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, rgb_buffer), QtGui.QImage.Format_RGB888
+            if image is not self.capture_dialog_preview_image:
+                h, w = image.shape[:2]
+                # Wraps the array without copying, and keeps showing its current content as frames are decoded
+                # into it; QPixmap.fromImage below makes the only copy (the label keeps that pixmap)
+                self.capture_dialog_preview_qimage = QtGui.QImage(image.data, w, h, image.strides[0], image_format)
+                self.capture_dialog_preview_image = image # Keeps the wrapped array alive
+            h, w = image.shape[:2]
+
+            pixmap = QtGui.QPixmap.fromImage(self.capture_dialog_preview_qimage)
+            label_width, label_height = self.capture_dialog_video_label.width(), self.capture_dialog_video_label.height()
+            if w != label_width or h != label_height:
+                # Only when the camera ignored the requested 640x480; a preview does not need smooth scaling
+                pixmap = pixmap.scaled(label_width, label_height, QtCore.Qt.KeepAspectRatio, QtCore.Qt.FastTransformation)
             self.capture_dialog_video_label.setPixmap(pixmap)
         else:
             self.capture_dialog_timer.stop()
-            print("ERROR: Capture Face Dialog: Failed to read frame from camera. Stopping timer.", flush=True)
+            logger.error("Capture Face Dialog: Failed to read frame from camera. Stopping timer.")
             QtWidgets.QMessageBox.critical(self, "Camera Feed Error",
                                            "Failed to get frame from camera during capture. Closing capture window.",
                                            parent=self.camera_capture_dialog)
@@ -596,120 +850,139 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
 
 
     def _release_capture_dialog_camera(self):
-        print("DEBUG: Capture Face Dialog: Releasing camera resources.", flush=True)
+        logger.debug("Capture Face Dialog: Releasing camera resources.")
         if self.capture_dialog_timer and self.capture_dialog_timer.isActive():
             self.capture_dialog_timer.stop()
-            print("DEBUG: Capture Face Dialog: QTimer stopped.", flush=True)
+            logger.debug("Capture Face Dialog: QTimer stopped.")
         if self.capture_dialog_camera_capture and self.capture_dialog_camera_capture.isOpened():
             self.capture_dialog_camera_capture.release()
             self.capture_dialog_camera_capture = None
-            print("DEBUG: Capture Face Dialog: OpenCV camera released.", flush=True)
+            logger.debug("Capture Face Dialog: OpenCV camera released.")
             self.capture_dialog_video_label.setPixmap(QtGui.QPixmap())
             self.capture_dialog_video_label.setText("Camera Feed Stopped.")
-            print("DEBUG: Capture Face Dialog: Video label cleared and text updated.", flush=True)
+            logger.debug("Capture Face Dialog: Video label cleared and text updated.")
 
     def _process_captured_face_from_dialog(self):
-        print("DEBUG: FaceRecognitionApp: Processing captured face initiated.", flush=True)
-        ret, frame_to_save = self.capture_dialog_camera_capture.read()
+        logger.debug("FaceRecognitionApp: Processing captured face initiated.")
+        # Read into a new array (not the reused preview buffer) and kept in OpenCV's BGR order all the way to
+        # face_data_manager.save_new_face_image, whose cv2.imwrite expects BGR: no colour conversion on this path
+        ret, frame_to_save = self._read_latest_capture_dialog_frame()
 
         if not ret or frame_to_save is None or frame_to_save.size == 0:
             QtWidgets.QMessageBox.warning(self, "Capture Error",
                                            "Failed to capture a valid image. Please ensure camera is working and try again.",
                                            parent=self.camera_capture_dialog)
-            print("ERROR: Capture Face Dialog: Failed to capture valid image.", flush=True)
+            logger.error("Capture Face Dialog: Failed to capture valid image.")
             return
 
         if self.camera_capture_dialog:
             self.camera_capture_dialog.accept()
-            print("DEBUG: Capture Face Dialog: Camera dialog accepted and closed.", flush=True)
+            logger.debug("Capture Face Dialog: Camera dialog accepted and closed.")
 
         self._get_person_details_and_save(frame_to_save)
-        print("DEBUG: FaceRecognitionApp: _get_person_details_and_save called.", flush=True)
+        logger.debug("FaceRecognitionApp: _get_person_details_and_save called.")
 
 
     def _get_person_details_and_save(self, frame_to_save):
-        print("DEBUG: FaceRecognitionApp: Getting person details for saving.", flush=True)
+        logger.debug("FaceRecognitionApp: Getting person details for saving.")
         person_name, ok = QtWidgets.QInputDialog.getText(self, "Input Name",
                                                         "Enter person's name (e.g., 'John Doe'):",
                                                         QtWidgets.QLineEdit.Normal, "")
         if not ok or not person_name:
             QtWidgets.QMessageBox.warning(self, "Input Cancelled", "Name is required for registration. Face not saved.")
-            print("DEBUG: Save Face: Name input cancelled or empty.", flush=True)
+            logger.debug("Save Face: Name input cancelled or empty.")
             return
         person_name = person_name.strip()
-        print(f"DEBUG: Save Face: Person name entered: '{person_name}'.", flush=True)
+        logger.debug("Save Face: Person name entered: '%s'.", person_name)
 
         gender, ok = QtWidgets.QInputDialog.getItem(self, "Input Gender", "Select gender:", ["male", "female", "other"], 0, False)
         if not ok or not gender:
             QtWidgets.QMessageBox.warning(self, "Input Cancelled", "Gender selection is required. Face not saved.")
-            print("DEBUG: Save Face: Gender input cancelled or empty.", flush=True)
+            logger.debug("Save Face: Gender input cancelled or empty.")
             return
         gender = gender.lower()
-        print(f"DEBUG: Save Face: Gender selected: '{gender}'.", flush=True)
+        logger.debug("Save Face: Gender selected: '%s'.", gender)
 
         try:
             image_path = face_data_manager.save_new_face_image(frame_to_save, person_name, gender)
             QtWidgets.QMessageBox.information(self, "Success", f"Face captured and saved to:\n{image_path}")
-            print(f"DEBUG: Save Face: Image successfully saved to {image_path}.", flush=True)
+            logger.debug("Save Face: Image successfully saved to %s.", image_path)
 
             self.run_manual_update_encodings()
-            print("DEBUG: Save Face: Triggered manual encoding update after save.", flush=True)
+            logger.debug("Save Face: Triggered manual encoding update after save.")
 
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Save Error", f"Failed to save image or trigger encoding update: {e}")
-            print(f"ERROR: Save Face: Failed to save image or trigger encoding update: {e}", flush=True)
+            logger.error("Save Face: Failed to save image or trigger encoding update: %s", e)
 
 
     def delete_face(self):
-        print("DEBUG: FaceRecognitionApp: Attempting to delete face.", flush=True)
+        logger.debug("FaceRecognitionApp: Attempting to delete face.")
         if self.delete_person_thread and self.delete_person_thread.isRunning():
-            TemporaryMessageBox("Process Running", "Deletion process is already in progress. Please wait.", parent=self)
-            print("DEBUG: Delete Person: Already running, not starting new.", flush=True)
+            TemporaryMessageBox.show_message("Process Running", "Deletion process is already in progress. Please wait.", parent=self)
+            logger.debug("Delete Person: Already running, not starting new.")
             return
 
         name_to_delete, ok = QtWidgets.QInputDialog.getText(self, "Delete Person",
                                                             "Enter person's full name to delete (e.g., 'John_Doe__male' or just 'John Doe'):")
         if not ok or not name_to_delete:
-            print("DEBUG: Delete Person: Name input cancelled or empty.", flush=True)
+            logger.debug("Delete Person: Name input cancelled or empty.")
             return
         name_to_delete = name_to_delete.strip()
-        print(f"DEBUG: Delete Person: Name entered for deletion: '{name_to_delete}'.", flush=True)
+        logger.debug("Delete Person: Name entered for deletion: '%s'.", name_to_delete)
 
         confirm = QtWidgets.QMessageBox.question(self, "Confirm Deletion",
                                                  f"Are you sure you want to delete all data for '{name_to_delete}'? This action cannot be undone.",
                                                  QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
                                                  QtWidgets.QMessageBox.No)
         if confirm == QtWidgets.QMessageBox.No:
-            TemporaryMessageBox("Deletion Cancelled", f"Deletion of '{name_to_delete}' cancelled.", parent=self)
-            print("DEBUG: Delete Person: Deletion confirmed as NO.", flush=True)
+            TemporaryMessageBox.show_message("Deletion Cancelled", f"Deletion of '{name_to_delete}' cancelled.", parent=self)
+            logger.debug("Delete Person: Deletion confirmed as NO.")
             return
-        print("DEBUG: Delete Person: Deletion confirmed as YES. Starting deletion thread.", flush=True)
+        logger.debug("Delete Person: Deletion confirmed as YES. Starting deletion thread.")
 
         self.delete_person_thread = DeletePersonThread(name_to_delete, self)
         self.delete_person_thread.finished_signal.connect(self._handle_delete_finished)
         self.delete_person_thread.error_signal.connect(self._handle_delete_error)
         self.delete_person_thread.start()
-        TemporaryMessageBox("Deleting Person", f"Attempting to delete '{name_to_delete}' in the background. Please wait.", parent=self)
+        TemporaryMessageBox.show_message("Deleting Person", f"Attempting to delete '{name_to_delete}' in the background. Please wait.", parent=self)
 
     def _handle_delete_finished(self, message):
-        print(f"DEBUG: Delete Person: Finished with message: {message}", flush=True)
-        TemporaryMessageBox("Delete Registration", message, parent=self)
+        logger.debug("Delete Person: Finished with message: %s", message)
+        TemporaryMessageBox.show_message("Delete Registration", message, parent=self)
         self.delete_person_thread = None
 
     def _handle_delete_error(self, message):
-        print(f"ERROR: Delete Person: Failed with message: {message}", flush=True)
-        TemporaryMessageBox("Delete Registration Error", message, duration_ms=7000, parent=self)
+        logger.error("Delete Person: Failed with message: %s", message)
+        TemporaryMessageBox.show_message("Delete Registration Error", message, duration_ms=7000, parent=self)
         self.delete_person_thread = None
 
 
     # --- MODIFIED/NEW Log Viewing Functions ---
 
-    def _display_log_content_dialog(self, title, content_lines, show_history_button=True):
+    def _load_log_in_background(self, on_loaded, context, load_function, *load_args):
+        """
+        Runs a logging_manager read (`load_function(*load_args)`, returning (headers, rows)) in a LogLoadThread,
+        so reading and parsing a large log file does not freeze the window. `on_loaded(context, headers, rows)`
+        is then called in the GUI thread.
         """
-        Helper method to display log content in a common QDialog using a QTableWidget.
+        if self.log_load_thread and self.log_load_thread.isRunning():
+            TemporaryMessageBox.show_message("Log", "The log is still being loaded. Please wait.", parent=self)
+            logger.debug("Log: Load already in progress, not starting another.")
+            return
+        self.log_load_thread = LogLoadThread(load_function, load_args, context, self)
+        self.log_load_thread.loaded_signal.connect(on_loaded)
+        self.log_load_thread.finished.connect(QtWidgets.QApplication.restoreOverrideCursor)
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor) # Busy cursor until the log is loaded
+        self.log_load_thread.start()
+
+    def _display_log_content_dialog(self, title, headers, rows, show_history_button=True):
+        """
+        Helper method to display log content in a common QDialog using a QTableView over a LogTableModel.
         This allows for columnar display and embedding interactive buttons (e.g., View Image, View History).
+        `headers` and `rows` are as returned by `logging_manager.read_log_rows()` (rows may be a filtered subset).
         """
-        print(f"DEBUG: Log Display Dialog: Preparing to display '{title}' with {len(content_lines)} lines.", flush=True)
+        logger.debug("Log Display Dialog: Preparing to display '%s' with %s rows.", title, len(rows))
 
         result_dialog = QtWidgets.QDialog(self)
         result_dialog.setWindowTitle(title)
@@ -717,48 +990,33 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         result_dialog.setModal(True)
 
         # Center the dialog on the parent window
-        parent_rect = self.geometry()
-        x = parent_rect.x() + (parent_rect.width() - result_dialog.width()) // 2
-        y = parent_rect.y() + (parent_rect.height() - result_dialog.height()) // 2
-        result_dialog.move(x, y)
-        print(f"DEBUG: Log Display Dialog: Centered at ({x},{y}).", flush=True)
+        position = _center_widget(result_dialog, self.geometry())
+        logger.debug("Log Display Dialog: Centered at (%s,%s).", position.x(), position.y())
 
         dialog_layout = QtWidgets.QVBoxLayout(result_dialog)
         dialog_layout.addWidget(QtWidgets.QLabel(title + ":",
                                                   font=QtGui.QFont("Helvetica", 12, QtGui.QFont.Bold),
                                                   alignment=QtCore.Qt.AlignCenter))
 
-        # --- Use QTableWidget instead of QTextEdit ---
-        table_widget = QtWidgets.QTableWidget()
-        table_widget.setEditTriggers(QtWidgets.QTableWidget.NoEditTriggers) # Make table read-only
-        table_widget.setSelectionBehavior(QtWidgets.QTableWidget.SelectRows) # Select entire rows
-        table_widget.setWordWrap(False) # Disable word wrap for cells
-        table_widget.horizontalHeader().setStretchLastSection(False) # Don't stretch last section by default
-        table_widget.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents) # Adjust column width to content
-
-        # Read the header from the content_lines (first non-empty line)
-        header_line = ""
-        data_start_row = 0
-        if len(content_lines) >= 2: # Ensure there's at least header and separator
-            header_line = content_lines[0].strip()
-            data_start_row = 2 # Header is line 0, separator is line 1, data starts at line 2
-
-        if not header_line:
-            print("WARNING: Log Display Dialog: No header line found in log content. Using default headers.", flush=True)
+        # --- QTableView over the parsed rows: only the visible cells are ever produced (see LogTableModel) ---
+        table_view = QtWidgets.QTableView()
+        table_view.setEditTriggers(QtWidgets.QTableView.NoEditTriggers) # Make table read-only
+        table_view.setSelectionBehavior(QtWidgets.QTableView.SelectRows) # Select entire rows
+        table_view.setWordWrap(False) # Disable word wrap for cells
+        table_view.horizontalHeader().setStretchLastSection(False) # Don't stretch last section by default
+
+        if headers is None:
+            logger.warning("Log Display Dialog: No header line found in log content. Using default headers.")
             # Default headers if header is missing (must match expected order)
             headers_from_file = ["NAME", "GENDER", "DAY", "DATE", "TIME", "IMAGE_LINK"]
         else:
-            # Parse headers from the first line, stripping whitespace
-            headers_from_file = [h.strip() for h in header_line.split('|')]
+            headers_from_file = headers
         
         # Conditionally add the HISTORY column for display
         display_headers = headers_from_file
         if show_history_button:
           display_headers = headers_from_file + ["HISTORY"]
 
-        table_widget.setColumnCount(len(display_headers))
-        table_widget.setHorizontalHeaderLabels(display_headers)
-
         # Map header names to their column indices for easier access
         col_map = {header: idx for idx, header in enumerate(headers_from_file)}
         
@@ -773,77 +1031,44 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
           HISTORY_COL_IDX = len(display_headers) - 1
 
 
-        # Populate table data from log file lines
-        table_data_lines = content_lines[data_start_row:]
-        table_widget.setRowCount(len(table_data_lines))
-
-        for row_idx, line in enumerate(table_data_lines):
-            # Split line by '|' and strip whitespace from each part
-            parts = [p.strip() for p in line.split('|')]
-            
-            # Ensure the line has enough parts for the expected columns from the file
-            # If a line is malformed, log a warning and skip/remove the row.
-            if len(parts) < len(headers_from_file):
-                print(f"WARNING: Log Display Dialog: Skipping malformed log line (too few columns): '{line.strip()}'", flush=True)
-                # table_widget.removeRow(row_idx) # This would shift rows and might cause issues, better to just set empty items
-                for col in range(table_widget.columnCount()): # Fill remaining with empty items
-                    table_widget.setItem(row_idx, col, QtWidgets.QTableWidgetItem(""))
-                continue
-
-            # Populate standard data columns
-            for col_file_idx, data_part in enumerate(parts):
-                if col_file_idx < len(headers_from_file): # Only process up to defined headers
-                    item = QtWidgets.QTableWidgetItem(data_part)
-                    table_widget.setItem(row_idx, col_file_idx, item)
-
-            # --- Handle IMAGE_LINK column: Embed a button if it's a link ---
-            image_link_data = parts[IMAGE_LINK_COL_IDX] if IMAGE_LINK_COL_IDX < len(parts) else "N/A"
-            
-            if image_link_data and image_link_data != "N/A":
-                btn_view_image = QtWidgets.QPushButton("View Image")
-                btn_view_image.setStyleSheet("background-color: #007bff; color: white; border-radius: 3px; padding: 2px 5px;")
-                # Connect lambda to pass the specific image_link for this row. `checked` is an unused arg from clicked signal.
-                btn_view_image.clicked.connect(lambda checked, path=image_link_data: self._open_image_file(path))
-                table_widget.setCellWidget(row_idx, IMAGE_LINK_COL_IDX, btn_view_image)
-                # Set tooltip to show full path on hover
-                item = QtWidgets.QTableWidgetItem() # Create an empty item to hold the tooltip
-                item.setToolTip(image_link_data)
-                table_widget.setItem(row_idx, IMAGE_LINK_COL_IDX, item)
-            else:
-                # For "N/A" entries, just set the text item
-                item = QtWidgets.QTableWidgetItem("N/A")
-                table_widget.setItem(row_idx, IMAGE_LINK_COL_IDX, item)
-
-            # --- Handle HISTORY column: Embed a button ---
-            if show_history_button:
-              btn_view_history = QtWidgets.QPushButton("View History")
-              btn_view_history.setStyleSheet("background-color: #28a745; color: white; border-radius: 3px; padding: 2px 5px;")
-              
-              # Get the person's name from the current row for the history search
-              person_name_for_history = parts[NAME_COL_IDX].strip()
-              # Connect lambda to pass the person's name for direct search.
-              btn_view_history.clicked.connect(lambda checked, name=person_name_for_history: self._search_log_by_name_direct(name))
-              table_widget.setCellWidget(row_idx, HISTORY_COL_IDX, btn_view_history)
-              item = QtWidgets.QTableWidgetItem() # Create an empty item to hold the history button
-              table_widget.setItem(row_idx, HISTORY_COL_IDX, item) # QTableWidget needs an item even if it has a widget
-
-
-        # Adjust column widths to fit content, then stretch the last column (HISTORY)
-        table_widget.resizeColumnsToContents()
+        # The rows are not copied: the model reads the cells from them when they are painted, so opening the
+        # dialog costs no per-row Python work beyond this one C-level length check (malformed lines are rare)
+        if rows and min(map(len, rows)) < len(headers_from_file):
+            for parts in rows:
+                if len(parts) < len(headers_from_file):
+                    logger.warning("Log Display Dialog: Malformed log line (too few columns) shown empty: '%s'", " | ".join(parts))
+        table_model = LogTableModel(headers_from_file, display_headers, rows, NAME_COL_IDX, IMAGE_LINK_COL_IDX,
+                                    HISTORY_COL_IDX, table_view)
+        table_view.setModel(table_model)
+
+        # The 'View Image' / 'View History' cells are painted as buttons; a click passes the cell's
+        # Qt.UserRole data (image path / person's name) to the connected method.
+        image_button_delegate = LogButtonDelegate(_VIEW_IMAGE_BUTTON_COLOR, table_view)
+        image_button_delegate.clicked.connect(self._open_image_file)
+        table_view.setItemDelegateForColumn(IMAGE_LINK_COL_IDX, image_button_delegate)
+        if show_history_button:
+            history_button_delegate = LogButtonDelegate(_VIEW_HISTORY_BUTTON_COLOR, table_view)
+            history_button_delegate.clicked.connect(self._search_log_by_name_direct)
+            table_view.setItemDelegateForColumn(HISTORY_COL_IDX, history_button_delegate)
+
+        # Fit the column widths to their contents once (the view samples the rows rather than measuring every
+        # cell, and unlike ResizeToContents mode does not measure again while scrolling), then stretch HISTORY
+        table_view.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Interactive)
+        table_view.resizeColumnsToContents()
         if show_history_button and HISTORY_COL_IDX != -1:
-            table_widget.horizontalHeader().setSectionResizeMode(HISTORY_COL_IDX, QtWidgets.QHeaderView.Stretch)
-        
-        dialog_layout.addWidget(table_widget)
-        print("DEBUG: Log Display Dialog: QTableWidget populated and configured.", flush=True)
+            table_view.horizontalHeader().setSectionResizeMode(HISTORY_COL_IDX, QtWidgets.QHeaderView.Stretch)
+
+        dialog_layout.addWidget(table_view)
+        logger.debug("Log Display Dialog: QTableView model set and configured.")
 
         close_button = QtWidgets.QPushButton("Close")
         close_button.setStyleSheet("background-color: #6c757d; color: white; padding: 8px;")
         close_button.clicked.connect(result_dialog.accept)
         dialog_layout.addWidget(close_button, alignment=QtCore.Qt.AlignCenter)
-        print("DEBUG: Log Display Dialog: 'Close' button added.", flush=True)
+        logger.debug("Log Display Dialog: 'Close' button added.")
 
         result_dialog.exec_()
-        print(f"DEBUG: Log Display Dialog: Dialog '{title}' closed.", flush=True)
+        logger.debug("Log Display Dialog: Dialog '%s' closed.", title)
 
 
     # NEW helper method: To open image files (used by IMAGE_LINK buttons)
@@ -852,7 +1077,7 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         Opens the specified image file using the system's default image viewer.
         Handles both relative and absolute paths for cross-platform compatibility.
         """
-        print(f"DEBUG: GUI: Attempting to open image file: {image_path}", flush=True)
+        logger.debug("GUI: Attempting to open image file: %s", image_path)
         # Construct absolute path if image_path is relative
         if not os.path.isabs(image_path):
             full_image_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), image_path)
@@ -862,7 +1087,7 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
 
         if not os.path.exists(full_image_path):
             QtWidgets.QMessageBox.warning(self, "Image Not Found", f"Image file not found:\n{full_image_path}")
-            print(f"ERROR: GUI: Image file not found: {full_image_path}", flush=True)
+            logger.error("GUI: Image file not found: %s", full_image_path)
             return
 
         try:
@@ -873,10 +1098,10 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
                 subprocess.run(["open", full_image_path]) # macOS specific command
             else: # Linux and other POSIX-like systems
                 subprocess.run(["xdg-open", full_image_path]) # General Linux command
-            print(f"DEBUG: GUI: Successfully initiated opening of {full_image_path}", flush=True)
+            logger.debug("GUI: Successfully initiated opening of %s", full_image_path)
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error Opening Image", f"Could not open image:\n{full_image_path}\nError: {e}")
-            print(f"ERROR: GUI: Failed to open image {full_image_path}: {e}", flush=True)
+            logger.error("GUI: Failed to open image %s: %s", full_image_path, e)
 
     # NEW helper method: Direct search for history button (to avoid re-prompting)
     def _search_log_by_name_direct(self, person_name):
@@ -885,48 +1110,26 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         This method is typically called when a 'View History' button in the log table is clicked.
         It then displays the filtered log entries in a new dialog.
         """
-        print(f"DEBUG: GUI: Direct log search initiated for: '{person_name}'.", flush=True)
-        # Read all log lines from the logging_manager module
-        all_lines = logging_manager.read_log_file()
-        if not all_lines:
+        logger.debug("GUI: Direct log search initiated for: '%s'.", person_name)
+        # The person's rows (case-insensitive exact NAME match) from logging_manager's index of the parsed log
+        self._load_log_in_background(self._show_person_history, person_name,
+                                     logging_manager.find_log_rows_by_name, person_name)
+
+    def _show_person_history(self, person_name, headers, found_rows):
+        """Displays the rows found by `_search_log_by_name_direct`, once they have been loaded."""
+        if headers is None and not found_rows:
             QtWidgets.QMessageBox.warning(self, "No Log Data", f"Log file '{config.LOG_FILE_PATH}' is empty or not found for history.")
-            print(f"ERROR: GUI: Log file '{config.LOG_FILE_PATH}' is empty or not found for history.", flush=True)
+            logger.error("GUI: Log file '%s' is empty or not found for history.", config.LOG_FILE_PATH)
             return
 
-        filtered_content = []
-        data_lines_start_index = 0
+        logger.debug("Search Log by Name (direct): Found %s matching entries.", len(found_rows))
 
-        # Check for and include the header and separator lines
-        if len(all_lines) >= 2 and all_lines[0].strip().startswith('NAME') and 'GENDER' in all_lines[0]:
-            filtered_content.append(all_lines[0]) # Header line
-            filtered_content.append(all_lines[1]) # Separator line
-            data_lines_start_index = 2
-
-        found_data_lines = []
-        print(f"DEBUG: Search Log by Name (direct): Starting to iterate from line {data_lines_start_index} of {len(all_lines)} lines.", flush=True)
-        
-        # Filter log lines by the provided person_name (case-insensitive and exact match)
-        for line in all_lines[data_lines_start_index:]:
-            if not line.strip():
-                continue # Skip blank lines
-                
-            parts = [part.strip() for part in line.split('|')]
-            if len(parts) > 0 and parts[0].strip().lower() == person_name.lower():
-                found_data_lines.append(line)
-            else:
-                if len(parts) > 0:
-                    print(f"DEBUG: Search Log by Name (direct): Mismatch. '{parts[0].strip().lower()}' does not equal '{person_name.lower()}'. Skipping line.", flush=True)
-        
-        print(f"DEBUG: Search Log by Name (direct): Found {len(found_data_lines)} matching data lines.", flush=True)
-
-
-        if found_data_lines:
-            final_display_lines = filtered_content + found_data_lines
+        if found_rows:
             # Reuse the common display dialog to show the filtered history
-            self._display_log_content_dialog(f"History for {person_name.capitalize()}", final_display_lines, show_history_button=False)
+            self._display_log_content_dialog(f"History for {person_name.capitalize()}", headers, found_rows, show_history_button=False)
         else:
             QtWidgets.QMessageBox.information(self, "No History", f"No log entries found for '{person_name}'.")
-            print(f"DEBUG: GUI: No log entries found for '{person_name}'.", flush=True)
+            logger.debug("GUI: No log entries found for '%s'.", person_name)
 
     # --- Renamed/Re-purposed Log Display Methods ---
 
@@ -936,18 +1139,21 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         Displays the entire content of the log file in a QTableWidget dialog.
         This is connected to the "View Full Log" menu action.
         """
-        print("DEBUG: FaceRecognitionApp: Attempting to view full log.", flush=True)
+        logger.debug("FaceRecognitionApp: Attempting to view full log.")
+
+        # Parsed log rows from the logging_manager module (cached there while the file is unchanged)
+        self._load_log_in_background(self._show_full_log, None, logging_manager.read_log_rows)
 
-        # Read all log lines from the logging_manager module
-        all_lines = logging_manager.read_log_file()
-        if not all_lines:
+    def _show_full_log(self, _, headers, rows):
+        """Displays the rows loaded by `_view_full_log`."""
+        if headers is None and not rows:
             QtWidgets.QMessageBox.warning(self, "No Log Data", f"Log file '{config.LOG_FILE_PATH}' is empty or not found.")
-            print(f"ERROR: View Full Log: Log file '{config.LOG_FILE_PATH}' is empty or not found.", flush=True)
+            logger.error("View Full Log: Log file '%s' is empty or not found.", config.LOG_FILE_PATH)
             return
-        print(f"DEBUG: View Full Log: Read {len(all_lines)} lines from log file.", flush=True)
+        logger.debug("View Full Log: Read %s entries from log file.", len(rows))
 
         # Display all content directly using the QTableWidget helper
-        self._display_log_content_dialog("Full System Log", all_lines, show_history_button=True)
+        self._display_log_content_dialog("Full System Log", headers, rows, show_history_button=True)
 
 
     # This method is the new functionality for "Search Log by Name" menu item.
@@ -957,72 +1163,55 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         related to that name in a QTableWidget dialog.
         This is connected to the "Search Log by Name" menu action.
         """
-        print("DEBUG: FaceRecognitionApp: Attempting to search log by name (from menu).", flush=True)
+        logger.debug("FaceRecognitionApp: Attempting to search log by name (from menu).")
         name_to_search, ok = QtWidgets.QInputDialog.getText(self, "Search Log", "Enter name to search in log:")
         if not ok or not name_to_search:
-            print("DEBUG: Search Log by Name (menu): Name input cancelled or empty.", flush=True)
+            logger.debug("Search Log by Name (menu): Name input cancelled or empty.")
             return
         name_to_search = name_to_search.strip().lower()  # Convert to lowercase for case-insensitive search
-        print(f"DEBUG: Search Log by Name (menu): Name to search: '{name_to_search}'.", flush=True)
+        logger.debug("Search Log by Name (menu): Name to search: '%s'.", name_to_search)
 
-        # Read all log lines from the logging_manager module
-        all_lines = logging_manager.read_log_file()
-        if not all_lines:
+        # Log rows where the search name matches exactly in the NAME column, from logging_manager's name index
+        self._load_log_in_background(self._show_log_search_results, name_to_search,
+                                     logging_manager.find_log_rows_by_name, name_to_search)
+
+    def _show_log_search_results(self, name_to_search, headers, found_rows):
+        """Displays the rows found by `_search_log_by_name`, once they have been loaded."""
+        if headers is None and not found_rows:
             QtWidgets.QMessageBox.warning(self, "No Log Data", f"Log file '{config.LOG_FILE_PATH}' is empty or not found.")
-            print(f"ERROR: Search Log by Name (menu): Log file '{config.LOG_FILE_PATH}' is empty or not found.", flush=True)
+            logger.error("Search Log by Name (menu): Log file '%s' is empty or not found.", config.LOG_FILE_PATH)
             return
-        print(f"DEBUG: Search Log by Name (menu): Read {len(all_lines)} lines from log file.", flush=True)
-
-        filtered_content = []
-        data_lines_start_index = 0
-
-        # Check for and include the header and separator lines
-        if len(all_lines) >= 2 and all_lines[0].strip().startswith('NAME') and 'GENDER' in all_lines[0]:
-            filtered_content.append(all_lines[0])  # Header line
-            filtered_content.append(all_lines[1])  # Separator line
-            data_lines_start_index = 2
-
-        # Filter log lines where the search name matches exactly in the NAME column
-        found_data_lines = []
-        print(f"DEBUG: Search Log by Name (menu): Starting to iterate from line {data_lines_start_index} of {len(all_lines)} lines.", flush=True)
-        for line in all_lines[data_lines_start_index:]:
-            if not line.strip():
-                continue  # Skip blank lines
-                
-            parts = [part.strip() for part in line.split('|')]
-            if len(parts) > 0:  # Make sure we have at least a name column
-                # Compare the name part (first column) after stripping and lowercasing
-                if name_to_search == parts[0].strip().lower():
-                    found_data_lines.append(line)
-
-        print(f"DEBUG: Search Log by Name (menu): Found {len(found_data_lines)} matching data lines.", flush=True)
-
-        if found_data_lines:
-            final_display_lines = filtered_content + found_data_lines
-            self._display_log_content_dialog(f"Search Results for {name_to_search.capitalize()}", final_display_lines, show_history_button=True)
+        logger.debug("Search Log by Name (menu): Found %s matching entries.", len(found_rows))
+
+        if found_rows:
+            self._display_log_content_dialog(f"Search Results for {name_to_search.capitalize()}", headers, found_rows, show_history_button=True)
         else:
             QtWidgets.QMessageBox.information(self, "No Entries", f"No logs found for '{name_to_search}'.")
-            print(f"DEBUG: Search Log by Name (menu): No entries found for '{name_to_search}'.", flush=True)
+            logger.debug("Search Log by Name (menu): No entries found for '%s'.", name_to_search)
 
     def download_log(self):
-        print("DEBUG: FaceRecognitionApp: Attempting to download log.", flush=True)
+        logger.debug("FaceRecognitionApp: Attempting to download log.")
         if not os.path.exists(config.LOG_FILE_PATH):
             QtWidgets.QMessageBox.warning(self, "No File", f"No log file '{config.LOG_FILE_PATH}' found.")
-            print(f"ERROR: Download Log: Log file '{config.LOG_FILE_PATH}' not found.", flush=True)
+            logger.error("Download Log: Log file '%s' not found.", config.LOG_FILE_PATH)
             return
 
-        filter_dialog = FilterDialog(self)
-        print("DEBUG: Download Log: FilterDialog opened.", flush=True)
+        if self.filter_dialog is None:
+            self.filter_dialog = FilterDialog(self)
+        else:
+            self.filter_dialog.reset() # Reused: back to the defaults it was created with
+        filter_dialog = self.filter_dialog
+        logger.debug("Download Log: FilterDialog opened.")
         if filter_dialog.exec_() == QtWidgets.QDialog.Accepted:
             choice, from_date_str, to_date_str = filter_dialog.get_results()
-            print(f"DEBUG: Download Log: FilterDialog accepted. Choice: {choice}, From: {from_date_str}, To: {to_date_str}.", flush=True)
+            logger.debug("Download Log: FilterDialog accepted. Choice: %s, From: %s, To: %s.", choice, from_date_str, to_date_str)
             self._process_and_save_log(choice, from_date_str, to_date_str)
         else:
-            TemporaryMessageBox("Cancelled", "Log download cancelled.", parent=self)
-            print("DEBUG: Download Log: FilterDialog cancelled.", flush=True)
+            TemporaryMessageBox.show_message("Cancelled", "Log download cancelled.", parent=self)
+            logger.debug("Download Log: FilterDialog cancelled.")
 
     def _process_and_save_log(self, choice, from_date_str, to_date_str):
-        print(f"DEBUG: Download Log: Processing and saving log with choice '{choice}'.", flush=True)
+        logger.debug("Download Log: Processing and saving log with choice '%s'.", choice)
         current_time_exact = datetime.now()
         from_date_filter = None
         to_date_filter = None
@@ -1033,77 +1222,53 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
                 to_date_filter = datetime.strptime(to_date_str, "%Y-%m-%d").replace(hour=23, minute=59, second=59, microsecond=999999)
                 if from_date_filter > to_date_filter:
                     QtWidgets.QMessageBox.critical(self, "Error", "From Date must be before or same as To Date.")
-                    print(f"ERROR: Download Log: Invalid date range: From ({from_date_filter}) > To ({to_date_filter}).", flush=True)
+                    logger.error("Download Log: Invalid date range: From (%s) > To (%s).", from_date_filter, to_date_filter)
                     return
-                print(f"DEBUG: Download Log: Date range filter set: {from_date_filter} to {to_date_filter}.", flush=True)
+                logger.debug("Download Log: Date range filter set: %s to %s.", from_date_filter, to_date_filter)
             except ValueError:
                 QtWidgets.QMessageBox.critical(self, "Error", "Invalid date format. Please use YYYY-MM-DD.")
-                print(f"ERROR: Download Log: Invalid date format for '{from_date_str}' or '{to_date_str}'.", flush=True)
+                logger.error("Download Log: Invalid date format for '%s' or '%s'.", from_date_str, to_date_str)
                 return
         elif choice == '2':
             to_date_filter = current_time_exact.replace(hour=23, minute=59, second=59, microsecond=999999)
             from_date_filter = (current_time_exact - timedelta(days=6)).replace(hour=0, minute=0, second=0, microsecond=0)
-            print(f"DEBUG: Download Log: Filter set to last 7 days: {from_date_filter} to {to_date_filter}.", flush=True)
+            logger.debug("Download Log: Filter set to last 7 days: %s to %s.", from_date_filter, to_date_filter)
         elif choice == '3':
             to_date_filter = current_time_exact.replace(hour=23, minute=59, second=59, microsecond=999999)
             from_date_filter = (current_time_exact - timedelta(days=29)).replace(hour=0, minute=0, second=0, microsecond=0)
-            print(f"DEBUG: Download Log: Filter set to last 30 days: {from_date_filter} to {to_date_filter}.", flush=True)
+            logger.debug("Download Log: Filter set to last 30 days: %s to %s.", from_date_filter, to_date_filter)
         elif choice == '4':
             to_date_filter = current_time_exact.replace(hour=23, minute=59, second=59, microsecond=999999)
             from_date_filter = (current_time_exact - timedelta(days=364)).replace(hour=0, minute=0, second=0, microsecond=0)
-            print(f"DEBUG: Download Log: Filter set to last 365 days: {from_date_filter} to {to_date_filter}.", flush=True)
+            logger.debug("Download Log: Filter set to last 365 days: %s to %s.", from_date_filter, to_date_filter)
         elif choice == '6':
             to_date_filter = current_time_exact
             from_date_filter = current_time_exact - timedelta(hours=24)
-            print(f"DEBUG: Download Log: Filter set to last 24 hours: {from_date_filter} to {to_date_filter}.", flush=True)
+            logger.debug("Download Log: Filter set to last 24 hours: %s to %s.", from_date_filter, to_date_filter)
         elif choice == '5':
-            print("DEBUG: Download Log: Filter set to all records.", flush=True)
+            logger.debug("Download Log: Filter set to all records.")
 
-        filtered_lines = []
         try:
-            all_lines = logging_manager.read_log_file()
-            if not all_lines:
+            # Entries within the date range (all for choice 5), selected by logging_manager on the parsed
+            # log's cached timestamps (binary search or one vectorized comparison) rather than a strptime() per line
+            header_lines, data_lines, skipped_count = logging_manager.filter_log_lines_by_time(from_date_filter, to_date_filter)
+            if not header_lines and not data_lines and not skipped_count:
                 QtWidgets.QMessageBox.information(self, "No Log Data", "The log file is empty or could not be read.")
-                print("ERROR: Download Log: No lines read from log file.", flush=True)
+                logger.error("Download Log: No lines read from log file.")
                 return
-
-            data_lines_start_index = 0
-            if len(all_lines) >= 2 and all_lines[0].strip().startswith('NAME') and 'GENDER' in all_lines[0]:
-                filtered_lines.append(all_lines[0])
-                filtered_lines.append(all_lines[1])
-                data_lines_start_index = 2
-                print("DEBUG: Download Log: Log header and separator included.", flush=True)
-
-            for line in all_lines[data_lines_start_index:]:
-                parts = line.split('|')
-                # Check for minimum number of parts to account for new IMAGE_LINK column
-                if len(parts) >= 6: # Now expect at least 6 parts: NAME | GENDER | DAY | DATE | TIME | IMAGE_LINK
-                    date_part = parts[3].strip()
-                    time_part = parts[4].strip()
-                    try:
-                        if not date_part or not time_part:
-                            print(f"WARNING: Download Log: Skipping malformed line (empty date/time): {line.strip()}", flush=True)
-                            continue
-                        log_datetime = datetime.strptime(f"{date_part} {time_part}", "%Y-%m-%d %H:%M:%S")
-                    except ValueError:
-                        print(f"WARNING: Download Log: Skipping line with invalid date/time format: {line.strip()}", flush=True)
-                        continue
-
-                    if from_date_filter is None and to_date_filter is None:
-                        filtered_lines.append(line)
-                    elif from_date_filter <= log_datetime <= to_date_filter:
-                        filtered_lines.append(line)
-                else:
-                    print(f"WARNING: Download Log: Skipping malformed line (too few parts): {line.strip()}", flush=True)
+            if skipped_count:
+                logger.warning("Download Log: Skipped %s malformed lines (missing or invalid date/time).", skipped_count)
+            filtered_lines = header_lines + data_lines
+            logger.debug("Download Log: Filtered down to %s lines (including header).", len(filtered_lines))
 
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", f"Failed to read or process log file: {e}")
-            print(f"ERROR: Download Log: Failed to read or process log file: {e}", flush=True)
+            logger.error("Download Log: Failed to read or process log file: %s", e)
             return
 
         if not filtered_lines or (len(filtered_lines) <= 2 and from_date_filter is not None):
             QtWidgets.QMessageBox.information(self, "No Data", "No logs found for the selected date range.")
-            print("DEBUG: Download Log: No data found for selected range.", flush=True)
+            logger.debug("Download Log: No data found for selected range.")
             return
 
         default_filename = "filtered_log_" + datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + ".txt"
@@ -1113,78 +1278,146 @@ class FaceRecognitionApp(QtWidgets.QMainWindow):
         if save_path:
             try:
                 with open(save_path, "w", encoding='utf-8') as f_out:
-                    f_out.writelines(filtered_lines)
-                TemporaryMessageBox("Saved", f"Filtered log saved to:\n{save_path}", parent=self)
-                print(f"DEBUG: Download Log: Filtered log saved to '{save_path}'.", flush=True)
+                    # Joined first: one encode and one large write instead of one per line
+                    f_out.write("".join(filtered_lines))
+                TemporaryMessageBox.show_message("Saved", f"Filtered log saved to:\n{save_path}", parent=self)
+                logger.debug("Download Log: Filtered log saved to '%s'.", save_path)
             except Exception as e:
                 QtWidgets.QMessageBox.critical(self, "Error", f"Failed to save filtered log file: {e}")
-                print(f"ERROR: Download Log: Failed to save filtered log file: {e}", flush=True)
+                logger.error("Download Log: Failed to save filtered log file: %s", e)
 
     def closeEvent(self, event):
-        print("DEBUG: FaceRecognitionApp: closeEvent triggered. Terminating child processes.", flush=True)
+        logger.debug("FaceRecognitionApp: closeEvent triggered. Terminating child processes.")
+        if self.close_in_progress:
+            # Another close request while the one below waits for the background threads
+            event.ignore()
+            return
+
+        # Signal every background thread first, so that they all wind down at the same time
         if self.recognition_thread and self.recognition_thread.isRunning():
-            print("DEBUG: closeEvent: Signaling recognition QThread to stop...", flush=True)
+            logger.debug("closeEvent: Signaling recognition QThread to stop...")
+            # The cleanup of _handle_camera_finished is done below; the window is closing, so no message box
+            self.recognition_thread.finished.disconnect(self._handle_camera_finished)
             self.recognition_stop_event.set()
-            
-            for cam_input, timer in list(self.camera_display_timers.items()):
-                if timer.isActive():
-                    timer.stop()
-                print(f"DEBUG: closeEvent: Stopped display timer for camera {cam_input}.", flush=True)
-            self.camera_display_timers = {}
-
-            if not self.recognition_thread.wait(5000):
-                print("WARNING: closeEvent: Recognition QThread did not terminate gracefully. Forcibly terminating.", flush=True)
+
+        if self.encoding_update_thread and self.encoding_update_thread.isRunning():
+            logger.debug("closeEvent: Encoding update QThread still running. Cancelling it...")
+            self.encoding_update_thread.cancel() # Saves what is encoded so far; the rest is done next time
+
+        if self.delete_person_thread and self.delete_person_thread.isRunning():
+            logger.debug("closeEvent: Delete person QThread still running. Waiting for it to finish...")
+
+        if self.log_load_thread and self.log_load_thread.isRunning():
+            logger.debug("closeEvent: Log load QThread still running. Waiting for it to finish...")
+
+        # Then wait for all of them at once in a local event loop: the wait lasts as long as the slowest
+        # thread (at most 5 seconds) instead of the sum of their timeouts, and the window keeps repainting.
+        running_threads = [thread for thread in (self.recognition_thread, self.encoding_update_thread,
+                                                 self.delete_person_thread, self.log_load_thread)
+                           if thread and thread.isRunning()]
+        if running_threads:
+            self.close_in_progress = True
+            wait_loop = QtCore.QEventLoop()
+            def quit_when_all_finished():
+                if not any(thread.isRunning() for thread in running_threads):
+                    wait_loop.quit()
+            for thread in running_threads:
+                thread.finished.connect(quit_when_all_finished)
+            timeout_timer = QtCore.QTimer()
+            timeout_timer.setSingleShot(True)
+            timeout_timer.timeout.connect(wait_loop.quit)
+            timeout_timer.start(5000)
+            # A thread may have finished before its `finished` signal was connected above
+            if any(thread.isRunning() for thread in running_threads):
+                wait_loop.exec_()
+            timeout_timer.stop()
+            for thread in running_threads:
+                thread.finished.disconnect(quit_when_all_finished)
+            self.close_in_progress = False
+
+        if self.recognition_thread:
+            if self.recognition_thread.isRunning():
+                logger.warning("closeEvent: Recognition QThread did not terminate gracefully. Forcibly terminating.")
                 self.recognition_thread.terminate()
             else:
-                print("DEBUG: closeEvent: Recognition QThread terminated successfully.", flush=True)
+                logger.debug("closeEvent: Recognition QThread terminated successfully.")
             self.recognition_thread = None
             self.recognition_stop_event.clear()
             self.camera_display_queues = {}
 
         if self.encoding_update_thread and self.encoding_update_thread.isRunning():
-            print("DEBUG: closeEvent: Encoding update QThread still running. Waiting for it to finish...", flush=True)
-            if not self.encoding_update_thread.wait(2000):
-                print("WARNING: closeEvent: Encoding update QThread did not finish gracefully within timeout.", flush=True)
+            logger.warning("closeEvent: Encoding update QThread did not finish gracefully within timeout.")
 
         if self.delete_person_thread and self.delete_person_thread.isRunning():
-            print("DEBUG: closeEvent: Delete person QThread still running. Waiting for it to finish...", flush=True)
-            if not self.delete_person_thread.wait(2000):
-                print("WARNING: closeEvent: Delete person QThread did not finish gracefully within timeout.", flush=True)
+            logger.warning("closeEvent: Delete person QThread did not finish gracefully within timeout.")
+
+        if self.log_load_thread and self.log_load_thread.isRunning():
+            logger.warning("closeEvent: Log load QThread did not finish gracefully within timeout.")
 
         self._release_capture_dialog_camera()
-        cv2.destroyAllWindows()
         
-        print("DEBUG: closeEvent: All child processes handled. Accepting close event.", flush=True)
+        logger.debug("closeEvent: All child processes handled. Accepting close event.")
         event.accept()
 
 
 # --- QThread Subclasses for Background Tasks ---
 class RecognitionSystemThread(QtCore.QThread):
+    """
+    Runs `main_recognition_logic.start_live_face_recognition` off the GUI thread.
+
+    Frame contract: each camera stream places `camera_stream.FramePacket`s in its slot in
+    camera_display_queues, and their frames are C-contiguous uint8 arrays (H x W x 3 BGR, or H x W x 2
+    raw YUYV converted by `camera_stream.draw_frame_packet`). The display path therefore uses them
+    as they are, without `np.ascontiguousarray` copies. The streams assert this when assertions are enabled.
+    """
+    # Emitted from the camera streams' threads when a camera has a new frame in its slot in
+    # camera_display_queues. While a display pass is pending (display_pending is set) further frames
+    # do not emit it again: the pending pass shows the latest frame of every camera.
+    frames_ready = QtCore.pyqtSignal()
+
     def __init__(self, stop_event, camera_display_queues, parent=None):
         super().__init__(parent)
         self.stop_event = stop_event
         self.camera_display_queues = camera_display_queues
+        self.display_pending = threading.Event() # Cleared by the GUI when its display pass starts
+
+    def _notify_frame_ready(self, cam_input):
+        """Called by the camera streams after publishing a frame; requests a display pass if none is pending."""
+        if not self.display_pending.is_set():
+            self.display_pending.set()
+            self.frames_ready.emit()
 
     def run(self):
-        print("DEBUG: RecognitionSystemThread: Starting run method.", flush=True)
-        main_recognition_logic.start_live_face_recognition(self.stop_event, self.camera_display_queues)
-        print("DEBUG: RecognitionSystemThread: Finished run method.", flush=True)
+        logger.debug("RecognitionSystemThread: Starting run method.")
+        main_recognition_logic.start_live_face_recognition(self.stop_event, self.camera_display_queues,
+                                                           on_frame_ready=self._notify_frame_ready)
+        logger.debug("RecognitionSystemThread: Finished run method.")
 
 
 class EncodingUpdateThread(QtCore.QThread):
     finished_signal = QtCore.pyqtSignal(str)
     error_signal = QtCore.pyqtSignal(str)
 
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # The images are encoded by a process pool inside face_data_manager; setting this event
+        # cancels the images not started yet (faces encoded so far are still saved).
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Asks the running update to stop after the images currently being encoded."""
+        self.cancel_event.set()
+
     def run(self):
-        print("DEBUG: EncodingUpdateThread: Starting run method.", flush=True)
+        logger.debug("EncodingUpdateThread: Starting run method.")
         try:
-            result_message = face_data_manager.update_encodings_from_dataset()
+            result_message = face_data_manager.update_encodings_from_dataset(self.cancel_event)
             self.finished_signal.emit(result_message)
-            print("DEBUG: EncodingUpdateThread: Finished successfully.", flush=True)
+            logger.debug("EncodingUpdateThread: Finished successfully.")
         except Exception as e:
             error_msg = f"Error updating encodings: {e}"
             self.error_signal.emit(error_msg)
-            print(f"ERROR: EncodingUpdateThread: {error_msg}", flush=True)
+            logger.error("EncodingUpdateThread: %s", error_msg)
 
 
 class DeletePersonThread(QtCore.QThread):
@@ -1196,25 +1429,46 @@ class DeletePersonThread(QtCore.QThread):
         self.person_name = person_name
 
     def run(self):
-        print(f"DEBUG: DeletePersonThread: Starting run method for '{self.person_name}'.", flush=True)
+        logger.debug("DeletePersonThread: Starting run method for '%s'.", self.person_name)
         try:
             result_message = face_data_manager.delete_person_from_encodings(self.person_name)
             self.finished_signal.emit(result_message)
-            print(f"DEBUG: DeletePersonThread: Finished successfully for '{self.person_name}'.", flush=True)
+            logger.debug("DeletePersonThread: Finished successfully for '%s'.", self.person_name)
         except ValueError as e:
             error_msg = f"Deletion failed: {e}. Please ensure the name is correct."
             self.error_signal.emit(error_msg)
-            print(f"ERROR: DeletePersonThread: {error_msg}", flush=True)
+            logger.error("DeletePersonThread: %s", error_msg)
         except Exception as e:
             error_msg = f"An unexpected error occurred during deletion: {e}"
             self.error_signal.emit(error_msg)
-            print(f"ERROR: DeletePersonThread: {error_msg}", flush=True)
+            logger.error("DeletePersonThread: %s", error_msg)
+
+
+class LogLoadThread(QtCore.QThread):
+    # Emitted with (context, headers, rows): the caller's context value and the result of the read
+    loaded_signal = QtCore.pyqtSignal(object, object, object)
+
+    def __init__(self, load_function, load_args, context, parent=None):
+        super().__init__(parent)
+        self.load_function = load_function # A logging_manager read returning (headers, rows)
+        self.load_args = load_args
+        self.context = context
+
+    def run(self):
+        logger.debug("LogLoadThread: Starting run method.")
+        try:
+            headers, rows = self.load_function(*self.load_args)
+        except Exception as e:
+            logger.error("LogLoadThread: Failed to load the log: %s", e)
+            headers, rows = None, [] # Reported to the user as an empty/missing log
+        self.loaded_signal.emit(self.context, headers, rows)
+        logger.debug("LogLoadThread: Finished, %s rows loaded.", len(rows))
 
 
 # --- Filter Dialog for Download Log (remains largely same as original but now part of gui.py) ---
 class FilterDialog(QtWidgets.QDialog):
     def __init__(self, parent=None):
-        print("DEBUG: FilterDialog: Initializing filter dialog.", flush=True)
+        logger.debug("FilterDialog: Initializing filter dialog.")
         super().__init__(parent)
         self.setWindowTitle("Select Log Filter")
         self.setFixedSize(350, 300)
@@ -1242,7 +1496,7 @@ class FilterDialog(QtWidgets.QDialog):
             self.layout.addWidget(radio_btn)
             self.radio_group.addButton(radio_btn, int(val))
             self.radio_buttons.append(radio_btn)
-            print(f"DEBUG: FilterDialog: Added radio button for '{text}'.", flush=True)
+            logger.debug("FilterDialog: Added radio button for '%s'.", text)
 
 
         self.date_frame = QtWidgets.QFrame(self)
@@ -1251,30 +1505,27 @@ class FilterDialog(QtWidgets.QDialog):
         self.entry_from = QtWidgets.QLineEdit()
         self.entry_from.setPlaceholderText(datetime.now().strftime("%Y-%m-%d"))
         self.date_layout.addRow("From Date:", self.entry_from)
-        print("DEBUG: FilterDialog: 'From Date' input added.", flush=True)
+        logger.debug("FilterDialog: 'From Date' input added.")
 
         self.entry_to = QtWidgets.QLineEdit()
         self.entry_to.setPlaceholderText(datetime.now().strftime("%Y-%m-%d"))
         self.date_layout.addRow("To Date:", self.entry_to)
         self.layout.addWidget(self.date_frame)
-        print("DEBUG: FilterDialog: 'To Date' input added.", flush=True)
+        logger.debug("FilterDialog: 'To Date' input added.")
 
         btn_box = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
         btn_box.accepted.connect(self.accept)
         btn_box.rejected.connect(self.reject)
         self.layout.addWidget(btn_box)
-        print("DEBUG: FilterDialog: OK/Cancel buttons added.", flush=True)
+        logger.debug("FilterDialog: OK/Cancel buttons added.")
 
         self.toggle_date_entries()
 
         if parent:
-            parent_rect = parent.geometry()
-            x = parent_rect.x() + (parent_rect.width() - self.width()) // 2
-            y = parent_rect.y() + (parent_rect.height() - self.height()) // 2
-            self.move(x, y)
-            print(f"DEBUG: FilterDialog: Centered relative to parent at ({x},{y}).", flush=True)
+            position = _center_widget(self, parent.geometry())
+            logger.debug("FilterDialog: Centered relative to parent at (%s,%s).", position.x(), position.y())
 
-        print("DEBUG: FilterDialog: Initialization complete.", flush=True)
+        logger.debug("FilterDialog: Initialization complete.")
 
 
     def toggle_date_entries(self):
@@ -1285,12 +1536,27 @@ class FilterDialog(QtWidgets.QDialog):
         current_choice = self.radio_group.checkedId()
         if current_choice == 1: # If "Day Range" is selected (ID 1)
             self.date_frame.show()
-            # print("DEBUG: FilterDialog: Date entries frame shown.", flush=True) # Removed verbose print
+            # logger.debug("FilterDialog: Date entries frame shown.") # Removed verbose print
         else:
             self.date_frame.hide()
-            # print("DEBUG: FilterDialog: Date entries frame hidden.", flush=True) # Removed verbose print
+            # logger.debug("FilterDialog: Date entries frame hidden.") # Removed verbose print
 
 
+    def reset(self):
+        """
+        Restores the state the dialog is created in ("Day Range" selected, empty date fields showing today's
+        date as placeholder) and centers it on its parent again, so one instance can be shown repeatedly.
+        """
+        today_str = datetime.now().strftime("%Y-%m-%d")
+        for entry in (self.entry_from, self.entry_to):
+            entry.clear()
+            entry.setPlaceholderText(today_str)
+        self.radio_buttons[0].setChecked(True) # "Day Range"
+        self.toggle_date_entries()
+        if self.parent():
+            _center_widget(self, self.parent().geometry())
+        logger.debug("FilterDialog: Reset for reuse.")
+
     def get_results(self):
         """
         Returns the selected filter choice (as a string ID) and the entered "From" and "To" date strings.
@@ -1298,15 +1564,19 @@ class FilterDialog(QtWidgets.QDialog):
         choice = str(self.radio_group.checkedId())
         from_date = self.entry_from.text()
         to_date = self.entry_to.text()
-        print(f"DEBUG: FilterDialog: Returning results: Choice={choice}, From={from_date}, To={to_date}.", flush=True)
+        logger.debug("FilterDialog: Returning results: Choice=%s, From=%s, To=%s.", choice, from_date, to_date)
         return choice, from_date, to_date
 
 # --- Main Application Execution ---
 if __name__ == '__main__':
-    print("DEBUG: Main GUI: Starting QApplication.", flush=True)
+    # Same "LEVEL: message" console format as the print() diagnostics of the other modules, written by a
+    # listener thread so logging never blocks the GUI or camera threads on the console.
+    # Use logging.DEBUG to see the debug messages of the GUI and the recognition modules.
+    logging_manager.configure_console_logging(logging.INFO)
+    logger.debug("Main GUI: Starting QApplication.")
     app = QtWidgets.QApplication(sys.argv)
     main_window = FaceRecognitionApp()
     main_window.show()
-    print("DEBUG: Main GUI: Showing main window. Entering event loop.", flush=True)
+    logger.debug("Main GUI: Showing main window. Entering event loop.")
     sys.exit(app.exec_())
-    print("DEBUG: Main GUI: Exited event loop. Application terminating.", flush=True)
\ No newline at end of file
+    logger.debug("Main GUI: Exited event loop. Application terminating.")
@@ -1,43 +1,230 @@
-import pickle
-import face_recognition
+import logging # Diagnostics go through a level-checked logger (DEBUG messages cost nothing unless enabled)
+import json
+import struct
+import pickle # Only for importing the old intruder pickle once
+import threading
 import numpy as np
-# datetime and os are not strictly needed in intruder_tracker anymore since it's just ID management.
-# They can be removed if you want, but keeping them doesn't hurt.
+# datetime is not strictly needed in intruder_tracker anymore since it's just ID management.
+# It can be removed if you want, but keeping it doesn't hurt.
 import datetime
 import os
 
 import config # Import the centralized configuration
+import face_matching # Distance kernels (numba-compiled when available)
 
-# The intruder_encodings.pkl will store (list_of_encodings, list_of_intruder_ids).
+# Logger for this module; DEBUG messages are formatted and written only if enabled (see logging_manager.logger).
+logger = logging.getLogger("intruder_tracker")
+
+# The intruder database is an append-only store like face_data_manager's known-face store:
+# config.INTRUDER_ENCODINGS_MATRIX_FILE holds the encodings as raw little-endian float32 rows (128 values each),
+# config.INTRUDER_IDS_FILE one JSON string (the intruder ID) per line, in the same order. Loading is one bulk
+# read instead of unpickling an array object per intruder, and a new intruder is appended instead of rewriting
+# the database. The old intruder_encodings.pkl (config.INTRUDER_ENCODINGS_FILE) is imported once if present.
 # All other metadata (first_seen, last_seen, count, image_path) is managed externally by camera_stream.
 
-def load_intruder_db():
+# Like the known-face store, every full rewrite stores a random generation id in a 16-byte header of the matrix
+# file (magic, row width, generation) and as the first line of the IDs file ({"generation": id}), so encodings and
+# IDs from different rewrites are never paired. Files written before that have no header and no generation line.
+_MATRIX_MAGIC = b"VPINTR\x00\x01"
+_MATRIX_HEADER_FORMAT = "<8sII"
+_MATRIX_HEADER_SIZE = struct.calcsize(_MATRIX_HEADER_FORMAT)
+
+def _read_matrix_header(path):
+    """Returns (byte offset of the first row, generation id) of the matrix file; (0, 0) for files without a header."""
+    with open(path, "rb") as f:
+        header = f.read(_MATRIX_HEADER_SIZE)
+    if len(header) < _MATRIX_HEADER_SIZE or not header.startswith(_MATRIX_MAGIC):
+        return 0, 0
+    _, dim, generation = struct.unpack(_MATRIX_HEADER_FORMAT, header)
+    if dim != 128:
+        raise ValueError(f"{path} holds {dim}-d encodings, expected 128-d.")
+    return _MATRIX_HEADER_SIZE, generation
+
+def _read_ids_file(path):
+    """Returns (generation id, list of intruder IDs) of an IDs file. Files without a generation line have generation 0."""
+    with open(path, "r", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    if entries and isinstance(entries[0], dict):
+        return entries[0]["generation"], entries[1:]
+    return 0, entries
+
+def _pending_ids(matrix_generation):
+    """
+    Returns the IDs in the IDs temporary file if they belong to a matrix with `matrix_generation`, i.e. a
+    save_intruder_db() swapped in its matrix but not (yet) its IDs file; None otherwise.
+    """
+    try:
+        pending_generation, pending_ids = _read_ids_file(config.INTRUDER_IDS_FILE + ".tmp")
+    except (FileNotFoundError, ValueError): # No temporary file, or a half-written one whose matrix was never swapped in
+        return None
+    return pending_ids if pending_generation != 0 and pending_generation == matrix_generation else None
+
+def _complete_interrupted_save():
+    """
+    Write path only (with _intruder_db_lock held): finishes a save_intruder_db() that crashed between swapping
+    in the matrix and the IDs file, whose new IDs are then still in the temporary file.
+    """
+    if not os.path.exists(config.INTRUDER_ENCODINGS_MATRIX_FILE):
+        return
+    if _pending_ids(_read_matrix_header(config.INTRUDER_ENCODINGS_MATRIX_FILE)[1]) is not None:
+        logger.warning("intruder_tracker: Completing an interrupted save of %s.", config.INTRUDER_IDS_FILE)
+        os.replace(config.INTRUDER_IDS_FILE + ".tmp", config.INTRUDER_IDS_FILE)
+
+# The intruder database as last loaded or saved, reused by match_or_add_intruder while the store files'
+# modification times and sizes are unchanged. "matrix" holds the encodings as one contiguous (N, 128) float32 array.
+_intruder_db_cache = {"stamp": None, "ids": [], "matrix": np.empty((0, 128), dtype=np.float32)}
+# Camera threads may match/add intruders at the same time; this serializes access to the cache and the files.
+_intruder_db_lock = threading.Lock()
+
+def _migrate_legacy_intruder_pickle():
     """
-    Loads intruder encodings and their corresponding IDs from the pickle file.
-    Returns a tuple: (list_of_encodings, list_of_intruder_ids).
-    Handles FileNotFoundError and EOFError for new/empty files.
+    One-time import of the old (encodings, ids) pickle (config.INTRUDER_ENCODINGS_FILE) into the store.
+    Does nothing if the store already exists or there is no old pickle.
     """
+    if os.path.exists(config.INTRUDER_ENCODINGS_MATRIX_FILE) or not os.path.exists(config.INTRUDER_ENCODINGS_FILE):
+        return
+    logger.info("intruder_tracker: Migrating %s to %s / %s.", config.INTRUDER_ENCODINGS_FILE,
+                config.INTRUDER_ENCODINGS_MATRIX_FILE, config.INTRUDER_IDS_FILE)
     try:
-        print(f"DEBUG: intruder_tracker: Attempting to load from {config.INTRUDER_ENCODINGS_FILE}", flush=True)
         with open(config.INTRUDER_ENCODINGS_FILE, "rb") as f:
             encodings, ids = pickle.load(f)
-        print(f"DEBUG: intruder_tracker: Loaded {len(encodings)} intruder encodings and {len(ids)} IDs.", flush=True)
-        return encodings, ids
-    except (FileNotFoundError, EOFError):
-        print(f"DEBUG: intruder_tracker: {config.INTRUDER_ENCODINGS_FILE} not found or empty. Starting with no known intruders.", flush=True)
-        return [], [] # Return empty lists for encodings and IDs
+    except EOFError:
+        return # Empty legacy file: nothing to migrate
+    save_intruder_db(encodings, ids)
+
+def _unpaired_store_reason():
+    """
+    Returns why the store files cannot be paired (they come from different saves, or there are IDs without rows),
+    or None if they can be, or do not both exist.
+    """
+    if not (os.path.exists(config.INTRUDER_ENCODINGS_MATRIX_FILE) and os.path.exists(config.INTRUDER_IDS_FILE)):
+        return None
+    offset, matrix_generation = _read_matrix_header(config.INTRUDER_ENCODINGS_MATRIX_FILE)
+    ids_generation, ids = _read_ids_file(config.INTRUDER_IDS_FILE)
+    if matrix_generation != ids_generation:
+        return f"they come from different saves (generation {matrix_generation} vs {ids_generation})"
+    row_count = (os.path.getsize(config.INTRUDER_ENCODINGS_MATRIX_FILE) - offset) // (128 * 4)
+    if row_count < len(ids):
+        return f"there are {len(ids)} IDs but only {row_count} rows"
+    return None
+
+def _set_aside_unpaired_store():
+    """
+    Write path only (with _intruder_db_lock held): if the store files still cannot be paired, renames both to
+    "<name>.unpaired" (kept for inspection), so the store is started afresh instead of appending to or rewriting them.
+    """
+    reason = _unpaired_store_reason()
+    if reason is None:
+        return
+    logger.error("intruder_tracker: %s and %s cannot be paired: %s. Moving them aside as *.unpaired; intruder IDs start again.",
+                 config.INTRUDER_ENCODINGS_MATRIX_FILE, config.INTRUDER_IDS_FILE, reason)
+    for path in (config.INTRUDER_ENCODINGS_MATRIX_FILE, config.INTRUDER_IDS_FILE):
+        os.replace(path, path + ".unpaired")
+
+def load_intruder_db():
+    """
+    Loads intruder encodings and their corresponding IDs from the store.
+    Returns a tuple: (encodings as an (N, 128) float32 array, list_of_intruder_ids).
+    Returns no intruders if the store does not exist yet. If an earlier append was interrupted between
+    the two files (rows written, IDs not), the extra rows are ignored. If a save swapped in its matrix but not yet
+    its IDs file, the IDs are read from its temporary file. If the files cannot be paired otherwise (different saves,
+    or IDs without rows), an error is logged and no intruders are returned: pairing them would move IDs onto other
+    faces. Loading never changes the store files (another process may be in the middle of writing them).
+    """
+    try:
+        _migrate_legacy_intruder_pickle()
+        logger.debug("intruder_tracker: Attempting to load from %s", config.INTRUDER_ENCODINGS_MATRIX_FILE)
+        offset, matrix_generation = _read_matrix_header(config.INTRUDER_ENCODINGS_MATRIX_FILE)
+        ids_generation, ids = _read_ids_file(config.INTRUDER_IDS_FILE)
+        if matrix_generation != ids_generation:
+            ids = _pending_ids(matrix_generation)
+            if ids is None:
+                logger.error("intruder_tracker: %s and %s come from different saves (generation %s vs %s). No intruders loaded.",
+                             config.INTRUDER_ENCODINGS_MATRIX_FILE, config.INTRUDER_IDS_FILE, matrix_generation, ids_generation)
+                return np.empty((0, 128), dtype=np.float32), []
+        matrix = np.fromfile(config.INTRUDER_ENCODINGS_MATRIX_FILE, dtype="<f4", offset=offset) # One bulk read, no unpickling
+        matrix = matrix[:matrix.size - matrix.size % 128].reshape(-1, 128)
+        if len(matrix) < len(ids):
+            logger.error("intruder_tracker: %s lists %s IDs but %s holds only %s rows. No intruders loaded.",
+                         config.INTRUDER_IDS_FILE, len(ids), config.INTRUDER_ENCODINGS_MATRIX_FILE, len(matrix))
+            return np.empty((0, 128), dtype=np.float32), []
+        if len(matrix) > len(ids):
+            logger.warning("intruder_tracker: Ignoring %s intruder rows without an ID (interrupted append).", len(matrix) - len(ids))
+            matrix = matrix[:len(ids)]
+        logger.debug("intruder_tracker: Loaded %s intruder encodings and %s IDs.", len(matrix), len(ids))
+        return np.ascontiguousarray(matrix, dtype=np.float32), ids
+    except FileNotFoundError:
+        logger.debug("intruder_tracker: %s not found. Starting with no known intruders.", config.INTRUDER_ENCODINGS_MATRIX_FILE)
+        return np.empty((0, 128), dtype=np.float32), [] # No encodings and IDs
     except Exception as e:
-        print(f"ERROR: intruder_tracker: Error loading {config.INTRUDER_ENCODINGS_FILE}: {e}", flush=True)
-        return [], []
+        logger.error("intruder_tracker: Error loading %s: %s", config.INTRUDER_ENCODINGS_MATRIX_FILE, e)
+        return np.empty((0, 128), dtype=np.float32), []
 
 def save_intruder_db(encodings, ids):
     """
-    Saves intruder encodings and their corresponding IDs to the pickle file.
+    Rewrites the whole store with the given intruder encodings ((N, 128) array or list of 128-d arrays) and IDs.
+    Both files are written to temporary files first and then swapped in, with the same new generation id
+    (see _complete_interrupted_save for a crash between the two swaps). New intruders are added with
+    _append_intruders instead; this is only needed to remove intruders or create the store.
+    """
+    logger.debug("intruder_tracker: Attempting to save %s encodings and %s IDs to %s", len(encodings), len(ids), config.INTRUDER_ENCODINGS_MATRIX_FILE)
+    matrix = np.asarray(encodings, dtype="<f4").reshape(-1, 128)
+    generation = int.from_bytes(os.urandom(4), "little") or 1
+    with open(config.INTRUDER_IDS_FILE + ".tmp", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"generation": generation}) + "\n")
+        f.write("".join(json.dumps(intruder_id) + "\n" for intruder_id in ids))
+    with open(config.INTRUDER_ENCODINGS_MATRIX_FILE + ".tmp", "wb") as f:
+        f.write(struct.pack(_MATRIX_HEADER_FORMAT, _MATRIX_MAGIC, 128, generation))
+        f.write(matrix.tobytes())
+    # Matrix first: until the IDs file is swapped in too, the new IDs wait in its temporary file
+    os.replace(config.INTRUDER_ENCODINGS_MATRIX_FILE + ".tmp", config.INTRUDER_ENCODINGS_MATRIX_FILE)
+    os.replace(config.INTRUDER_IDS_FILE + ".tmp", config.INTRUDER_IDS_FILE)
+    logger.debug("intruder_tracker: Saved intruder data successfully.")
+
+def _append_intruders(matrix, ids, new_count):
+    """
+    Adds the last `new_count` intruders of `matrix`/`ids` (the whole database including them) to the store,
+    appending only their rows and IDs (rows first: the loader ignores rows without an ID). If the store is
+    missing, or its files disagree with each other (an earlier append was interrupted), it is rewritten instead.
+    Must be called with _intruder_db_lock held.
     """
-    print(f"DEBUG: intruder_tracker: Attempting to save {len(encodings)} encodings and {len(ids)} IDs to {config.INTRUDER_ENCODINGS_FILE}", flush=True)
-    with open(config.INTRUDER_ENCODINGS_FILE, "wb") as f:
-        pickle.dump((encodings, ids), f)
-    print(f"DEBUG: intruder_tracker: Saved intruder data successfully.", flush=True)
+    existing_count = len(ids) - new_count
+    _complete_interrupted_save()
+    _set_aside_unpaired_store() # The loader returned no intruders for such files; they are kept, not appended to or overwritten
+    if os.path.exists(config.INTRUDER_ENCODINGS_MATRIX_FILE) and os.path.exists(config.INTRUDER_IDS_FILE):
+        offset, matrix_generation = _read_matrix_header(config.INTRUDER_ENCODINGS_MATRIX_FILE)
+        ids_generation, stored_ids = _read_ids_file(config.INTRUDER_IDS_FILE)
+        if (matrix_generation == ids_generation and len(stored_ids) == existing_count
+                and os.path.getsize(config.INTRUDER_ENCODINGS_MATRIX_FILE) - offset == existing_count * 128 * 4):
+            with open(config.INTRUDER_ENCODINGS_MATRIX_FILE, "ab") as f:
+                f.write(np.asarray(matrix[existing_count:], dtype="<f4").tobytes())
+            with open(config.INTRUDER_IDS_FILE, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(intruder_id) + "\n" for intruder_id in ids[existing_count:]))
+            logger.debug("intruder_tracker: Appended %s intruders.", new_count)
+            return
+    save_intruder_db(matrix, ids)
+
+def _intruder_db_stamp():
+    """Returns (mtime_ns, size) of both store files, or None if the store does not exist."""
+    try:
+        stamp = ()
+        for path in (config.INTRUDER_ENCODINGS_MATRIX_FILE, config.INTRUDER_IDS_FILE):
+            stat_result = os.stat(path)
+            stamp += (stat_result.st_mtime_ns, stat_result.st_size)
+    except OSError:
+        return None
+    return stamp
+
+def _load_cached_intruder_db():
+    """
+    Returns the intruder database cache, loading the store again only if it changed since it was
+    last loaded or saved. Must be called with _intruder_db_lock held.
+    """
+    stamp = _intruder_db_stamp()
+    if stamp is None or stamp != _intruder_db_cache["stamp"]:
+        matrix, ids = load_intruder_db() # (Imports the old pickle first if needed)
+        _intruder_db_cache.update(stamp=_intruder_db_stamp(), ids=ids, matrix=matrix)
+    return _intruder_db_cache
 
 def match_or_add_intruder(new_encoding, threshold=config.RECOGNITION_TOLERANCE):
     """
@@ -52,28 +239,67 @@ def match_or_add_intruder(new_encoding, threshold=config.RECOGNITION_TOLERANCE):
     Returns:
         str: The ID of the matched or newly assigned intruder (e.g., "Intruder_1").
     """
-    encodings, ids = load_intruder_db()
-    
-    if encodings: # Only proceed if there are existing intruder encodings to compare against
-        matches = face_recognition.compare_faces(encodings, new_encoding, tolerance=threshold)
-        # face_distances are needed to find the BEST match if multiple are True, or for confidence.
-        # However, for simple match/no-match based on 'matches', it's not strictly necessary for this logic flow.
-        # Let's keep it to ensure consistency with how face_recognition is typically used for best_match_index.
-        face_distances = face_recognition.face_distance(encodings, new_encoding)
-        
-        if True in matches: # If any match is found within the tolerance
-            best_match_index = np.argmin(face_distances) # Find the index of the closest match
-            matched_id = ids[best_match_index] # Retrieve the existing ID for this best match
-            print(f"DEBUG: intruder_tracker: Matched existing intruder: {matched_id}", flush=True)
-            
-            return matched_id # Return the matched intruder's ID
-    
-    # If no match was found (or if encodings list was empty), then this is a new intruder.
-    new_intruder_id = f"Intruder_{len(ids) + 1}" # Assign a new sequential ID
-    encodings.append(new_encoding) # Add the new face encoding to the list
-    ids.append(new_intruder_id) # Add the new ID to the list
-    
-    save_intruder_db(encodings, ids) # Save the updated intruder database to disk
-    print(f"DEBUG: intruder_tracker: Added new intruder: {new_intruder_id}", flush=True)
-    
-    return new_intruder_id # Return the newly assigned intruder ID
\ No newline at end of file
+    return match_or_add_intruders([new_encoding], threshold)[0]
+
+def match_or_add_intruders(new_encodings, threshold=config.RECOGNITION_TOLERANCE):
+    """
+    Batch version of match_or_add_intruder for several face encodings (e.g. all unknown faces of a frame).
+    The distances from all of them to all known intruders are computed in one matrix operation, and the
+    new intruders are appended to the database together. The IDs are the same as from calling match_or_add_intruder
+    for each encoding in order (an encoding can match an intruder added for an earlier one in the batch).
+
+    Args:
+        new_encodings (list of np.array or np.array of shape (K, 128)): The face encodings of the detected faces.
+        threshold (float, optional): The facial recognition tolerance. Defaults to config.RECOGNITION_TOLERANCE.
+
+    Returns:
+        list of str: The ID of the matched or newly assigned intruder for each encoding, in order.
+    """
+    queries = np.asarray(new_encodings, dtype=np.float32).reshape(-1, 128)
+    threshold_sq = threshold * threshold
+    with _intruder_db_lock:
+        intruder_db = _load_cached_intruder_db() # Read from disk only if the files changed
+        ids, matrix = intruder_db["ids"], intruder_db["matrix"]
+
+        # Closest known intruder for every encoding, from one (K, N) distance matrix; it matches if it is
+        # within the tolerance (the same test as face_recognition.compare_faces)
+        if len(matrix) and len(queries):
+            squared_distances = face_matching.pairwise_squared_distances(matrix, queries)
+            best_match_indices = np.argmin(squared_distances, axis=1) # Find the index of the closest match
+            matched = squared_distances[np.arange(len(queries)), best_match_indices] <= threshold_sq
+        else:
+            best_match_indices = np.zeros(len(queries), dtype=np.intp)
+            matched = np.zeros(len(queries), dtype=bool)
+
+        result_ids = []
+        new_rows = [] # Indices into queries of the intruders added in this batch
+        for i, query in enumerate(queries):
+            if matched[i]:
+                matched_id = ids[best_match_indices[i]] # Retrieve the existing ID for this best match
+                logger.debug("intruder_tracker: Matched existing intruder: %s", matched_id)
+                result_ids.append(matched_id)
+                continue
+            if new_rows: # It may be the same person as an intruder added for an earlier encoding of this batch
+                new_squared_distances = face_matching.squared_distances(queries[new_rows], query)
+                best_new_index = int(np.argmin(new_squared_distances))
+                if new_squared_distances[best_new_index] <= threshold_sq:
+                    matched_id = ids[len(matrix) + best_new_index]
+                    logger.debug("intruder_tracker: Matched existing intruder: %s", matched_id)
+                    result_ids.append(matched_id)
+                    continue
+            # If no match was found (or if the database is empty), then this is a new intruder.
+            if not new_rows:
+                ids = list(ids) # A new list rather than appending to the cached one, so it stays as loaded if saving fails
+            new_intruder_id = f"Intruder_{len(ids) + 1}" # Assign a new sequential ID
+            ids.append(new_intruder_id) # Add the new ID to the list
+            new_rows.append(i)
+            logger.debug("intruder_tracker: Added new intruder: %s", new_intruder_id)
+            result_ids.append(new_intruder_id)
+
+        if new_rows:
+            # Add the new intruders to the database on disk, once for the batch
+            matrix = np.vstack((matrix, queries[new_rows]))
+            _append_intruders(matrix, ids, len(new_rows))
+            _intruder_db_cache.update(stamp=_intruder_db_stamp(), ids=ids, matrix=matrix)
+
+        return result_ids # The matched or newly assigned intruder IDs
@@ -1,16 +1,18 @@
 import pickle
 import os
 
-# Load existing encodings and names
-pickle_file = "intruderg_encodings.pkl"
+# Standalone utility: lists the names stored in an encodings pickle file.
+# Everything runs under the __main__ guard, so importing this module does not read or unpickle anything.
+if __name__ == "__main__":
+    # Load existing encodings and names
+    pickle_file = "intruderg_encodings.pkl"
 
-if os.path.exists(pickle_file):
-    with open(pickle_file, "rb") as f:
-        known_face_encodings, known_face_names = pickle.load(f)
+    if os.path.exists(pickle_file):
+        with open(pickle_file, "rb") as f:
+            known_face_encodings, known_face_names = pickle.load(f)
 
-    # Print the list of names
-    print("List of stored names in the pickle file:")
-    for name in known_face_names:
-        print(name)
-else:
-    print("Pickle file not found.")
+        # Print the list of names (one write for the whole list)
+        print("List of stored names in the pickle file:")
+        print("\n".join(str(name) for name in known_face_names))
+    else:
+        print("Pickle file not found.")
@@ -1,15 +1,99 @@
 # logging_manager.py
 import os
+import atexit
 import datetime
+import logging # Diagnostics go through a level-checked logger (DEBUG messages cost nothing unless enabled)
+import logging.handlers
+import queue
 import threading
+import mmap
+import zlib
+
+import numpy as np
 
 import config # Import the centralized configuration
 
+# Logger for this module. Messages are formatted lazily ("%s" arguments) and written only if their level is
+# enabled (e.g. by the GUI's logging.basicConfig), so the per-entry DEBUG messages cost no console writes.
+logger = logging.getLogger("logging_manager")
+
 # Global lock for thread-safe log file access.
 # This ensures that multiple threads (e.g., camera streams) don't try to write to the log file simultaneously,
 # which could corrupt the file.
 logging_lock = threading.Lock()
 
+# Header and separator lines of the log file, with only the 'IMAGE_LINK' new column, and proper padding
+# (the same widths as the entries written by write_log_entry)
+_LOG_HEADER = f"{'NAME'.ljust(25)} | {'GENDER'.ljust(8)} | {'DAY'.ljust(6)} | {'DATE'.ljust(12)} | {'TIME'.ljust(8)} | {'IMAGE_LINK'}\n"
+# Separator length adjusted to match the headers + padding
+_LOG_SEPARATOR = f"{'-'*25}-+-{'-'*8}-+-{'-'*6}-+-{'-'*12}-+-{'-'*8}-+-{'-'*len('IMAGE_LINK')}\n"
+
+# Entries from write_log_entry wait in this queue and are appended to the log file in batches by a background
+# writer thread: once _LOG_WRITE_DELAY seconds after the first of them, or as soon as _LOG_WRITE_BATCH_SIZE are
+# waiting. Readers write any waiting entries out first (see _write_pending_log_entries), so they always see them.
+_LOG_WRITE_DELAY = 0.25
+_LOG_WRITE_BATCH_SIZE = 64
+_pending_log_entries = queue.SimpleQueue() # (formatted_entry, name, gender, display_image_link) tuples
+_log_entry_queued = threading.Event() # Set when entries are waiting
+_log_batch_full = threading.Event() # Set when _LOG_WRITE_BATCH_SIZE entries are waiting
+_log_writer_thread = None
+_log_writer_start_lock = threading.Lock()
+
+def _write_pending_log_entries():
+    """Appends all waiting log entries to the log file with one write. Must be called with logging_lock held."""
+    entries = []
+    while True:
+        try:
+            entries.append(_pending_log_entries.get_nowait())
+        except queue.Empty:
+            break
+    if not entries:
+        return
+    log_file_path = config.LOG_FILE_PATH # Get path from config
+    try:
+        with open(log_file_path, "a", encoding='utf-8') as log_file:
+            log_file.write("".join(entry[0] for entry in entries)) # Written out when the file is closed
+        for _, name, gender, display_image_link in entries:
+            logger.debug("logging_manager: Logged: %s (%s) with image_link '%s'.", name, gender, display_image_link)
+    except Exception as e:
+        for _, name, gender, _ in entries:
+            logger.critical("logging_manager: Failed to write log entry for '%s' ('%s') to %s: %s", name, gender, log_file_path, e)
+
+def _log_writer_loop():
+    """Background writer thread: appends the queued log entries in batches (see _pending_log_entries)."""
+    while True:
+        _log_entry_queued.wait()
+        _log_batch_full.wait(timeout=_LOG_WRITE_DELAY) # Collect more entries, unless a batch is already full
+        with logging_lock:
+            # Cleared before the queue is emptied: an entry queued after this sets the events again
+            _log_entry_queued.clear()
+            _log_batch_full.clear()
+            _write_pending_log_entries()
+
+def _flush_pending_log_entries_at_exit():
+    """Writes entries still waiting in the queue when the interpreter exits."""
+    with logging_lock:
+        _write_pending_log_entries()
+
+atexit.register(_flush_pending_log_entries_at_exit)
+
+def configure_console_logging(level=logging.INFO):
+    """
+    Shows the diagnostics of all modules' loggers on the console ("LEVEL: message", the format of the print()
+    diagnostics elsewhere) through a queue: the threads that log (camera streams, recognition thread, GUI) only
+    enqueue each record, and one listener thread writes them. Call once at program start; returns the listener.
+    """
+    log_queue = queue.SimpleQueue()
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, console_handler)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop) # Writes the records still queued at exit
+    return listener
+
 def write_log_header_if_needed():
     """
     Writes the header row to the log file if the file does not exist or is empty.
@@ -21,27 +105,19 @@ def write_log_header_if_needed():
         log_file_path = config.LOG_FILE_PATH # Get path from config
         if not os.path.exists(log_file_path) or os.path.getsize(log_file_path) == 0:
             try:
-                # Updated header format with only the 'IMAGE_LINK' new column, and proper padding
-                log_header = (
-                    f"{'NAME'.ljust(25)} | {'GENDER'.ljust(8)} | {'DAY'.ljust(6)} | {'DATE'.ljust(12)} | {'TIME'.ljust(8)} | {'IMAGE_LINK'}\n"
-                )
-                # Separator length adjusted to match the headers + padding
-                log_separator = (
-                    f"{'-'*25}-+-{'-'*8}-+-{'-'*6}-+-{'-'*12}-+-{'-'*8}-+-{'-'*len('IMAGE_LINK')}\n"
-                )
                 with open(log_file_path, "w", encoding='utf-8') as log_file:
-                    log_file.write(log_header)
-                    log_file.write(log_separator)
-                print(f"DEBUG: logging_manager: Log header written to {log_file_path}.", flush=True)
+                    log_file.write(_LOG_HEADER + _LOG_SEPARATOR)
+                logger.debug("logging_manager: Log header written to %s.", log_file_path)
             except Exception as e:
-                print(f"ERROR: logging_manager: Failed to write log header to {log_file_path}: {e}", flush=True)
+                logger.error("logging_manager: Failed to write log header to %s: %s", log_file_path, e)
 
 def write_log_entry(name, gender, image_link=None):
     """
     Appends a new entry to the face detection log file with current timestamp.
     Accepts an optional image_link for intruder snapshots.
     The 'HISTORY' display feature is handled by GUI interactivity, not by data storage.
-    Uses a lock to ensure thread-safe writing.
+    The entry is only queued here, without taking the lock or touching the file: a background thread
+    appends queued entries in batches, in order (see _pending_log_entries).
 
     Args:
         name (str): Name of the person/intruder.
@@ -50,9 +126,8 @@ def write_log_entry(name, gender, image_link=None):
                                     If None or empty, "N/A" will be logged in the image_link column.
     """
     current_time_dt = datetime.datetime.now()
-    day_str = current_time_dt.strftime("%a") # e.g., Mon, Tue
-    date_str = current_time_dt.strftime("%Y-%m-%d") # e.g., 2023-10-27
-    time_str = current_time_dt.strftime("%H:%M:%S") # e.g., 14:30:55
+    # One strftime call for all three columns, e.g. "Mon", "2023-10-27" and "14:30:55"
+    day_str, date_str, time_str = current_time_dt.strftime("%a\x1f%Y-%m-%d\x1f%H:%M:%S").split("\x1f")
 
     # Format image_link: Use provided path or "N/A" if None/empty string
     display_image_link = image_link if image_link else "N/A"
@@ -64,15 +139,16 @@ def write_log_entry(name, gender, image_link=None):
         f"{display_image_link}\n"
     )
     
-    with logging_lock: # Acquire lock before writing to file
-        log_file_path = config.LOG_FILE_PATH # Get path from config
-        try:
-            with open(log_file_path, "a", encoding='utf-8') as log_file:
-                log_file.write(formatted_entry)
-                log_file.flush()  # Ensure immediate write to disk
-            print(f"DEBUG: logging_manager: Logged: {name} ({gender}) with image_link '{display_image_link}'.", flush=True)
-        except Exception as e:
-            print(f"CRITICAL ERROR: logging_manager: Failed to write log entry for '{name}' ('{gender}') to {log_file_path}: {e}", flush=True)
+    global _log_writer_thread
+    if _log_writer_thread is None:
+        with _log_writer_start_lock: # Started on the first entry, so readers like the GUI never start it
+            if _log_writer_thread is None:
+                _log_writer_thread = threading.Thread(target=_log_writer_loop, name="LogWriter", daemon=True)
+                _log_writer_thread.start()
+    _pending_log_entries.put((formatted_entry, name, gender, display_image_link))
+    if _pending_log_entries.qsize() >= _LOG_WRITE_BATCH_SIZE:
+        _log_batch_full.set()
+    _log_entry_queued.set()
 
 def read_log_file():
     """
@@ -80,27 +156,230 @@ def read_log_file():
     Uses a lock to ensure thread-safe reading.
     """
     with logging_lock: # Acquire lock before reading from file
+        _write_pending_log_entries() # So the lines include entries still waiting to be written
         log_file_path = config.LOG_FILE_PATH # Get path from config
         if not os.path.exists(log_file_path):
-            print(f"WARNING: logging_manager: Log file '{log_file_path}' not found for reading.", flush=True)
+            logger.warning("logging_manager: Log file '%s' not found for reading.", log_file_path)
             return []
         try:
             with open(log_file_path, "r", encoding='utf-8') as f:
                 lines = f.readlines()
-            print(f"DEBUG: logging_manager: Read {len(lines)} lines from log file '{log_file_path}'.", flush=True)
+            logger.debug("logging_manager: Read %s lines from log file '%s'.", len(lines), log_file_path)
             return lines
         except Exception as e:
-            print(f"ERROR: logging_manager: Failed to read log file '{log_file_path}': {e}", flush=True)
+            logger.error("logging_manager: Failed to read log file '%s': %s", log_file_path, e)
             return []
 
+# Parsed log file, reused while the file's modification time and size are unchanged (see _load_parsed_log).
+# "lines" are the raw entry lines behind "rows" (same order); "timestamps" is built on first use and then extended,
+# "timestamps_in_order" is True while they are all valid and non-decreasing (see filter_log_lines_by_time).
+# "end_position" is where parsing stopped and "checksum" the CRC-32 of the bytes before it (see _log_was_only_appended).
+_parsed_log_cache = {}
+
+def _clear_parsed_log_cache():
+    """Resets the parsed log cache to an empty log. Must be called with logging_lock held."""
+    _parsed_log_cache.update(stamp=None, headers=None, header_lines=[], lines=[], rows=[],
+                             name_keys=[], rows_by_name={}, timestamps=None, timestamps_in_order=False,
+                             end_position=0, checksum=None,
+                             ends_with_newline=True)
+
+_clear_parsed_log_cache()
+
+def _parsed_part_checksum(log_file_path, end_position):
+    """
+    Returns the CRC-32 of the log file's first `end_position` bytes (the part already parsed).
+    The file is memory-mapped, so the checksum is computed straight from the page cache without copying it.
+    An empty file (freshly created or rotated) cannot be mapped; its checksum is that of no bytes.
+    """
+    with open(log_file_path, "rb") as f:
+        if end_position == 0 or os.fstat(f.fileno()).st_size == 0:
+            return zlib.crc32(b"")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            # The views must be released before the mapping is closed
+            with memoryview(mapped_file) as file_view, file_view[:end_position] as parsed_part:
+                return zlib.crc32(parsed_part)
+
+def _log_was_only_appended(log_file_path, size):
+    """
+    True if the log file still starts with the content parsed into the cache, i.e. entries were only appended
+    to it since (the normal case: write_log_entry only ever appends). Checked with a checksum of the parsed
+    part, which costs a read of the file but none of the parsing; an edited or replaced file is parsed again.
+    """
+    cache = _parsed_log_cache
+    end_position = cache["end_position"]
+    if cache["stamp"] is None or end_position == 0 or size <= end_position or not cache["ends_with_newline"]:
+        return False # (A last line without a newline would be continued by the appended text)
+    return _parsed_part_checksum(log_file_path, end_position) == cache["checksum"]
+
+def _add_parsed_entries(lines):
+    """
+    Parses the entry `lines` (blank ones are skipped) and adds them to the cache. The cache's lists are
+    replaced rather than extended, because lists returned to callers earlier must not change.
+    """
+    cache = _parsed_log_cache
+    data_lines = [line for line in lines if line.strip()]
+    rows = [tuple(map(str.strip, line.split('|'))) for line in data_lines]
+    # Lowercase NAME (first column) of every row, and an index of the rows by it, so name searches
+    # neither lowercase the log again nor scan it at all (exact lookups)
+    name_keys = [row[0].lower() for row in rows]
+    new_rows_by_name = {}
+    for row, name_key in zip(rows, name_keys):
+        new_rows_by_name.setdefault(name_key, []).append(row)
+    rows_by_name = dict(cache["rows_by_name"])
+    for name_key, name_rows in new_rows_by_name.items():
+        rows_by_name[name_key] = rows_by_name.get(name_key, []) + name_rows
+    # Timestamps already converted (see filter_log_lines_by_time) are kept: only the new rows' are converted
+    timestamps = cache["timestamps"]
+    timestamps_in_order = cache["timestamps_in_order"]
+    if timestamps is not None:
+        new_timestamps = _row_timestamps(rows)
+        timestamps_in_order = (timestamps_in_order and _timestamps_in_order(new_timestamps)
+                               and (len(timestamps) == 0 or len(new_timestamps) == 0 or bool(new_timestamps[0] >= timestamps[-1])))
+        timestamps = np.concatenate((timestamps, new_timestamps))
+    cache.update(lines=cache["lines"] + data_lines, rows=cache["rows"] + rows,
+                 name_keys=cache["name_keys"] + name_keys, rows_by_name=rows_by_name,
+                 timestamps=timestamps, timestamps_in_order=timestamps_in_order)
+    return len(rows)
+
+def _load_parsed_log():
+    """
+    Returns the parsed log cache, updating it first if the log file changed since it was parsed.
+    When entries were only appended, just the new lines are read and parsed; otherwise the whole file is.
+    Must be called with logging_lock held.
+    """
+    _write_pending_log_entries() # So the parsed log includes entries still waiting to be written
+    log_file_path = config.LOG_FILE_PATH # Get path from config
+    try:
+        stat_result = os.stat(log_file_path)
+    except OSError:
+        logger.warning("logging_manager: Log file '%s' not found for reading.", log_file_path)
+        _clear_parsed_log_cache()
+        return _parsed_log_cache
+    stamp = (stat_result.st_mtime_ns, stat_result.st_size)
+    if stamp == _parsed_log_cache["stamp"]:
+        return _parsed_log_cache
+    try:
+        if _log_was_only_appended(log_file_path, stat_result.st_size):
+            with open(log_file_path, "r", encoding='utf-8') as f:
+                f.seek(_parsed_log_cache["end_position"]) # A byte offset from an earlier tell() at a line boundary
+                lines = f.readlines()
+                end_position = f.tell()
+            added_count = _add_parsed_entries(lines)
+            logger.debug("logging_manager: Parsed %s new entries from log file '%s'.", added_count, log_file_path)
+        else:
+            with open(log_file_path, "r", encoding='utf-8') as f:
+                lines = f.readlines()
+                end_position = f.tell()
+            _clear_parsed_log_cache()
+            if lines and lines[0].strip().startswith('NAME') and 'GENDER' in lines[0]:
+                _parsed_log_cache["headers"] = [h.strip() for h in lines[0].split('|')]
+                _parsed_log_cache["header_lines"] = lines[:2] # The header and separator lines
+                lines = lines[2:]
+            added_count = _add_parsed_entries(lines)
+            logger.debug("logging_manager: Parsed %s entries from log file '%s'.", added_count, log_file_path)
+        ends_with_newline = lines[-1].endswith("\n") if lines else _parsed_log_cache["ends_with_newline"]
+        _parsed_log_cache.update(stamp=stamp, end_position=end_position, ends_with_newline=ends_with_newline,
+                                 checksum=_parsed_part_checksum(log_file_path, end_position))
+    except Exception as e:
+        logger.error("logging_manager: Failed to read log file '%s': %s", log_file_path, e)
+        _clear_parsed_log_cache()
+    return _parsed_log_cache
+
+def read_log_rows():
+    """
+    Reads the log file and returns it parsed as (headers, rows):
+    headers is the list of column names from the header line (None if the file has no header line),
+    rows is a list of tuples holding the stripped column values of each non-blank entry line.
+    The result is cached and reused until the file changes, so repeated log views and searches
+    neither re-read nor re-split the file. The returned list is shared: callers must not modify it.
+    Uses a lock to ensure thread-safe reading.
+    """
+    with logging_lock: # Acquire lock before reading from file
+        parsed_log = _load_parsed_log()
+        return parsed_log["headers"], parsed_log["rows"]
+
+def find_log_rows_by_name(name):
+    """
+    Returns (headers, rows) like read_log_rows(), but only with the rows whose NAME equals `name`
+    (case-insensitive). The rows come from an index built when the log is parsed, so a lookup costs
+    the same however long the log is. The returned list is shared: callers must not modify it.
+    """
+    with logging_lock: # Acquire lock before reading from file
+        parsed_log = _load_parsed_log()
+        return parsed_log["headers"], parsed_log["rows_by_name"].get(name.strip().lower(), [])
+
+def search_log_rows_by_name(name_fragment):
+    """
+    Returns (headers, rows) like read_log_rows(), but only with the rows whose NAME contains
+    `name_fragment` (case-insensitive), in log order. Compares against the lowercase names stored
+    when the log was parsed.
+    """
+    needle = name_fragment.strip().lower()
+    with logging_lock: # Acquire lock before reading from file
+        parsed_log = _load_parsed_log()
+        return parsed_log["headers"], [row for row, name_key in zip(parsed_log["rows"], parsed_log["name_keys"])
+                                       if needle in name_key]
+
+def _row_timestamps(rows):
+    """
+    Returns a datetime64[s] array with the DATE + TIME of each row (NaT for rows without a valid one).
+    The strings are converted by NumPy in one call; only if one of them is invalid are they converted one by one.
+    """
+    datetime_strings = [f"{row[3]}T{row[4]}" if len(row) >= 6 and row[3] and row[4] else "NaT" for row in rows]
+    try:
+        return np.array(datetime_strings, dtype="datetime64[s]")
+    except ValueError:
+        timestamps = np.full(len(datetime_strings), np.datetime64("NaT"), dtype="datetime64[s]")
+        for i, datetime_string in enumerate(datetime_strings):
+            try:
+                timestamps[i] = np.datetime64(datetime_string, "s")
+            except ValueError:
+                pass # Stays NaT
+        return timestamps
+
+def _timestamps_in_order(timestamps):
+    """True if the datetime64 array has no NaT and never decreases (NaT compares as False)."""
+    return bool(np.all(timestamps[1:] >= timestamps[:-1])) and not (len(timestamps) and np.isnat(timestamps[0]))
+
+def filter_log_lines_by_time(from_datetime=None, to_datetime=None):
+    """
+    Returns (header_lines, lines, skipped_count) for saving a filtered copy of the log:
+    header_lines are the raw header and separator lines ([] if the log has none), lines the raw entry lines
+    whose DATE + TIME lies within [from_datetime, to_datetime] (all entries with a valid date/time if both are None),
+    and skipped_count the number of entries without a valid date/time.
+    The timestamps of the parsed log are converted once and compared as one NumPy array; while they are in
+    chronological order (entries are appended as they happen) the range is found by binary search instead.
+    """
+    with logging_lock: # Acquire lock before reading from file
+        parsed_log = _load_parsed_log()
+        if parsed_log["timestamps"] is None:
+            parsed_log["timestamps"] = _row_timestamps(parsed_log["rows"])
+            parsed_log["timestamps_in_order"] = _timestamps_in_order(parsed_log["timestamps"])
+        timestamps = parsed_log["timestamps"]
+        lines = parsed_log["lines"]
+        if parsed_log["timestamps_in_order"]: # No invalid timestamps, so nothing is skipped
+            start = 0 if from_datetime is None else np.searchsorted(timestamps, np.datetime64(from_datetime, "s"), "left")
+            end = len(timestamps) if to_datetime is None else np.searchsorted(timestamps, np.datetime64(to_datetime, "s"), "right")
+            return list(parsed_log["header_lines"]), lines[start:end], 0
+        valid = ~np.isnat(timestamps)
+        selected = valid.copy()
+        if from_datetime is not None:
+            selected &= timestamps >= np.datetime64(from_datetime, "s")
+        if to_datetime is not None:
+            selected &= timestamps <= np.datetime64(to_datetime, "s")
+        # The selected lines are gathered by map() in C rather than by a Python loop over the indices
+        return (list(parsed_log["header_lines"]), list(map(lines.__getitem__, np.flatnonzero(selected).tolist())),
+                int(len(timestamps) - np.count_nonzero(valid)))
+
 # Optional: Standalone test for this module
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(levelname)s: %(message)s") # Show the module's debug messages
     print("\n--- Testing logging_manager.py (Standalone) with IMAGE_LINK column only ---", flush=True)
     
     # Ensure a clean log file for testing
     if os.path.exists(config.LOG_FILE_PATH):
         os.remove(config.LOG_FILE_PATH)
-        print(f"DEBUG: logging_manager: Cleaned up existing log file: {config.LOG_FILE_PATH}", flush=True)
+        logger.debug("logging_manager: Cleaned up existing log file: %s", config.LOG_FILE_PATH)
 
     # Test writing header (new format)
     write_log_header_if_needed()
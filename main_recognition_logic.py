@@ -1,27 +1,37 @@
 # main_recognition_logic.py
 import cv2
+import numpy as np
 import threading # For managing the CameraStream threads
-import queue # For passing frames between CameraStream and display logic
+import collections # deque(maxlen=1) frame slots between CameraStream and display logic
 import sys
 import time # For sleep and overall timing
 import select # For non-blocking console input in standalone test mode (Linux/macOS)
 import os # To check for dummy camera existence in test mode
+import logging
 
 # Import the newly created/refactored modules
 import config # Centralized configurations
 import face_data_manager # For loading known faces
 import logging_manager # For ensuring log header is present
+import camera_stream # For the shared recognition worker pool
+import face_matching # For compiling the matching kernels at startup
+import email_sender # For resuming spooled email alerts
 from camera_stream import CameraStream # The refactored CameraStream class
 
+# Diagnostics logger (see logging_manager.configure_console_logging for the console output)
+logger = logging.getLogger("main_recognition_logic")
+
 # --- Global Data (for this module, to pass to CameraStream instances) ---
 # These will be loaded once when the recognition logic starts.
-# They are declared here to hold the data loaded by face_data_manager.
-_KNOWN_FACE_ENCODINGS = []
-_KNOWN_FACE_NAMES = []
-_KNOWN_FACE_GENDERS = []
+# They are declared here to hold the data loaded by face_data_manager, converted to parallel arrays:
+# an (N, 128) float32 encoding matrix plus name/gender/display-name arrays (shared read-only by all streams).
+_KNOWN_FACE_ENCODINGS = np.empty((0, 128), dtype=np.float32)
+_KNOWN_FACE_NAMES = np.empty(0, dtype=object)
+_KNOWN_FACE_GENDERS = np.empty(0, dtype=object)
+_KNOWN_FACE_DISPLAY_NAMES = np.empty(0, dtype=object) # Name part before '__', precomputed for the overlay
 
 # --- Main Recognition System Logic ---
-def start_live_face_recognition(global_stop_event, camera_display_queues):
+def start_live_face_recognition(global_stop_event, camera_display_queues, on_frame_ready=None):
     """
     Starts the live face recognition system across multiple cameras.
     This function is designed to be run in a separate thread (e.g., a QThread from the GUI).
@@ -29,27 +39,38 @@ def start_live_face_recognition(global_stop_event, camera_display_queues):
     Args:
         global_stop_event (threading.Event): An event object to signal all camera streams to stop gracefully.
         camera_display_queues (dict): A dictionary where keys are camera inputs (int/str)
-                                      and values are queue.Queue objects. CameraStream instances will
-                                      put processed frames into these queues for a display thread to retrieve.
+                                      and values are collections.deque(maxlen=1) frame slots. CameraStream instances will
+                                      overwrite the latest processed frame in these slots for a display thread to take.
                                       This module does NOT manage OpenCV windows itself.
+        on_frame_ready (callable, optional): Called with the camera input each time a new frame is placed in
+                                      its slot (e.g. a Qt signal's emit), so the display does not need to poll.
     """
-    global _KNOWN_FACE_ENCODINGS, _KNOWN_FACE_NAMES, _KNOWN_FACE_GENDERS
+    global _KNOWN_FACE_ENCODINGS, _KNOWN_FACE_NAMES, _KNOWN_FACE_GENDERS, _KNOWN_FACE_DISPLAY_NAMES
 
     # IMPORTANT: Tell OpenCV not to manage its own threads.
     # This can prevent conflicts when you're using Python's threading.
     cv2.setNumThreads(0)
-    print("DEBUG: main_recognition_logic: cv2.setNumThreads(0) called.", flush=True)
+    logger.debug("main_recognition_logic: cv2.setNumThreads(0) called.")
 
-    print("DEBUG: main_recognition_logic: Starting application core.", flush=True)
+    logger.debug("main_recognition_logic: Starting application core.")
 
     # Load known faces once at startup (delegated to face_data_manager module)
-    _KNOWN_FACE_ENCODINGS, _KNOWN_FACE_NAMES, _KNOWN_FACE_GENDERS = face_data_manager.load_known_face_encodings()
+    known_encs, known_names, known_genders = face_data_manager.load_known_face_encodings()
+    # Encodings already come as one (N, 128) float32 matrix; names/genders become arrays shared by every CameraStream
+    _KNOWN_FACE_ENCODINGS = known_encs
+    _KNOWN_FACE_NAMES = np.array(known_names, dtype=object)
+    _KNOWN_FACE_GENDERS = np.array(known_genders, dtype=object)
+    _KNOWN_FACE_DISPLAY_NAMES = np.array([name.split('__')[0] for name in known_names], dtype=object)
+    # Compile the numba matching kernels now rather than when the first face is seen (no-op without numba)
+    face_matching.warm_up()
     
     # Ensure the log file header is written once (delegated to logging_manager module)
     logging_manager.write_log_header_if_needed()
+    # Send any email alerts left in the spool by a previous run
+    email_sender.start_spool_worker()
 
-    if not _KNOWN_FACE_ENCODINGS:
-        print("SYSTEM: main_recognition_logic: No known faces loaded. The recognition system will only detect 'Unknown' faces.", flush=True)
+    if len(_KNOWN_FACE_ENCODINGS) == 0:
+        logger.info("main_recognition_logic: No known faces loaded. The recognition system will only detect 'Unknown' faces.")
 
     # --- Camera Configuration and Verification ---
     available_cameras_inputs = []
@@ -59,46 +80,40 @@ def start_live_face_recognition(global_stop_event, camera_display_queues):
     available_cameras_inputs.extend(config.IP_CAMERA_URLS)
 
     if not available_cameras_inputs:
-        print("ERROR: main_recognition_logic: No cameras configured in config.py. Exiting live face recognition system.", flush=True)
+        logger.error("main_recognition_logic: No cameras configured in config.py. Exiting live face recognition system.")
         global_stop_event.set() # Signal immediate stop if no cameras are configured
         return
 
-    final_active_camera_inputs = [] # List to store inputs for cameras that successfully open
-    print("\nDEBUG: main_recognition_logic: Verifying configured cameras...", flush=True)
-    for cam_input in available_cameras_inputs:
-        # Temporarily attempt to open each camera to check if it's accessible
-        temp_cap = cv2.VideoCapture(cam_input)
-        if temp_cap.isOpened():
-            print(f"INFO: main_recognition_logic: Camera '{cam_input}' detected and opened successfully.", flush=True)
-            final_active_camera_inputs.append(cam_input)
-            temp_cap.release() # Release the temporary capture object
-        else:
-            print(f"ERROR: main_recognition_logic: Camera '{cam_input}' could not be opened. Skipping this camera.", flush=True)
-            # This could be due to wrong URL, credentials, network issues, or camera already in use.
-            
-    if not final_active_camera_inputs:
-        print("ERROR: main_recognition_logic: No active cameras found after verification. Exiting live face recognition system.", flush=True)
-        global_stop_event.set() # Signal immediate stop if no active cameras were found
-        return
-
     # Verify email configuration for alert system (for debugging/info purposes)
-    print("\nDEBUG: main_recognition_logic: Checking email alert configuration...", flush=True)
+    logger.debug("main_recognition_logic: Checking email alert configuration...")
     if all(key in config.EMAIL_CONFIG and config.EMAIL_CONFIG[key] for key in ['sender', 'password', 'receiver']):
-        print("DEBUG: main_recognition_logic: Email alerts ENABLED with valid configuration.", flush=True)
+        logger.debug("main_recognition_logic: Email alerts ENABLED with valid configuration.")
     else:
-        print("WARNING: main_recognition_logic: Email alerts DISABLED - Missing required configuration (sender, password, or receiver).", flush=True)
+        logger.warning("main_recognition_logic: Email alerts DISABLED - Missing required configuration (sender, password, or receiver).")
 
 
+    # Detection/encoding is CPU-bound and holds the GIL, so with several cameras it runs in a shared process pool.
+    # So it does with a single camera when a display (the GUI) runs in this process (on_frame_ready is given),
+    # whose event loop would otherwise wait for the GIL during every detection, unless there is only one CPU.
+    worker_processes = config.RECOGNITION_WORKER_PROCESSES
+    if worker_processes is None:
+        # Sized for the configured cameras: the pool starts before the streams find out which cameras open.
+        use_worker_processes = len(available_cameras_inputs) > 1 or (on_frame_ready is not None and (os.cpu_count() or 1) > 1)
+        worker_processes = min(len(available_cameras_inputs), max((os.cpu_count() or 1) - 1, 1)) \
+                           if use_worker_processes else 0
+    camera_stream.start_recognition_pool(worker_processes)
+
     # Prepare a list to hold CameraStream objects, one for each active camera
     camera_streams = [] 
 
-    # Create and start a CameraStream instance for each active camera
-    print("\nDEBUG: main_recognition_logic: Initializing camera streams.", flush=True)
-    for cam_input in final_active_camera_inputs:
-        # Ensure a queue exists in the shared camera_display_queues dictionary for this camera input.
-        # This queue will be used by the CameraStream to send frames to the display loop in GUI.
+    # Create and start a CameraStream instance for each configured camera. Each stream opens its camera in its
+    # reader thread, so all cameras connect at the same time and are opened only once (no separate check first).
+    logger.debug("main_recognition_logic: Initializing camera streams.")
+    for cam_input in available_cameras_inputs:
+        # Ensure a frame slot exists in the shared camera_display_queues dictionary for this camera input.
+        # The CameraStream overwrites it with each new frame, so the GUI always shows the newest one.
         if cam_input not in camera_display_queues:
-            camera_display_queues[cam_input] = queue.Queue(maxsize=1) # maxsize=1 ensures only freshest frame is kept
+            camera_display_queues[cam_input] = collections.deque(maxlen=1) # append() drops the previous, unshown frame
 
         # Create CameraStream instance, passing it the necessary data and control objects
         stream = CameraStream(
@@ -106,54 +121,68 @@ def start_live_face_recognition(global_stop_event, camera_display_queues):
             known_encs=_KNOWN_FACE_ENCODINGS, # Loaded known face encodings
             known_names=_KNOWN_FACE_NAMES,   # Loaded known face names
             known_genders=_KNOWN_FACE_GENDERS, # Loaded known face genders
+            known_display_names=_KNOWN_FACE_DISPLAY_NAMES, # Precomputed display names (no per-frame split)
             stop_event=global_stop_event, # The shared event to signal all streams to stop
-            frame_queue=camera_display_queues[cam_input] # The specific queue for this stream's output frames
+            frame_queue=camera_display_queues[cam_input], # The specific frame slot for this stream's output frames
+            on_frame_ready=on_frame_ready # Notifies the display (GUI) that a new frame is waiting
         )
         camera_streams.append(stream) # Add the stream object to our list
         stream.start() # Start the reader and processing threads for this camera
 
-    print("\nINFO: main_recognition_logic: Live multi-camera face recognition system core running. Waiting for stop signal.", flush=True)
+    # Wait until every camera has tried to open; since they connect in parallel, one shared deadline suffices.
+    logger.debug("main_recognition_logic: Verifying configured cameras...")
+    open_deadline = time.monotonic() + config.CAMERA_OPEN_TIMEOUT_SECONDS + 5
+    for stream in camera_streams:
+        stream.open_status.wait(timeout=max(open_deadline - time.monotonic(), 0))
+    active_camera_count = 0
+    for stream in camera_streams:
+        if not stream.open_status.is_set():
+            logger.warning("main_recognition_logic: Camera '%s' is still connecting. It is shown once it opens.", stream.camera_input)
+            active_camera_count += 1
+        elif stream.opened:
+            logger.info("main_recognition_logic: Camera '%s' detected and opened successfully.", stream.camera_input)
+            active_camera_count += 1
+        else:
+            # The stream has stopped itself. This could be due to wrong URL, credentials, network issues, or camera already in use.
+            logger.error("main_recognition_logic: Camera '%s' could not be opened. Skipping this camera.", stream.camera_input)
+
+    if active_camera_count == 0:
+        logger.error("main_recognition_logic: No active cameras found after verification. Exiting live face recognition system.")
+        global_stop_event.set() # Signal immediate stop if no active cameras were found (the streams are cleaned up below)
+
+    logger.info("main_recognition_logic: Live multi-camera face recognition system core running. Waiting for stop signal.")
 
     # This thread (where start_live_face_recognition runs) now simply waits
     # for the global_stop_event to be set. This allows all CameraStream threads
     # to run in the background without the main recognition logic actively doing work here.
     global_stop_event.wait() # Blocks until the stop event is set (by GUI or standalone test loop)
 
-    print("INFO: main_recognition_logic: Stop signal received. Cleaning up camera threads...", flush=True)
+    logger.info("main_recognition_logic: Stop signal received. Cleaning up camera threads...")
 
     # Ensure all camera threads are properly terminated and their resources are released.
+    # Every stream is signalled first, so they all wind down at the same time; the joins then share one
+    # deadline, so cleanup waits at most 5 seconds in total instead of up to 10 seconds per camera.
     for stream in camera_streams:
         stream.stop() # Signal each individual CameraStream object to stop its internal threads
-        
-        # Attempt to join (wait for) the reader thread to finish gracefully
-        print(f"DEBUG: main_recognition_logic: Joining Camera {stream.camera_input} reader thread.", flush=True)
-        if stream.reader_thread.is_alive(): # Check if thread is still running
-            stream.reader_thread.join(timeout=5) # Wait for up to 5 seconds for it to finish
-            if stream.reader_thread.is_alive():
-                print(f"WARNING: main_recognition_logic: Camera {stream.camera_input} reader thread did not terminate gracefully within timeout (still alive).", flush=True)
-            else:
-                print(f"DEBUG: main_recognition_logic: Camera {stream.camera_input} reader thread joined successfully.", flush=True)
-        else:
-            print(f"DEBUG: main_recognition_logic: Camera {stream.camera_input} reader thread was already stopped.", flush=True)
-        
-        # Attempt to join (wait for) the processing thread to finish gracefully
-        print(f"DEBUG: main_recognition_logic: Joining Camera {stream.camera_input} processing thread.", flush=True)
-        if stream.processing_thread.is_alive(): # Check if thread is still running
-            stream.processing_thread.join(timeout=5) # Wait for up to 5 seconds for it to finish
-            if stream.processing_thread.is_alive():
-                print(f"WARNING: main_recognition_logic: Camera {stream.camera_input} processing thread did not terminate gracefully within timeout (still alive).", flush=True)
+    join_deadline = time.monotonic() + 5
+    for stream in camera_streams:
+        for thread_role, thread in (("reader", stream.reader_thread), ("processing", stream.processing_thread)):
+            logger.debug("main_recognition_logic: Joining Camera %s %s thread.", stream.camera_input, thread_role)
+            thread.join(timeout=max(join_deadline - time.monotonic(), 0))
+            if thread.is_alive():
+                logger.warning("main_recognition_logic: Camera %s %s thread did not terminate gracefully within timeout (still alive).", stream.camera_input, thread_role)
             else:
-                print(f"DEBUG: main_recognition_logic: Camera {stream.camera_input} processing thread joined successfully.", flush=True)
-        else:
-            print(f"DEBUG: main_recognition_logic: Camera {stream.camera_input} processing thread was already stopped.", flush=True)
+                logger.debug("main_recognition_logic: Camera %s %s thread joined successfully.", stream.camera_input, thread_role)
 
-    print("INFO: main_recognition_logic: All camera threads cleaned up. Live recognition logic finished.", flush=True)
+    camera_stream.stop_recognition_pool()
+    logger.info("main_recognition_logic: All camera threads cleaned up. Live recognition logic finished.")
 
 
 # --- Standalone Test for main_recognition_logic.py (Non-Displaying) ---
 # This block is executed only when main_recognition_logic.py is run directly.
 # It verifies the background camera stream processing and data flow, but does NOT open OpenCV windows.
 if __name__ == "__main__":
+    logging_manager.configure_console_logging(logging.DEBUG) # Show the debug messages of the recognition modules
     print("\n--- Testing main_recognition_logic.py (Standalone - Non-Displaying) ---", flush=True)
     print("NOTE: This test runs the background recognition logic but will NOT show video feeds.", flush=True)
     print("ACTION: Wait for 15 seconds, then the process will attempt to stop automatically.", flush=True)
@@ -164,7 +193,7 @@ if __name__ == "__main__":
 
     # Configure some test cameras if not already in config.py for testing purposes
     if not config.USB_WEBCAM_INDICES and not config.IP_CAMERA_URLS:
-        print("WARNING: main_recognition_logic test: No cameras configured in config.py. Attempting to find a default camera for test.", flush=True)
+        logger.warning("main_recognition_logic test: No cameras configured in config.py. Attempting to find a default camera for test.")
         found_test_cam = False
         
         # Try USB webcam 0 first
@@ -172,7 +201,7 @@ if __name__ == "__main__":
         if temp_cap_usb.isOpened():
             config.USB_WEBCAM_INDICES.append(0) # Temporarily add to config for this test run
             temp_cap_usb.release()
-            print("INFO: main_recognition_logic test: Using default USB webcam 0.", flush=True)
+            logger.info("main_recognition_logic test: Using default USB webcam 0.")
             found_test_cam = True
         else:
             # If USB 0 fails, try the IP camera URL you originally had
@@ -181,13 +210,13 @@ if __name__ == "__main__":
             if temp_cap_ip.isOpened():
                 config.IP_CAMERA_URLS.append(test_ip_cam_url) # Temporarily add to config for this test run
                 temp_cap_ip.release()
-                print(f"INFO: main_recognition_logic test: Using IP camera {test_ip_cam_url}.", flush=True)
+                logger.info("main_recognition_logic test: Using IP camera %s.", test_ip_cam_url)
                 found_test_cam = True
             else:
-                print("ERROR: main_recognition_logic test: Could not find any active camera. Please configure one in config.py or check camera connection.", flush=True)
+                logger.error("main_recognition_logic test: Could not find any active camera. Please configure one in config.py or check camera connection.")
 
         if not found_test_cam:
-            print("CRITICAL: Exiting standalone test as no active cameras were found for testing.", flush=True)
+            logger.critical("Exiting standalone test as no active cameras were found for testing.")
             sys.exit(1)
 
     # Start the main recognition logic in a separate thread
@@ -200,28 +229,27 @@ if __name__ == "__main__":
 
     # --- Main thread simply waits for a duration or Ctrl+C ---
     test_duration_seconds = 15
-    print(f"DEBUG: main_recognition_logic test: Running background threads for {test_duration_seconds} seconds.", flush=True)
-    start_time = time.time()
+    logger.debug("main_recognition_logic test: Running background threads for %s seconds.", test_duration_seconds)
     try:
-        while (time.time() - start_time) < test_duration_seconds and recognition_thread.is_alive():
-            time.sleep(0.5) # Periodically check time and thread status
+        # Returns early if the recognition logic stops by itself (it sets the event when no camera opens)
+        test_global_stop_event.wait(timeout=test_duration_seconds)
     except KeyboardInterrupt:
-        print("INFO: main_recognition_logic test: Ctrl+C pressed. Signaling stop.", flush=True)
+        logger.info("main_recognition_logic test: Ctrl+C pressed. Signaling stop.")
     
     # Ensure stop signal is sent to background threads
     test_global_stop_event.set() 
 
     # --- Cleanup ---
-    print("INFO: main_recognition_logic test: Signaling threads for final cleanup...", flush=True)
+    logger.info("main_recognition_logic test: Signaling threads for final cleanup...")
     if recognition_thread.is_alive():
-        print("DEBUG: main_recognition_logic test: Waiting for recognition thread to join...", flush=True)
+        logger.debug("main_recognition_logic test: Waiting for recognition thread to join...")
         recognition_thread.join(timeout=10) # Give it time to shut down
         if recognition_thread.is_alive():
-            print("WARNING: main_recognition_logic test: Recognition thread did not terminate gracefully within timeout.", flush=True)
+            logger.warning("main_recognition_logic test: Recognition thread did not terminate gracefully within timeout.")
         else:
-            print("DEBUG: main_recognition_logic test: Recognition thread joined successfully.", flush=True)
+            logger.debug("main_recognition_logic test: Recognition thread joined successfully.")
     else:
-        print("DEBUG: main_recognition_logic test: Recognition thread was already stopped.", flush=True)
+        logger.debug("main_recognition_logic test: Recognition thread was already stopped.")
 
     # No cv2.destroyAllWindows() here as this block doesn't create windows.
-    print("INFO: main_recognition_logic.py Standalone Test Complete. Application finished.", flush=True)
\ No newline at end of file
+    logger.info("main_recognition_logic.py Standalone Test Complete. Application finished.")
\ No newline at end of file
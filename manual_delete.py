@@ -1,17 +1,17 @@
 import sys
-import pickle
 import os
+import numpy as np
 
-encoding_file = "intruder_encodings.pkl"
+import config
+import intruder_tracker # The intruder store (imports the old intruder_encodings.pkl the first time)
 
-# Check if encoding file exists
-if not os.path.exists(encoding_file):
+# Check if the intruder store (or the old pickle it is imported from) exists
+if not os.path.exists(config.INTRUDER_ENCODINGS_MATRIX_FILE) and not os.path.exists(config.INTRUDER_ENCODINGS_FILE):
     print(" Encoding file not found.")
     sys.exit()
 
 # Load the existing data
-with open(encoding_file, "rb") as f:
-    known_face_encodings, known_face_names = pickle.load(f)
+known_face_encodings, known_face_names = intruder_tracker.load_intruder_db()
 
 # If the list is empty
 if not known_face_names:
@@ -30,18 +30,14 @@ if name_to_delete not in known_face_names:
     print(f" No person named '{name_to_delete}' found in encodings.")
     sys.exit()
 
-# Filter out the selected person
-filtered_encodings = []
-filtered_names = []
-
-for encoding, name in zip(known_face_encodings, known_face_names):
-    if name != name_to_delete:
-        filtered_encodings.append(encoding)
-        filtered_names.append(name)
+# Filter out the selected person: one boolean mask over the (N, 128) encoding matrix and the names
+name_array = np.array(known_face_names)
+keep_mask = name_array != name_to_delete
+filtered_encodings = known_face_encodings[keep_mask]
+filtered_names = name_array[keep_mask].tolist()
 
 # Save the updated encodings
-with open(encoding_file, "wb") as f:
-    pickle.dump((filtered_encodings, filtered_names), f)
+intruder_tracker.save_intruder_db(filtered_encodings, filtered_names)
 
 print(f" Removed '{name_to_delete}' from encodings.")
 print(f"👥 {len(filtered_names)} people remaining.")
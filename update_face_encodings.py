@@ -1,52 +1,203 @@
 import os
 import face_recognition
 import pickle
+import numpy as np
+import cv2
+import dlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import config
+import face_data_manager # The application's encoding store (matrix + names files), read and rewritten below
 
 # Paths
 dataset_path = r"E:\sem 6\face recg wts\final software\images"
-pickle_file = "encodings1.pkl"
-
-# Load existing encodings
-if os.path.exists(pickle_file):
-    with open(pickle_file, "rb") as f:
-        known_face_encodings, known_face_names = pickle.load(f)
-    print(f" Loaded {len(known_face_encodings)} existing face encodings.")
-else:
-    known_face_encodings = []
-    known_face_names = []
-    print(" No existing encodings found. Creating a new one.")
-
-# Get list of already processed people
-existing_people = set(known_face_names)
-
-for gender in os.listdir(dataset_path):
-    gender_folder = os.path.join(dataset_path, gender)
-    if not os.path.isdir(gender_folder):
-        continue
-
-    for person_name in os.listdir(gender_folder):
-        person_folder = os.path.join(gender_folder, person_name)
-        # Skip if not a folder or already processed
-        if not os.path.isdir(person_folder) or any(person_name in name for name in existing_people):
-            continue
-
-        print(f" Encoding new person: {person_name}")
-
-        for filename in os.listdir(person_folder):
-            image_path = os.path.join(person_folder, filename)
-            image = face_recognition.load_image_file(image_path)
-            encodings = face_recognition.face_encodings(image)
-
-            if encodings:
-                known_face_encodings.append(encodings[0])
-                full_name = f"{person_name}__{(gender)}"  # Include gender in the name
-                known_face_names.append(full_name)
-                print(f"    Image '{filename}' encoded.")
-            else:
-                print(f"    No face found in '{filename}'.")
-
-# Save updated encodings back to pickle file
-with open("encodings1.pkl", "wb") as f:
-    pickle.dump((known_face_encodings, known_face_names), f)
-
-print(f"\n Updated encodings saved. Total people: {len(set(known_face_names))}")
+# Per-image cache: {image_path: {"mtime": mtime_ns, "size": bytes, "enc": 128-d float32 array or None (no face), "name": "Person__gender"}}
+# Images whose modification time and size are unchanged are not loaded or encoded again.
+cache_file = "encodings1.cache.pkl"
+# The cache is also saved after every this many newly encoded images, so an interrupted run keeps its work.
+cache_save_interval = 32
+# Images per batched CNN face detection call when dlib was built with CUDA.
+gpu_batch_size = 32
+# Faces are first looked for in a copy of each image scaled down to at most this many pixels on its longer side.
+max_image_side = 640
+
+def save_pickle_atomically(path, data):
+    """
+    Pickles `data` to a temporary file and swaps it in, so an interrupted run never leaves a truncated file.
+    The highest protocol (5 on Python 3.8+) writes each NumPy array as one raw buffer.
+    """
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+
+def downscale_image(image):
+    """
+    Returns the RGB image scaled down (area averaging) so its longer side is at most max_image_side, or the
+    image itself if it is already that small. Detection cost grows with the pixel count, while the encoding
+    only depends on the 150x150 face chip, so enrollment photos straight from a phone camera need not be scanned in full.
+    """
+    height, width = image.shape[:2]
+    scale = max_image_side / max(height, width)
+    if scale >= 1.0:
+        return image
+    return cv2.resize(image, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+
+def encode_one(image_path):
+    """Worker process: returns the first face encoding in the image (float32) or None if no face was found."""
+    image = face_recognition.load_image_file(image_path)
+    # Enrollment photos are mostly close-ups, so faces are looked for in the downscaled image without upsampling
+    # first. Only if that finds nothing is the full-size image scanned with one upsample, as before.
+    small_image = downscale_image(image)
+    face_locations = face_recognition.face_locations(small_image, number_of_times_to_upsample=0)
+    if face_locations:
+        image = small_image
+    else:
+        face_locations = face_recognition.face_locations(image, number_of_times_to_upsample=1)
+    if not face_locations:
+        return None
+    # Only the first face is kept, so only that one is encoded
+    encodings = face_recognition.face_encodings(image, known_face_locations=face_locations[:1])
+    return np.asarray(encodings[0], dtype=np.float32)
+
+def encode_batch_gpu(image_paths):
+    """
+    CUDA builds of dlib: detects the faces of all images with batched CNN calls on the GPU (one per image size,
+    since dlib's batched detector needs equally sized images) and returns, like encode_one, the first face
+    encoding of each image or None. Like encode_one, the downscaled images are searched first and the full-size
+    image (loaded again, so the batch does not hold every full-size image) only if no face is found.
+    """
+    images = [downscale_image(face_recognition.load_image_file(image_path)) for image_path in image_paths]
+    results = [None] * len(images)
+    indices_by_shape = {}
+    for index, image in enumerate(images):
+        indices_by_shape.setdefault(image.shape, []).append(index)
+    for indices in indices_by_shape.values():
+        locations = face_recognition.batch_face_locations([images[i] for i in indices], number_of_times_to_upsample=0, batch_size=len(indices))
+        for index, face_locations in zip(indices, locations):
+            image = images[index]
+            if not face_locations:
+                image = face_recognition.load_image_file(image_paths[index])
+                face_locations = face_recognition.face_locations(image, number_of_times_to_upsample=1, model="cnn")
+            if face_locations:
+                # Only the first face is kept, so only that one is encoded
+                encodings = face_recognition.face_encodings(image, known_face_locations=face_locations[:1])
+                results[index] = np.asarray(encodings[0], dtype=np.float32)
+    return results
+
+def main():
+    # Load existing encodings from the store the application reads (imports the old encodings1.pkl once)
+    known_face_encodings, known_face_names, _ = face_data_manager.load_known_face_encodings()
+    if known_face_names:
+        print(f" Loaded {len(known_face_names)} existing face encodings.")
+    elif face_data_manager.stored_encoding_row_count() > 0:
+        # The store has rows but could not be loaded (error printed above): do not overwrite it
+        print(f" Could not load {config.ENCODINGS_MATRIX_FILE}. Nothing was changed.")
+        return
+    else:
+        print(" No existing encodings found. Creating a new one.")
+
+    # Load the per-image cache
+    if os.path.exists(cache_file):
+        with open(cache_file, "rb") as f:
+            image_cache = pickle.load(f)
+    else:
+        image_cache = {}
+
+    # People with images in the cache are rebuilt from their current images below (new or changed images are
+    # encoded, the rest reused). Encodings of other people (saved before the cache existed) are kept as they are.
+    cached_people = set(entry["name"] for entry in image_cache.values())
+    keep_mask = np.array([name not in cached_people for name in known_face_names], dtype=bool)
+    known_face_names = [name for name in known_face_names if name not in cached_people]
+
+    # All encodings are kept in one contiguous (N, 128) float32 matrix. New rows are written into spare
+    # capacity at the end, which doubles when it runs out, instead of growing a list of separate arrays.
+    encoding_count = len(known_face_names)
+    encoding_matrix = np.empty((max(2 * encoding_count, 64), 128), dtype=np.float32)
+    if encoding_count:
+        encoding_matrix[:encoding_count] = np.asarray(known_face_encodings, dtype=np.float32).reshape(-1, 128)[keep_mask]
+
+    # Get list of already processed people (name part before '__'; people with cache entries are checked image by image)
+    existing_people = set(name.split("__")[0] for name in known_face_names)
+    updated_image_cache = {} # In dataset order; entries of new or changed images are filled in by the workers
+    tasks = [] # (image_path, display name, cache entry without its encoding) of every image to encode
+
+    # os.scandir returns each entry's type with the directory listing, so no extra stat() per entry is needed
+    with os.scandir(dataset_path) as gender_entries:
+        for gender_entry in gender_entries:
+            if not gender_entry.is_dir():
+                continue
+
+            with os.scandir(gender_entry.path) as person_entries:
+                for person_entry in person_entries:
+                    person_name = person_entry.name
+                    # Skip if not a folder or already processed
+                    if not person_entry.is_dir() or person_name in existing_people:
+                        continue
+
+                    full_name = f"{person_name}__{(gender_entry.name)}"  # Include gender in the name
+                    queued_before = len(tasks)
+
+                    with os.scandir(person_entry.path) as image_entries:
+                        for image_entry in image_entries:
+                            if not image_entry.is_file():
+                                continue
+                            image_path = image_entry.path
+                            image_stat = image_entry.stat()
+                            cache_entry = image_cache.get(image_path)
+                            if cache_entry is None or (cache_entry["mtime"], cache_entry["size"], cache_entry["name"]) != (image_stat.st_mtime_ns, image_stat.st_size, full_name):
+                                cache_entry = {"mtime": image_stat.st_mtime_ns, "size": image_stat.st_size, "enc": None, "name": full_name}
+                                tasks.append((image_path, f"{person_name}/{image_entry.name}", cache_entry))
+                            updated_image_cache[image_path] = cache_entry
+
+                    if len(tasks) > queued_before:
+                        print(f" Encoding person: {person_name} ({len(tasks) - queued_before} images)")
+
+    reused_count = len(updated_image_cache) - len(tasks)
+
+    pending_paths = set(task[0] for task in tasks)
+
+    def record_encoding(task, encoding, finished_count):
+        image_path, display_name, cache_entry = task
+        cache_entry["enc"] = encoding
+        pending_paths.discard(image_path)
+        if encoding is not None:
+            print(f"    Image '{display_name}' encoded.")
+        else:
+            print(f"    No face found in '{display_name}'.")
+        if finished_count % cache_save_interval == 0:
+            # Only finished images: the others are encoded again if the run is interrupted
+            save_pickle_atomically(cache_file, {path: entry for path, entry in updated_image_cache.items()
+                                                if path not in pending_paths})
+
+    if tasks and dlib.DLIB_USE_CUDA:
+        # Encode the new and changed images on the GPU, gpu_batch_size images per detection call
+        for batch_start in range(0, len(tasks), gpu_batch_size):
+            batch = tasks[batch_start:batch_start + gpu_batch_size]
+            for offset, (task, encoding) in enumerate(zip(batch, encode_batch_gpu([task[0] for task in batch])), start=1):
+                record_encoding(task, encoding, batch_start + offset)
+    elif tasks:
+        # Encode the new and changed images on all CPU cores (dlib's face detection and encoding are CPU-bound)
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(tasks))) as executor:
+            futures = {executor.submit(encode_one, task[0]): task for task in tasks}
+            for finished_count, future in enumerate(as_completed(futures), start=1):
+                record_encoding(futures[future], future.result(), finished_count)
+
+    # Rebuild the rows of the cached people in dataset order
+    for cache_entry in updated_image_cache.values():
+        if cache_entry["enc"] is not None:
+            if encoding_count == len(encoding_matrix):
+                encoding_matrix = np.resize(encoding_matrix, (2 * len(encoding_matrix), 128))
+            encoding_matrix[encoding_count] = cache_entry["enc"]
+            encoding_count += 1
+            known_face_names.append(cache_entry["name"])
+
+    # Save updated encodings back to the encoding store, as (N, 128) float32 matrix and list of names, then the
+    # cache (written second, so a crash in between re-encodes images instead of losing them)
+    face_data_manager.save_known_face_encodings(encoding_matrix[:encoding_count], known_face_names)
+    save_pickle_atomically(cache_file, updated_image_cache)
+
+    print(f"\n Updated encodings saved ({reused_count} unchanged images reused). Total people: {len(set(known_face_names))}")
+
+# The guard is required for the worker processes: on Windows they import this file again when they start.
+if __name__ == "__main__":
+    main()